@@ -0,0 +1,242 @@
+import numpy as np
+
+import instrument
+from geometry import (WORK_SLOTS, angle_from_dot_det, calculate_angle, distance, noisy_point,
+                      angular_error, segment_distance)
+from noise import NOISE_SIGMA, RangeNoise
+
+DISTANCE_THRESHOLD = 0.8
+ANGLE_THRESHOLD = 0.05
+# "segment": AB ile CD arasındaki gerçek en kısa mesafe; "endpoint": yalnızca dört uç
+# nokta mesafesi (forkplot1.py'deki eski döngü, eski sayıları birebir verir)
+DISTANCE_MODES = ("segment", "endpoint")
+DISTANCE_MODE = "segment"
+
+
+def segments_to_arrays(segments):
+    """Ardışık segment listesini (N,2,2) forklift 1 ve forklift 2 dizilerine ayırır"""
+    arr = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+    pairs = len(arr) // 2
+    return arr[0:2 * pairs:2], arr[1:2 * pairs:2]
+
+
+def mn_alert(dot_a, det_a, dot_b, det_b, dot_c, det_c, dot_d, det_d,
+             angle_threshold=ANGLE_THRESHOLD):
+    """|m| > eşik veya |n| > eşik testi, tan ve bölme olmadan.
+
+    tan(atan2(det, dot)) = det / dot olduğundan (açının [0, 2π)'ye
+    taşınması π periyotlu tan'ı değiştirmez)
+        |m| = |ta·tc·td| > T  <=>  |det_a·det_c·det_d| > T·|dot_a·dot_c·dot_d|
+    ve n için aynısı det_b/dot_b ile geçerlidir. Bu biçim π/2 yakınında
+    taşmaz ve NaN üretmez; dot = 0 (tan sonsuz) durumunda pay sıfır değilse
+    alarm verir.
+    """
+    det_cd = det_c * det_d
+    dot_cd = np.abs(dot_c * dot_d) * angle_threshold
+    return ((np.abs(det_a * det_cd) > np.abs(dot_a) * dot_cd) |
+            (np.abs(det_b * det_cd) > np.abs(dot_b) * dot_cd))
+
+
+def _pair_terms(seg1, seg2):
+    """Dört köşenin (dot, det) değerleri ve uç nokta mesafelerinin kareleri.
+
+    Köşe sırası CAD, DBC, ACB, BDA; mesafeler [A, B] x [C, D] sırasıyla
+    (N,4) dizidir.
+    """
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+
+    # Dört fark vektörü AC, AD, BC, BD hem açıları hem mesafeleri verir;
+    # koordinatlar bitişik 1-B dizilere alınarak bellek trafiği azaltılır
+    ax, ay = seg1[:, 0, 0].copy(), seg1[:, 0, 1].copy()
+    bx, by = seg1[:, 1, 0].copy(), seg1[:, 1, 1].copy()
+    cx, cy = seg2[:, 0, 0].copy(), seg2[:, 0, 1].copy()
+    dx, dy = seg2[:, 1, 0].copy(), seg2[:, 1, 1].copy()
+    acx, acy = cx - ax, cy - ay
+    adx, ady = dx - ax, dy - ay
+    bcx, bcy = cx - bx, cy - by
+    bdx, bdy = dx - bx, dy - by
+
+    # Angles: köşedeki iki kolun (dot, det) değerleri
+    dot_a, det_a = acx * adx + acy * ady, acx * ady - acy * adx  # CAD: AC, AD
+    dot_b, det_b = bdx * bcx + bdy * bcy, bdx * bcy - bdy * bcx  # DBC: BD, BC
+    dot_c, det_c = acx * bcx + acy * bcy, acx * bcy - acy * bcx  # ACB: CA, CB
+    dot_d, det_d = bdx * adx + bdy * ady, bdx * ady - bdy * adx  # BDA: DB, DA
+
+    # Uç nokta mesafelerinin kareleri, [A, B] x [C, D] sırasıyla
+    dist2 = np.stack([acx * acx + acy * acy, adx * adx + ady * ady,
+                      bcx * bcx + bcy * bcy, bdx * bdx + bdy * bdy], axis=-1)
+    return (dot_a, det_a, dot_b, det_b, dot_c, det_c, dot_d, det_d), dist2
+
+
+def alert_scores(seg1, seg2, distance_mode=DISTANCE_MODE):
+    """Eşikten bağımsız alarm skorları: (angle_score, min_dist2).
+
+    angle_score = max(|m|, |n|) mn_alert'teki çarpımların oranıdır; eşik T
+    için açı alarmı angle_score > T, mesafe alarmı min_dist2 < eşik² ile
+    verilir. Böylece bir çift kümesi birçok eşikte tek geometri geçişiyle
+    değerlendirilir. Oran, mn_alert'in çarpım karşılaştırmasından yalnızca
+    eşiğe yuvarlama kadar yakın çiftlerde ayrılabilir. dot = 0 iken (tan
+    sonsuz) skor inf, pay da sıfırsa 0'dır. distance_mode="segment" iken
+    min_dist2 segmentler arası en kısa mesafenin karesidir.
+    """
+    (dot_a, det_a, dot_b, det_b, dot_c, det_c, dot_d, det_d), dist2 = _pair_terms(seg1, seg2)
+    det_cd = np.abs(det_c * det_d)
+    dot_cd = np.abs(dot_c * dot_d)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = np.abs(det_a) * det_cd / (np.abs(dot_a) * dot_cd)
+        n = np.abs(det_b) * det_cd / (np.abs(dot_b) * dot_cd)
+    score = np.fmax(m, n)
+    score[np.isnan(score)] = 0.0  # 0/0: pay sıfır, hiçbir eşikte alarm yok
+    min_dist2 = dist2.min(axis=-1)
+    if _check_mode(distance_mode) == "segment":
+        np.minimum(min_dist2, segment_distances(seg1, seg2, squared=True), out=min_dist2)
+    return score, min_dist2
+
+
+def _check_mode(distance_mode):
+    if distance_mode not in DISTANCE_MODES:
+        raise ValueError(f"Bilinmeyen mesafe kipi: {distance_mode}")
+    return distance_mode
+
+
+def segment_distances(seg1, seg2, squared=False):
+    """(N,2,2) AB ve CD dizileri için segmentler arası en kısa mesafe"""
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+    return segment_distance(seg1[:, 0], seg1[:, 1], seg2[:, 0], seg2[:, 1], squared=squared)
+
+
+def segment_alert(seg1, seg2, distance_threshold, endpoint_alert):
+    """Uç nokta testinin kaçırdığı ama segmentleri eşikten yakın çiftler.
+
+    Segmentler arası mesafe, merkezler arası mesafeden iki yarı uzunluk
+    çıkarılınca kalandan küçük olamaz; kesin hesap yalnızca bu alt sınırı
+    eşiğin altında kalan ve uç nokta alarmı vermemiş çiftlerde yapılır.
+    Dönen maske uç nokta alarmlarını içermez; ikisinin birleşimi alınır.
+    """
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+    # İki katı ölçekte: 2·|merkez farkı| < |AB| + |CD| + 2·eşik (hypot ve bölme yok)
+    ab = seg1[:, 1] - seg1[:, 0]
+    cd = seg2[:, 1] - seg2[:, 0]
+    centers = seg2[:, 0] + seg2[:, 1] - seg1[:, 0] - seg1[:, 1]
+    # Alt sınır kesin hesapla aynı noktada eşitlenebilir (aynı doğrudaki segmentler); 1 µm pay
+    reach = np.sqrt(np.einsum("ij,ij->i", ab, ab)) + np.sqrt(np.einsum("ij,ij->i", cd, cd))
+    reach += 2 * (distance_threshold + 1e-6)
+    near = np.flatnonzero(~endpoint_alert & (np.einsum("ij,ij->i", centers, centers) < reach * reach))
+    alert = np.zeros(len(seg1), dtype=bool)
+    if len(near):
+        alert[near] = segment_distances(seg1[near], seg2[near], squared=True) < distance_threshold ** 2
+    return alert
+
+
+def _count_alerts(angle_alert, distance_alert):
+    """Alarmların ölçüt kırılımını ölçüm sayaçlarına ekler"""
+    angle = int(np.count_nonzero(angle_alert))
+    distance = int(np.count_nonzero(distance_alert))
+    both = int(np.count_nonzero(angle_alert & distance_alert))
+    instrument.count("pairs", len(angle_alert))
+    instrument.count("alerts.total", angle + distance - both)
+    instrument.count("alerts.angle", angle)
+    instrument.count("alerts.distance", distance)
+    instrument.count("alerts.angle_only", angle - both)
+    instrument.count("alerts.distance_only", distance - both)
+    instrument.count("alerts.both", both)
+
+
+@instrument.timed("alert")
+def evaluate_alerts(seg1, seg2, distance_threshold=DISTANCE_THRESHOLD,
+                    angle_threshold=ANGLE_THRESHOLD, details=True, distance_mode=DISTANCE_MODE):
+    """forkplot1.py'deki alarm döngüsünün tek geçişte vektörel karşılığı.
+
+    seg1 (A-B) ve seg2 (C-D) (N,2,2) dizileridir. Dönen sözlükte alarm
+    maskeleri bulunur; details=True iken bilgi kutusu için açılar,
+    tanjantlar, m, n, dört uç nokta mesafesi ve segmentler arası mesafe de
+    eklenir. Açı alarmı her durumda mn_alert ile, atan2/tan çağırmadan
+    verilir. Mesafe alarmı distance_mode="segment" iken AB ile CD'nin gerçek
+    en kısa mesafesine (kesişme dahil), "endpoint" iken yalnızca dört uç
+    nokta mesafesine bakar.
+    """
+    (dot_a, det_a, dot_b, det_b, dot_c, det_c, dot_d, det_d), dist2 = _pair_terms(seg1, seg2)
+    angle_alert = mn_alert(dot_a, det_a, dot_b, det_b, dot_c, det_c, dot_d, det_d,
+                           angle_threshold)
+    distance_alert = (dist2 < distance_threshold ** 2).any(axis=-1)
+    segment_dist2 = None
+    if _check_mode(distance_mode) == "segment":
+        if details:
+            segment_dist2 = segment_distances(seg1, seg2, squared=True)
+            distance_alert |= segment_dist2 < distance_threshold ** 2
+        else:
+            distance_alert |= segment_alert(seg1, seg2, distance_threshold, distance_alert)
+    if instrument.enabled():
+        _count_alerts(angle_alert, distance_alert)
+
+    results = {
+        "angle_alert": angle_alert,
+        "distance_alert": distance_alert,
+        "alert": angle_alert | distance_alert,
+    }
+    if details:
+        if segment_dist2 is None:
+            segment_dist2 = segment_distances(seg1, seg2, squared=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ta = det_a / dot_a
+            tb = det_b / dot_b
+            tc = det_c / dot_c
+            td = det_d / dot_d
+            results.update({
+                "angle_CAD": angle_from_dot_det(dot_a, det_a),
+                "angle_DBC": angle_from_dot_det(dot_b, det_b),
+                "angle_ACB": angle_from_dot_det(dot_c, det_c),
+                "angle_BDA": angle_from_dot_det(dot_d, det_d),
+                "ta": ta,
+                "tb": tb,
+                "tc": tc,
+                "td": td,
+                "m": ta * tc * td,
+                "n": tb * tc * td,
+                "dist": np.sqrt(dist2),
+                "segment_dist": np.sqrt(segment_dist2),
+            })
+    return results
+
+
+@instrument.timed("noise")
+def angular_errors(seg1, seg2, rng, scale=NOISE_SIGMA, noise=None, reps=None):
+    """forkplot2.py'deki gürültülü ölçüm modelinin vektörel karşılığı.
+
+    Her çift için AC, AD, BC, BD, CA, DB mesafeleri bu sırayla bozulur ve
+    CAD/DBC/BDA/ACB açısal hataları döner. noise verilmezse RangeNoise(scale)
+    kullanılır. reps=K verilirse tüm gürültü tek çağrıda çekilir ve hatalar
+    (K, N) boyutunda K Monte Carlo tekrarı olarak döner.
+    """
+    if noise is None:
+        noise = RangeNoise(scale)
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+    A, B = seg1[:, 0], seg1[:, 1]
+    C, D = seg2[:, 0], seg2[:, 1]
+
+    starts = np.stack([A, A, B, B, C, D], axis=1)
+    ends = np.stack([C, D, C, D, A, B], axis=1)
+    true_dist = distance(ends, starts)
+    noisy = noisy_point(starts, ends, noise.sample(true_dist, rng, reps))
+    C_a, D_a, C_b, D_b, A_c, B_d = (noisy[..., j, :] for j in range(6))
+
+    # Dört ölçüt aynı ara tamponları kullanır; yalnızca sonuç dizileri ayrılır
+    shape = noisy.shape[:-2]
+    work = np.empty((WORK_SLOTS,) + shape)
+    true_work = work if reps is None else work[:, 0]
+    true_angle = np.empty(shape[-1:])
+    noisy_angle = np.empty(shape)
+    results = {}
+    for name, true_points, noisy_points in (("err_CAD", (C, A, D), (C_a, A, D_a)),
+                                            ("err_DBC", (D, B, C), (D_b, B, C_b)),
+                                            ("err_BDA", (B, D, A), (B, D_b, A)),
+                                            ("err_ACB", (A, C, B), (A_c, C, B_d))):
+        calculate_angle(*true_points, out=true_angle, work=true_work)
+        calculate_angle(*noisy_points, out=noisy_angle, work=work)
+        results[name] = angular_error(true_angle, noisy_angle, work=work)
+    results["true_dist"] = true_dist
+    return results
@@ -0,0 +1,247 @@
+"""Aşama aşama performans ölçümü: ayrıştırma, alarm, gürültü, birikim, çizim.
+
+scenario.py ile sentetik çiftler üretilir ve headless.py'nin hattı parça
+parça (chunk_pairs) çalıştırılır; her aşamanın süresi ayrı ölçülür, girdi
+üretimi ve metne çevirme süreye dahil değildir. Tepe bellek ayrı bir
+geçişte, tek parça üzerinde tracemalloc ile ölçülür (numpy tamponları
+dahil); parçalı işlemede bellek parça boyutuyla sınırlı olduğundan bu,
+aşamanın çalışma belleğidir. Çizim aşaması boyuttan bağımsız olarak ilk
+parçadan en fazla RENDER_FRAMES kareyi PNG olarak yazar.
+
+    python bench.py                                  # 1k, 100k, 10M çift
+    python bench.py --sizes 1000 100000 --out bench.json
+    python bench.py --compare bench.json             # %20'den fazla yavaşlamada çıkış kodu 1
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from alert_engine import DISTANCE_THRESHOLD, ANGLE_THRESHOLD, evaluate_alerts, angular_errors
+from noise import NOISE_SIGMA, RangeNoise, make_rng
+from scenario import format_text, iter_pairs
+from segment_io import parse_segments
+from streaming import ERROR_NAMES, RunningStats
+
+SIZES = (1_000, 100_000, 10_000_000)
+STAGES = ("parse", "alert", "noise", "aggregate", "render")
+CHUNK_PAIRS = 1_000_000
+RENDER_FRAMES = 20
+TOLERANCE = 1.2  # --compare: bu oranın üzerindeki yavaşlama gerileme sayılır
+
+
+def _stage_parse(ctx):
+    segments, ctx["skipped"] = parse_segments(ctx["text"])
+    return segments
+
+
+def _stage_alert(ctx):
+    ctx["results"] = evaluate_alerts(ctx["seg1"], ctx["seg2"], ctx["distance_threshold"],
+                                     ctx["angle_threshold"], details=False)
+
+
+def _stage_noise(ctx):
+    ctx["errors"] = angular_errors(ctx["seg1"], ctx["seg2"], ctx["rng"], noise=ctx["noise"])
+
+
+def _stage_aggregate(ctx):
+    totals = ctx["totals"]
+    for key in ("alert", "angle_alert", "distance_alert"):
+        totals[key] += int(np.count_nonzero(ctx["results"][key]))
+    for name in ERROR_NAMES:
+        totals[name].update(ctx["errors"][f"err_{name}"])
+
+
+def _stage_render(ctx):
+    from render import select_frames, render_frames
+    # Kare bilgi kutusu ayrıntılı sonuç ister; yalnızca çizilen kareler için hesaplanır
+    seg1 = ctx["seg1"][:RENDER_FRAMES]
+    seg2 = ctx["seg2"][:RENDER_FRAMES]
+    results = evaluate_alerts(seg1, seg2, ctx["distance_threshold"], ctx["angle_threshold"])
+    with tempfile.TemporaryDirectory() as out:
+        return render_frames(seg1, seg2, results, select_frames(results["alert"], "all"), out)
+
+
+STAGE_FUNCS = {
+    "parse": _stage_parse,
+    "alert": _stage_alert,
+    "noise": _stage_noise,
+    "aggregate": _stage_aggregate,
+    "render": _stage_render,
+}
+
+
+def _new_totals():
+    totals = {"alert": 0, "angle_alert": 0, "distance_alert": 0}
+    totals.update({name: RunningStats() for name in ERROR_NAMES})
+    return totals
+
+
+def _context(seg1, seg2, stages, noise, rng, totals):
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+    ctx = {"seg1": seg1, "seg2": seg2, "noise": noise, "rng": rng, "totals": totals,
+           "distance_threshold": DISTANCE_THRESHOLD, "angle_threshold": ANGLE_THRESHOLD}
+    if "parse" in stages:
+        ctx["text"] = format_text(seg1, seg2)
+    return ctx
+
+
+def _run_chunk(ctx, stages, timings=None, peaks=None, first=True):
+    """Bir parçayı seçili aşamalardan geçirir; alarm ve gürültü sonraki aşamalar için her zaman hesaplanır.
+
+    Çizim yalnızca ilk parçada (first) çalışır; süresi ve karesi boyuttan bağımsızdır.
+    """
+    items = {}
+    for stage in STAGES:
+        if stage == "render" and not first:
+            continue
+        needed = (stage in stages
+                  or (stage == "alert" and "aggregate" in stages)
+                  or (stage == "noise" and "aggregate" in stages))
+        if not needed:
+            continue
+        if peaks is not None:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t = time.perf_counter()
+        out = STAGE_FUNCS[stage](ctx)
+        elapsed = time.perf_counter() - t
+        if stage not in stages:
+            continue
+        items[stage] = out if stage == "render" else len(ctx["seg1"])
+        if timings is not None:
+            timings[stage] += elapsed
+        if peaks is not None:
+            peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - base)
+    return items
+
+
+def bench_size(count, stages=STAGES, chunk_pairs=CHUNK_PAIRS, seed=0, sigma=NOISE_SIGMA):
+    """count çift için aşama başına süre, işlem hızı ve tepe bellek satırları"""
+    noise = RangeNoise(sigma)
+    rng = make_rng(seed)
+    totals = _new_totals()
+    timings = dict.fromkeys(stages, 0.0)
+    items = dict.fromkeys(stages, 0)
+    peaks = dict.fromkeys(stages, 0)
+    if "render" in stages:
+        # matplotlib'in ilk yüklenmesi çizim belleğine sayılmasın
+        importlib.import_module("render")
+
+    for k, (seg1, seg2) in enumerate(iter_pairs(count, seed, chunk_pairs)):
+        ctx = _context(seg1, seg2, stages, noise, rng, totals)
+        if k == 0:
+            # Bellek geçişi: tracemalloc süreleri bozduğundan ayrı çalıştırılır
+            tracemalloc.start()
+            try:
+                _run_chunk(dict(ctx, totals=_new_totals()), stages, peaks=peaks)
+            finally:
+                tracemalloc.stop()
+        for stage, n in _run_chunk(ctx, stages, timings=timings, first=k == 0).items():
+            items[stage] += n
+        del ctx
+
+    rows = []
+    for stage in stages:
+        seconds = timings[stage]
+        rows.append({
+            "stage": stage,
+            "pairs": count,
+            "items": items[stage],
+            "unit": "frames" if stage == "render" else "pairs",
+            "seconds": seconds,
+            "throughput": items[stage] / seconds if seconds > 0 else 0.0,
+            "peak_bytes": int(peaks[stage]),
+        })
+    return rows
+
+
+def _git_version():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, check=True, cwd=sys.path[0] or None)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=SIZES, stages=STAGES, chunk_pairs=CHUNK_PAIRS, seed=0, sigma=NOISE_SIGMA):
+    """Tüm boyutlar için JSON'a yazılabilir rapor"""
+    rows = []
+    for count in sizes:
+        rows.extend(bench_size(count, stages, chunk_pairs, seed, sigma))
+    return {
+        "version": _git_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "chunk_pairs": chunk_pairs,
+        "seed": seed,
+        "results": rows,
+    }
+
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    """Aynı (aşama, boyut) satırlarının süre oranları; tolerance'ı aşanlar gerilemedir"""
+    old = {(row["stage"], row["pairs"]): row for row in baseline["results"]}
+    rows = []
+    for row in report["results"]:
+        ref = old.get((row["stage"], row["pairs"]))
+        if ref is None or ref["seconds"] <= 0:
+            continue
+        ratio = row["seconds"] / ref["seconds"]
+        rows.append({"stage": row["stage"], "pairs": row["pairs"], "ratio": ratio,
+                     "memory_ratio": row["peak_bytes"] / ref["peak_bytes"] if ref["peak_bytes"] else None,
+                     "regression": ratio > tolerance})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aşama bazında performans ölçümü")
+    parser.add_argument("--sizes", type=float, nargs="+", default=list(SIZES), help="çift sayıları")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--chunk-pairs", type=int, default=CHUNK_PAIRS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--noise", type=float, default=NOISE_SIGMA, help="mesafe gürültüsü sigma (m)")
+    parser.add_argument("--out", default=None, help="JSON rapor dosyası")
+    parser.add_argument("--compare", default=None, help="karşılaştırılacak eski JSON rapor")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    stages = tuple(stage for stage in STAGES if stage in args.stages)
+    report = run_benchmarks([int(n) for n in args.sizes], stages, args.chunk_pairs,
+                            args.seed, args.noise)
+
+    print(f"{'aşama':<10} {'çift':>10} {'süre (s)':>10} {'hız':>18} {'tepe bellek':>12}")
+    for row in report["results"]:
+        print(f"{row['stage']:<10} {row['pairs']:>10} {row['seconds']:>10.4f} "
+              f"{row['throughput']:>10.0f} {row['unit'] + '/s':<8} {row['peak_bytes'] / 2**20:>9.1f} MB")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Rapor '{args.out}' dosyasina yazildi.")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        rows = compare(report, baseline, args.tolerance)
+        print(f"\n'{args.compare}' ({baseline.get('version')}) ile karşılaştırma:")
+        for row in rows:
+            flag = "  GERİLEME" if row["regression"] else ""
+            print(f"{row['stage']:<10} {row['pairs']:>10} {row['ratio']:>8.2f}x{flag}")
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Filo modu: bir zaman adımındaki tüm forkliftler arasında yakınlık taraması.
+
+Her segmentin sınır kutusu screen_range/2 kadar genişletilip düzgün bir
+ızgaraya yerleştirilir. Yalnızca aynı hücreyi paylaşan ve kutu aralığı
+screen_range'den küçük olan çiftler aday olur; DISTANCE_THRESHOLD ve m/n
+açı kontrolleri sadece bu adaylarda çalışır. Kaba kuvvet (tüm çiftler)
+yolu aynı aday tanımını kullanır, bu yüzden iki yol aynı alarmları verir.
+
+    python fleet.py            # 10 .. 10000 forklift için indeksli / kaba kuvvet karşılaştırması
+"""
+import argparse
+import time
+
+import numpy as np
+
+from alert_engine import DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, evaluate_alerts
+
+SCREEN_RANGE = 5.0  # bu mesafeden uzak kutular hiç kontrol edilmez (m)
+FORKLIFT_LENGTH = 3
+
+
+def bounding_boxes(segments):
+    """(F,2,2) segmentlerden (F,2) min ve (F,2) max köşeleri"""
+    return (np.minimum(segments[:, 0], segments[:, 1]),
+            np.maximum(segments[:, 0], segments[:, 1]))
+
+
+def box_gap(lo1, hi1, lo2, hi2):
+    """İki eksen hizalı kutu arasındaki en kısa mesafe (kesişiyorlarsa 0)"""
+    gap = np.maximum(0.0, np.maximum(lo1 - hi2, lo2 - hi1))
+    return np.hypot(gap[..., 0], gap[..., 1])
+
+
+def candidate_pairs(segments, screen_range=SCREEN_RANGE):
+    """Izgara indeksiyle kutu aralığı <= screen_range olan (i, j), i < j çiftleri"""
+    segments = np.asarray(segments, dtype=float)
+    count = len(segments)
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    lo, hi = bounding_boxes(segments)
+    lo_e = lo - screen_range / 2
+    hi_e = hi + screen_range / 2
+
+    # Hücre tipik (medyan) genişletilmiş kutu kadar; tek bir uzun kutu hücreyi
+    # büyütüp tüm filoyu aynı hücreye toplamasın diye büyük kutular örttükleri
+    # her hücreye yazılır
+    cell = max(float(np.median((hi_e - lo_e).max(axis=1))), 1e-9)
+    c_lo = np.floor(lo_e / cell).astype(np.int64)
+    c_hi = np.floor(hi_e / cell).astype(np.int64)
+
+    span = c_hi - c_lo + 1
+    cells = span[:, 0] * span[:, 1]
+    owners = np.repeat(np.arange(count), cells)
+    # Kutunun kendi hücreleri içindeki sıra numarası
+    local = np.arange(len(owners)) - np.repeat(np.cumsum(cells) - cells, cells)
+    cx = c_lo[owners, 0] + local // span[owners, 1]
+    cy = c_lo[owners, 1] + local % span[owners, 1]
+    # Hücre koordinatlarını tek bir anahtara paketle
+    keys = (cx << 32) ^ (cy & 0xFFFFFFFF)
+    order = np.lexsort((owners, keys))
+    keys = keys[order]
+    owners = owners[order]
+
+    # Aynı hücredeki kayıtlar sıralı dizide ardışıktır; k uzaklıktaki eşleri tara
+    found = []
+    k = 1
+    while k < len(keys):
+        same = keys[k:] == keys[:-k]
+        if not same.any():
+            break
+        found.append(np.stack([owners[:-k][same], owners[k:][same]], axis=-1))
+        k += 1
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate(found)
+    pairs = np.unique(pairs[:, 0] * count + pairs[:, 1])
+    pairs = np.stack([pairs // count, pairs % count], axis=-1)
+
+    near = box_gap(lo[pairs[:, 0]], hi[pairs[:, 0]], lo[pairs[:, 1]], hi[pairs[:, 1]]) <= screen_range
+    return pairs[near]
+
+
+def brute_force_pairs(segments, screen_range=SCREEN_RANGE, block=1024):
+    """Tüm i < j çiftlerini blok blok tarayan referans yol (O(N²))"""
+    segments = np.asarray(segments, dtype=float)
+    count = len(segments)
+    lo, hi = bounding_boxes(segments)
+    found = []
+    for start in range(0, count, block):
+        rows = np.arange(start, min(start + block, count))
+        gap = box_gap(lo[rows, None], hi[rows, None], lo[None], hi[None])
+        i, j = np.nonzero((gap <= screen_range) & (rows[:, None] < np.arange(count)[None]))
+        found.append(np.stack([rows[i], j], axis=-1))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(found)
+
+
+def screen_fleet(segments, ids=None, screen_range=SCREEN_RANGE,
+                 distance_threshold=DISTANCE_THRESHOLD, angle_threshold=ANGLE_THRESHOLD,
+                 indexed=True, distance_mode=DISTANCE_MODE):
+    """Bir zaman adımındaki filoyu tarar.
+
+    Dönen sözlükte aday çiftlerin forklift kimlikleri (`pairs`, küçük indeks
+    forklift 1 / A-B rolündedir), alarm maskeleri ve alarm veren çiftler
+    (`alert_ids`) bulunur.
+    """
+    segments = np.asarray(segments, dtype=float)
+    ids = np.arange(len(segments)) if ids is None else np.asarray(ids)
+    if indexed:
+        pairs = candidate_pairs(segments, screen_range)
+    else:
+        pairs = brute_force_pairs(segments, screen_range)
+    results = evaluate_alerts(segments[pairs[:, 0]], segments[pairs[:, 1]],
+                              distance_threshold, angle_threshold, details=False,
+                              distance_mode=distance_mode)
+    results["pairs"] = ids[pairs]
+    results["alert_ids"] = ids[pairs[results["alert"]]]
+    return results
+
+
+def random_fleet(count, rng, area_per_forklift=100.0, length=FORKLIFT_LENGTH):
+    """Sabit yoğunlukta rastgele yerleştirilmiş `count` forklift"""
+    side = np.sqrt(count * area_per_forklift)
+    center = rng.uniform(0, side, size=(count, 2))
+    heading = rng.uniform(0, 2 * np.pi, size=count)
+    half = np.stack([np.cos(heading), np.sin(heading)], axis=-1) * (length / 2)
+    return np.stack([center + half, center - half], axis=1)
+
+
+def benchmark(sizes=(10, 100, 1000, 10000), seed=0, screen_range=SCREEN_RANGE):
+    """İndeksli ve kaba kuvvet taramasını N büyüdükçe karşılaştırır"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for count in sizes:
+        segments = random_fleet(count, rng)
+        timings = {}
+        outputs = {}
+        for name, indexed in (("indexed", True), ("brute", False)):
+            t = time.perf_counter()
+            outputs[name] = screen_fleet(segments, screen_range=screen_range, indexed=indexed)
+            timings[name] = time.perf_counter() - t
+        same = np.array_equal(outputs["indexed"]["alert_ids"], outputs["brute"]["alert_ids"])
+        rows.append({
+            "forklifts": count,
+            "candidates": len(outputs["indexed"]["pairs"]),
+            "alerts": len(outputs["indexed"]["alert_ids"]),
+            "indexed_s": timings["indexed"],
+            "brute_s": timings["brute"],
+            "same": bool(same),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filo yakınlık taraması karşılaştırması")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--screen-range", type=float, default=SCREEN_RANGE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'N':>7} {'aday':>8} {'alarm':>7} {'indeksli (s)':>13} {'kaba (s)':>10} {'hız':>7}  aynı")
+    for row in benchmark(args.sizes, args.seed, args.screen_range):
+        print(f"{row['forklifts']:>7} {row['candidates']:>8} {row['alerts']:>7} "
+              f"{row['indexed_s']:>13.4f} {row['brute_s']:>10.4f} "
+              f"{row['brute_s'] / row['indexed_s']:>6.1f}x  {row['same']}")
+
+
+if __name__ == "__main__":
+    main()
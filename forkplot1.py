@@ -1,92 +1,45 @@
 import matplotlib.pyplot as plt
-import math
-import time
+from alert_engine import segments_to_arrays, evaluate_alerts
+from render import LiveRenderer
+from segment_io import load_segments
 
-segments = []
-
-with open("segments_for_geogebra.txt", "r") as file:
-    for line in file:
-        line = line.strip()
-        if not line.startswith("Segment[") or not line.endswith("]"):
-            continue 
-        coords_part = line[len("Segment["):-1]
-        points = coords_part.split('), (')
-        try:
-            p1 = points[0].replace('(', '').replace(')', '')
-            p2 = points[1].replace('(', '').replace(')', '')
-            x1, y1 = map(float, p1.split(','))
-            x2, y2 = map(float, p2.split(','))
-            segments.append(((x1, y1), (x2, y2)))
-        except (ValueError, IndexError):
-            continue  
-
-def draw_background(alert=False):
-    plt.xlim(-15, 15)
-    plt.ylim(-15, 15)
-    plt.axhline(0, color="black")
-    plt.axvline(0, color="black")
-    ax = plt.gca()
-    ax.set_facecolor('lightcoral' if alert else 'white')
-    for val in [15, -15]:
-        plt.axhline(val, linestyle="dashed", color="red")
-        plt.axvline(val, linestyle="dashed", color="red")
-
-def calculate_angle(p1, p2, p3):
-    """Üç nokta arasındaki açıyı hesaplar (radyan cinsinden)"""
-    v1 = (p1[0] - p2[0], p1[1] - p2[1])
-    v2 = (p3[0] - p2[0], p3[1] - p2[1])
-    dot = v1[0] * v2[0] + v1[1] * v2[1]
-    det = v1[0] * v2[1] - v1[1] * v2[0]
-    angle = math.atan2(det, dot)
-    return angle if angle >= 0 else angle + 2 * math.pi
-
-def distance(p, q):
-    return math.sqrt((p[0] - q[0])**2 + (p[1] - q[1])**2)
+segments, skipped = load_segments("segments_for_geogebra.txt")
 
 DISTANCE_THRESHOLD = 0.8
 ANGLE_THRESHOLD = 0.05
 step_counter = 0
 alert_counter = 0
-# Forklift animation
+
+# Tüm çiftler için alarm hesabı tek geçişte
+seg1_arr, seg2_arr = segments_to_arrays(segments)
+results = evaluate_alerts(seg1_arr, seg2_arr, DISTANCE_THRESHOLD, ANGLE_THRESHOLD)
+
+# Forklift animation: sanatçılar bir kez kurulur, karelerde yalnızca veriler güncellenir
+renderer = LiveRenderer(limit=15, point_names="ABCD", point_style=dict(ha='right', va='bottom'),
+                        info_pos=(-14, 14))
 for i in range(0, len(segments), 2):
-    plt.cla() 
     step_counter += 1
     seg1 = segments[i]
-    x1, y1 = zip(*seg1)
-    A = (x1[0], y1[0])
-    B = (x1[1], y1[1])
+    # Bilgi kutusunda noktalar sade sayı demetleri olarak yazılsın
+    A, B = map(tuple, seg1.tolist())
 
     alert_condition = False
+    info = None
+    seg2 = None
 
     if i + 1 < len(segments):
         seg2 = segments[i + 1]
-        x2, y2 = zip(*seg2)
-        C = (x2[0], y2[0])
-        D = (x2[1], y2[1])
-
-        # Angles
-        angle_CAD = calculate_angle(C, A, D)
-        angle_DBC = calculate_angle(D, B, C)
-        angle_ACB = calculate_angle(A, C, B)
-        angle_BDA = calculate_angle(B, D, A)
+        C, D = map(tuple, seg2.tolist())
 
-        ta = math.tan(angle_CAD)
-        tb = math.tan(angle_DBC)
-        tc = math.tan(angle_ACB)
-        td = math.tan(angle_BDA)
+        k = i // 2
+        ta = results["ta"][k]
+        tb = results["tb"][k]
+        tc = results["tc"][k]
+        td = results["td"][k]
+        m = results["m"][k]
+        n = results["n"][k]
 
-        m = ta * tc * td
-        n = tb * tc * td
-
-        # Angle treshold
-        if abs(m) > ANGLE_THRESHOLD or abs(n) > ANGLE_THRESHOLD:
-            alert_condition = True
-
-        # Dist treshold
-        for p1 in [A, B]:
-            for p2 in [C, D]:
-                if distance(p1, p2) < DISTANCE_THRESHOLD:
-                    alert_condition = True
+        alert_condition = bool(results["alert"][k])
         if alert_condition:
             alert_counter += 1
         # Infobox
@@ -98,27 +51,14 @@ for i in range(0, len(segments), 2):
             f"td (tan(BDA)) = {td:.2f}\n"
             f"m = {m:.2f}, n = {n:.2f}\n"
         )
-        for p1 in [A, B]:
-            for p2 in [C, D]:
-                info += f"dist({p1}, {p2}) = {distance(p1, p2):.2f}\n"
-
-        plt.text(-14, 14, info, fontsize=10, bbox=dict(facecolor='white', alpha=0.7))
-
-    # Drawing
-    draw_background(alert=alert_condition)
-    plt.plot(x1, y1, marker='o', color='blue', label='Forklift 1 (A-B)')
-    plt.text(A[0], A[1], 'A', fontsize=12, ha='right', va='bottom', color='red')
-    plt.text(B[0], B[1], 'B', fontsize=12, ha='right', va='bottom', color='red')
-
-    if i + 1 < len(segments):
-        plt.plot(x2, y2, marker='o', color='green', label='Forklift 2 (C-D)')
-        plt.text(C[0], C[1], 'C', fontsize=12, ha='right', va='bottom', color='red')
-        plt.text(D[0], D[1], 'D', fontsize=12, ha='right', va='bottom', color='red')
+        for (p1, p2), d in zip([(A, C), (A, D), (B, C), (B, D)], results["dist"][k]):
+            info += f"dist({p1}, {p2}) = {d:.2f}\n"
 
-    plt.title(f"Adım {i // 2 + 1}")
-    plt.legend()
-    plt.pause(0.001)
+    # Drawing: yetişilemeyen kareler atlanır
+    renderer.update([(A, B), (C, D) if seg2 is not None else None], alert=alert_condition,
+                    info=info, title=f"Adım {i // 2 + 1}")
 
+renderer.flush()
 plt.show()
 
 print(f"Total step: {step_counter}")
@@ -0,0 +1,205 @@
+"""Açı, mesafe ve gürültülü ölçüm çekirdekleri; tüm betiklerin ortak kaynağı.
+
+Noktalar son ekseni (x, y) olan dizilerdir; (x, y) demetleri de kabul
+edilir ve o zaman sonuç numpy skaleridir. Her çekirdek sonucu `out=`
+tamponuna yazabilir, ara değerler için de `work=` ile (WORK_SLOTS, *boyut)
+bir karalama tamponu alır (segment_distance: SEGMENT_WORK_SLOTS). İkisi de verildiğinde çekirdek hiç bellek
+ayırmaz; sıcak döngüde tüm çekirdekler aynı work tamponunu paylaşabilir:
+
+    work = np.empty((WORK_SLOTS, n))
+    angle = np.empty(n)
+    calculate_angle(A, C, B, out=angle, work=work)
+
+Eski betiklerdeki skaler sürümlerle eşdeğerlik test_geometry.py'de denetlenir:
+
+    python -m pytest test_geometry.py
+"""
+import numpy as np
+
+WORK_SLOTS = 6  # en çok karalama isteyen çekirdek: calculate_angle
+SEGMENT_WORK_SLOTS = 8  # segment_distance
+
+
+def _points(*points):
+    return [np.asarray(p, dtype=float) for p in points]
+
+
+def _buffer(out, shape):
+    return np.empty(shape) if out is None else out
+
+
+def _slots(work, count, shape):
+    if work is None:
+        work = np.empty((count,) + shape)
+    # work[k, ...] 0 boyutlu durumda da (demet girdi) yazılabilir bir dizi görünümüdür
+    return [work[k, ...] for k in range(count)]
+
+
+def _result(value, out):
+    # Demet girdide (0 boyutlu sonuç) eski betiklerdeki gibi skaler dön
+    return value[()] if out is None and value.ndim == 0 else value
+
+
+def dot_det(p1, p2, p3, out=None, work=None):
+    """p2 köşesindeki v1 = p1 - p2 ve v2 = p3 - p2 için (dot, det).
+
+    out verilirse (dot, det) tampon ikilisidir; work en az 4 yuva ister.
+    """
+    p1, p2, p3 = _points(p1, p2, p3)
+    shape = np.broadcast_shapes(p1.shape, p2.shape, p3.shape)[:-1]
+    dot, det = (np.empty(shape), np.empty(shape)) if out is None else out
+    v1x, v1y, v2x, v2y = _slots(work, 4, shape)
+    np.subtract(p1[..., 0], p2[..., 0], out=v1x)
+    np.subtract(p1[..., 1], p2[..., 1], out=v1y)
+    np.subtract(p3[..., 0], p2[..., 0], out=v2x)
+    np.subtract(p3[..., 1], p2[..., 1], out=v2y)
+    np.multiply(v1x, v2x, out=dot)
+    np.multiply(v1y, v2y, out=det)
+    np.add(dot, det, out=dot)
+    np.multiply(v1x, v2y, out=det)
+    np.multiply(v1y, v2x, out=v1x)
+    np.subtract(det, v1x, out=det)
+    if out is None:
+        return _result(dot, None), _result(det, None)
+    return dot, det
+
+
+def angle_from_dot_det(dot, det, out=None, work=None):
+    """atan2(det, dot) açısı, [0, 2π) aralığında; work 1 yuva ister"""
+    dot, det = _points(dot, det)
+    shape = np.broadcast_shapes(dot.shape, det.shape)
+    angle = _buffer(out, shape)
+    negative = _slots(work, 1, shape)[0]
+    np.arctan2(det, dot, out=angle)
+    # Negatif açılara 2π ekle (eşitlikte -0.0 olduğu gibi kalır)
+    np.less(angle, 0, out=negative)
+    np.multiply(negative, 2 * np.pi, out=negative)
+    np.add(angle, negative, out=angle)
+    return _result(angle, out)
+
+
+def calculate_angle(p1, p2, p3, out=None, work=None):
+    """p2 köşesindeki açı, [0, 2π) aralığında; work 6 yuva ister"""
+    p1, p2, p3 = _points(p1, p2, p3)
+    shape = np.broadcast_shapes(p1.shape, p2.shape, p3.shape)[:-1]
+    angle = _buffer(out, shape)
+    if work is None:
+        work = np.empty((WORK_SLOTS,) + shape)
+    dot, det = _slots(work, WORK_SLOTS, shape)[4:]
+    dot_det(p1, p2, p3, out=(dot, det), work=work)
+    angle_from_dot_det(dot, det, out=angle, work=work)
+    return _result(angle, out)
+
+
+def distance(p, q, out=None, work=None):
+    """İki nokta arasındaki Öklid mesafesi; work 1 yuva ister"""
+    p, q = _points(p, q)
+    shape = np.broadcast_shapes(p.shape, q.shape)[:-1]
+    dist = _buffer(out, shape)
+    dy = _slots(work, 1, shape)[0]
+    np.subtract(p[..., 0], q[..., 0], out=dist)
+    np.subtract(p[..., 1], q[..., 1], out=dy)
+    np.multiply(dist, dist, out=dist)
+    np.multiply(dy, dy, out=dy)
+    np.add(dist, dy, out=dist)
+    np.sqrt(dist, out=dist)
+    return _result(dist, out)
+
+
+def noisy_point(p1, p2, target_distance, out=None, work=None):
+    """p1'den p2 yönünde target_distance uzaklıktaki nokta; p1 == p2 ise p1.
+
+    out (..., 2) boyutundadır; work 2 yuva ister.
+    """
+    p1, p2 = _points(p1, p2)
+    target_distance = np.asarray(target_distance, dtype=float)
+    shape = np.broadcast_shapes(p1.shape, p2.shape, target_distance.shape + (2,))
+    point = _buffer(out, shape)
+    norm, zero = _slots(work, 2, shape[:-1])
+    np.subtract(p2, p1, out=point)
+    np.hypot(point[..., 0], point[..., 1], out=norm)
+    # p1 == p2 ise yön vektörü sıfırdır; bölmeyi 1'e yaparak p1 dönülür
+    np.equal(norm, 0, out=zero)
+    np.add(norm, zero, out=norm)
+    np.divide(target_distance, norm, out=norm)
+    np.multiply(point, norm[..., None], out=point)
+    np.add(point, p1, out=point)
+    return point
+
+
+def angular_error(true_angle, noisy_angle, out=None, work=None):
+    """İki açı arasındaki en kısa fark, [0, π]; work 1 yuva ister"""
+    true_angle, noisy_angle = _points(true_angle, noisy_angle)
+    shape = np.broadcast_shapes(true_angle.shape, noisy_angle.shape)
+    error = _buffer(out, shape)
+    other = _slots(work, 1, shape)[0]
+    np.subtract(true_angle, noisy_angle, out=error)
+    np.abs(error, out=error)
+    np.subtract(2 * np.pi, error, out=other)
+    np.minimum(error, other, out=error)
+    return _result(error, out)
+
+
+def _point_segment_distance2(p, a, b, out, work):
+    """p noktasının [a, b] segmentine uzaklığının karesi; work 5 yuva ister"""
+    ux, uy, vx, vy, t = _slots(work, 5, out.shape)
+    np.subtract(b[..., 0], a[..., 0], out=ux)
+    np.subtract(b[..., 1], a[..., 1], out=uy)
+    np.subtract(p[..., 0], a[..., 0], out=vx)
+    np.subtract(p[..., 1], a[..., 1], out=vy)
+    # t = clip(u·v / |u|², 0, 1); a == b ise u·v = 0 olduğundan t = 0
+    np.multiply(ux, vx, out=t)
+    np.multiply(uy, vy, out=out)
+    np.add(t, out, out=t)
+    np.hypot(ux, uy, out=out)
+    np.multiply(out, out, out=out)
+    np.maximum(out, np.finfo(float).tiny, out=out)
+    np.divide(t, out, out=t)
+    np.clip(t, 0, 1, out=t)
+    # p - (a + t·u)
+    np.multiply(ux, t, out=ux)
+    np.multiply(uy, t, out=uy)
+    np.subtract(vx, ux, out=vx)
+    np.subtract(vy, uy, out=vy)
+    np.multiply(vx, vx, out=out)
+    np.multiply(vy, vy, out=vy)
+    np.add(out, vy, out=out)
+    return out
+
+
+def segment_distance(a, b, c, d, out=None, work=None, squared=False):
+    """[a, b] ve [c, d] segmentleri arasındaki en kısa mesafe; work 8 yuva ister.
+
+    Segmentler kesişmiyorsa en kısa mesafe dört uçtan birinin diğer
+    segmente uzaklığıdır; uçları birbirinin doğrusunun kesin olarak iki
+    yanında kalan (kesişen) segmentlerde mesafe 0'dır. Yalnızca uç noktalar
+    arası mesafeden farklı olarak yan yana ya da çapraz duran forkliftlerde
+    de gerçek yakınlığı verir. squared=True mesafenin karesini döner.
+    """
+    a, b, c, d = _points(a, b, c, d)
+    shape = np.broadcast_shapes(a.shape, b.shape, c.shape, d.shape)[:-1]
+    dist = _buffer(out, shape)
+    if work is None:
+        work = np.empty((SEGMENT_WORK_SLOTS,) + shape)
+    slots = _slots(work, SEGMENT_WORK_SLOTS, shape)
+    candidate = slots[7]
+    _point_segment_distance2(a, c, d, dist, work)
+    for p, start, end in ((b, c, d), (c, a, b), (d, a, b)):
+        _point_segment_distance2(p, start, end, candidate, work)
+        np.minimum(dist, candidate, out=dist)
+
+    # Kesişme: c, d AB doğrusunun; a, b CD doğrusunun kesin olarak iki yanında
+    sink, side_ab, side_cd = slots[4], slots[5], slots[6]
+    dot_det(b, a, c, out=(sink, side_ab), work=work)
+    dot_det(b, a, d, out=(sink, candidate), work=work)
+    np.multiply(side_ab, candidate, out=side_ab)
+    dot_det(d, c, a, out=(sink, side_cd), work=work)
+    dot_det(d, c, b, out=(sink, candidate), work=work)
+    np.multiply(side_cd, candidate, out=side_cd)
+    np.maximum(side_ab, side_cd, out=side_ab)
+    np.greater_equal(side_ab, 0, out=side_cd)
+    np.multiply(dist, side_cd, out=dist)
+    if not squared:
+        np.sqrt(dist, out=dist)
+    return _result(dist, out)
+
@@ -0,0 +1,137 @@
+"""Matplotlib'e dokunmadan alarm ve istatistik hesabı yapan toplu çalışma modu.
+
+    python headless.py segments_for_geogebra.txt
+    python headless.py segments_for_geogebra.txt --noise 0.5 --seed 1
+    python headless.py segments_for_geogebra.txt --distance-mode endpoint   # eski uç nokta sayıları
+    python headless.py big_log.txt --noise 0.5 --chunk-pairs 100000
+    python scenario.py --count 1e6 --format binary | python headless.py - --format binary
+    python headless.py segments_for_geogebra.txt --render alerts --out alerts.mp4
+    python headless.py segments_for_geogebra.txt --render every --every 100 --out frames/
+    python headless.py big_log.txt --noise 0.5 --chunk-pairs 100000 --store results/
+    python headless.py big_log.txt --chunk-pairs 100000 --report run.json --profile cprofile
+"""
+import argparse
+import math
+
+import numpy as np
+
+import instrument
+from alert_engine import (DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, DISTANCE_MODES,
+                          segments_to_arrays,
+                          evaluate_alerts, angular_errors)
+from segment_io import load_segments
+from result_store import ResultWriter
+from streaming import ERROR_NAMES, RunningStats, stream_analysis
+
+
+def run(path, distance_threshold=DISTANCE_THRESHOLD, angle_threshold=ANGLE_THRESHOLD,
+        noise=None, seed=None, fmt=None, distance_mode=DISTANCE_MODE):
+    """Dosyadaki tüm çiftler için alarmları ve isteğe bağlı açısal hataları hesaplar"""
+    segments, skipped = load_segments(path, fmt=fmt)
+    seg1, seg2 = segments_to_arrays(segments)
+    results = evaluate_alerts(seg1, seg2, distance_threshold, angle_threshold,
+                              distance_mode=distance_mode)
+
+    # Eşi olmayan son segment de bir adım sayılır (forkplot1.py ile aynı)
+    stats = {
+        "steps": (len(segments) + 1) // 2,
+        "skipped_lines": skipped,
+        "alerts": int(results["alert"].sum()),
+        "angle_alerts": int(results["angle_alert"].sum()),
+        "distance_alerts": int(results["distance_alert"].sum()),
+    }
+    if noise is not None:
+        errors = angular_errors(seg1, seg2, np.random.default_rng(seed), scale=noise)
+        results.update(errors)
+        for name in ERROR_NAMES:
+            stats[f"err_{name}"] = RunningStats().update(errors[f"err_{name}"]).summary()
+    return seg1, seg2, results, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help='segment dosyası ("-" = stdin)')
+    parser.add_argument("--format", choices=["text", "binary"], default=None,
+                        help="girdi biçimi (varsayılan: uzantıdan, .bin = binary)")
+    parser.add_argument("--distance-threshold", type=float, default=DISTANCE_THRESHOLD)
+    parser.add_argument("--angle-threshold", type=float, default=ANGLE_THRESHOLD)
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default=DISTANCE_MODE,
+                        help="segment: AB-CD gerçek en kısa mesafe; endpoint: eski dört uç nokta testi")
+    parser.add_argument("--noise", type=float, default=None,
+                        help="mesafe ölçüm gürültüsü standart sapması (m)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-pairs", type=int, default=None,
+                        help="dosyayı bu kadar çiftlik parçalarla akış halinde işle")
+    parser.add_argument("--render", choices=["alerts", "every", "all"], default=None,
+                        help="yalnızca seçilen kareleri çiz")
+    parser.add_argument("--every", type=int, default=100)
+    parser.add_argument("--out", default="frames",
+                        help="video dosyası (.mp4/.gif) veya PNG dizini")
+    parser.add_argument("--fps", type=int, default=10)
+    parser.add_argument("--store", default=None,
+                        help="adım başına sonuçları bu dizine sütunlu depo olarak yaz")
+    parser.add_argument("--report", default=None,
+                        help='aşama süreleri ve sayaçları bu JSON dosyasına yaz ("-" = stdout)')
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], default=None)
+    parser.add_argument("--profile-out", default=None,
+                        help="profil çıktısı (cProfile: pstats, pyinstrument: HTML); yoksa stderr")
+    args = parser.parse_args(argv)
+
+    instruments = instrument.enable() if args.report else None
+    try:
+        with instrument.profile(args.profile, args.profile_out):
+            stats = _execute(parser, args)
+    finally:
+        if instruments is not None:
+            instrument.disable()
+    if instruments is not None:
+        instruments.write(args.report, stats=stats)
+        if args.report != "-":
+            print(f"Ölçüm raporu '{args.report}' dosyasina yazildi.")
+
+
+def _execute(parser, args):
+    if args.chunk_pairs:
+        if args.render:
+            parser.error("--render akış modunda kullanılamaz")
+        store = ResultWriter(args.store) if args.store else None
+        try:
+            stats = stream_analysis(args.path, args.chunk_pairs, args.distance_threshold,
+                                    args.angle_threshold, args.noise, args.seed, args.format,
+                                    store=store, distance_mode=args.distance_mode)
+        finally:
+            if store is not None:
+                store.close()
+    else:
+        seg1, seg2, results, stats = run(args.path, args.distance_threshold,
+                                         args.angle_threshold, args.noise, args.seed,
+                                         args.format, args.distance_mode)
+        if args.store:
+            with ResultWriter(args.store) as store:
+                store.append_results(results)
+
+    print(f"Total step: {stats['steps']}")
+    print(f"Total alert: {stats['alerts']}")
+    print(f"  angle (m/n): {stats['angle_alerts']}")
+    print(f"  distance:    {stats['distance_alerts']}")
+    if stats["skipped_lines"]:
+        print(f"Skipped lines: {stats['skipped_lines']}")
+    for name in ERROR_NAMES:
+        if f"err_{name}" in stats:
+            err = stats[f"err_{name}"]
+            print(f"{name} acisal sapma: ortalama {math.degrees(err['mean']):.2f}°, "
+                  f"std {math.degrees(err['std']):.2f}°, max {math.degrees(err['max']):.2f}°")
+    if args.store:
+        print(f"Adım sonuçları '{args.store}' deposuna yazildi.")
+
+    if args.render:
+        # matplotlib yalnızca çizim istendiğinde yüklenir
+        from render import select_frames, render_frames
+        frames = select_frames(results["alert"], args.render, args.every)
+        written = render_frames(seg1, seg2, results, frames, args.out, fps=args.fps)
+        print(f"{written} kare yazildi: {args.out}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Alarm hattı için hafif ölçüm katmanı: adlandırılmış zamanlayıcılar ve sayaçlar.
+
+Varsayılan olarak kapalıdır. Kapalıyken timer() paylaşılan boş bir bağlam
+döner, count() ve timed() ile sarılmış fonksiyonlar tek bir `None`
+karşılaştırmasından başka iş yapmaz. enable() ile açıldığında aşama
+süreleri (çağrı sayısı ve toplam saniye) ile sayaçlar (alarm ölçütü
+kırılımı, ayrıştırmada atlanan satırlar vb.) birikir; report() bunları JSON
+yazılabilir bir sözlük olarak döner.
+
+profile() isteğe bağlı olarak tüm çalışmayı cProfile ya da (kuruluysa)
+pyinstrument altında çalıştırır.
+
+    python headless.py big_log.txt --chunk-pairs 100000 --report run.json
+    python headless.py big_log.txt --profile cprofile --profile-out run.prof
+"""
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+_NULL = nullcontext()
+_active = None
+
+
+class _Timer:
+    __slots__ = ("slot", "start")
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.slot[0] += 1
+        self.slot[1] += time.perf_counter() - self.start
+        return False
+
+
+class Instruments:
+    """Bir çalışmanın zamanlayıcı ve sayaçları"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timers = {}    # ad -> [çağrı, saniye]
+        self.counters = {}  # ad -> tamsayı
+
+    def timer(self, name):
+        slot = self.timers.get(name)
+        if slot is None:
+            slot = self.timers[name] = [0, 0.0]
+        return _Timer(slot)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def report(self, **extra):
+        """Süreler, sayaçlar ve ek alanlar (ör. sonuç istatistikleri) sözlüğü"""
+        report = {
+            "wall_seconds": time.perf_counter() - self.started,
+            "timers": {name: {"calls": calls, "seconds": seconds}
+                       for name, (calls, seconds) in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        report.update(extra)
+        return report
+
+    def write(self, path, **extra):
+        """report() çıktısını JSON dosyasına yazar ("-" = stdout)"""
+        report = self.report(**extra)
+        if path == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(path, "w") as file:
+                json.dump(report, file, indent=2)
+        return report
+
+
+def enable():
+    """Yeni bir ölçüm oturumu başlatır ve onu döner"""
+    global _active
+    _active = Instruments()
+    return _active
+
+
+def disable():
+    """Ölçümü kapatır; son oturumu (ya da None) döner"""
+    global _active
+    instruments, _active = _active, None
+    return instruments
+
+
+def enabled():
+    return _active is not None
+
+
+def timer(name):
+    """`with timer("alert"):` bloğunun süresini biriktirir"""
+    return _NULL if _active is None else _active.timer(name)
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
+
+
+def timed(name):
+    """Fonksiyonun her çağrısını `name` zamanlayıcısına sayan dekoratör"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile(kind=None, out=None):
+    """Bloğu profilleyici altında çalıştırır.
+
+    kind "cprofile" ya da "pyinstrument" (ayrıca kurulmalı) olabilir; None
+    ise hiçbir şey yapmaz. out verilirse cProfile istatistikleri (pstats) ya
+    da pyinstrument HTML çıktısı bu dosyaya yazılır, verilmezse en pahalı
+    çağrılar stderr'e basılır.
+    """
+    if kind is None:
+        yield
+        return
+    if kind == "cprofile":
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            if out:
+                profiler.dump_stats(out)
+            else:
+                pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    elif kind == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            if out:
+                with open(out, "w") as file:
+                    file.write(profiler.output_html())
+            else:
+                sys.stderr.write(profiler.output_text())
+    else:
+        raise ValueError(f"bilinmeyen profilleyici: {kind}")
@@ -0,0 +1,390 @@
+"""Soket üzerinden sürekli gelen forklift pozları için asyncio alarm ön ucu.
+
+Bağlantı başına akış, dosyalardaki gibi ardışık segment çiftleridir: ya
+`Segment[(x1, y1), (x2, y2)]` satırları ya da segment başına dört
+küçük-endian float32 (scenario.py'nin ikili biçimi). Okunan parçalar
+sınırlı bir kuyruğa konur; toplayıcı onları en fazla max_batch çiftlik ve
+en fazla max_latency saniye bekleyen mikro-partilere birleştirip tek
+evaluate_alerts çağrısından geçirir. Alarmlar aynı bağlantıdan geri yazılır:
+
+    ALERT <adım> angle=<0|1> distance=<0|1>
+    DONE steps=<n> alerts=<k>          (istemci yazmayı bitirince)
+
+Kuyruk doluysa okuyucu beklediği için soketten okuma durur ve TCP akış
+denetimi göndereni yavaşlatır (geri basınç); hiçbir kare atılmaz. Uçtan
+uca gecikme, verinin sokete ulaştığı andan alarmın yazılıp boşaltıldığı
+ana kadar ölçülür ve logaritmik histogramda tutulur.
+
+    python live_feed.py --port 9000
+    python live_feed.py --unix /tmp/forklift.sock --format binary
+    python scenario.py --count 1e5 --format binary | python live_feed.py --replay - --port 9000 --format binary
+    python live_feed.py --demo --count 200000 --format binary   # yerel sunucu + yeniden oynatıcı
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from alert_engine import DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, DISTANCE_MODES, evaluate_alerts
+from segment_io import SEGMENT_BYTES, parse_binary, parse_segments
+
+MAX_BATCH = 4096  # çift
+MAX_LATENCY = 0.005  # s; partinin ilk çifti en fazla bu kadar bekler
+QUEUE_CHUNKS = 64  # bağlantı başına kuyrukta bekleyebilecek okuma parçası
+READ_BYTES = 1 << 16
+
+
+class LatencyHistogram:
+    """Logaritmik kutulu gecikme histogramı (saniye); sabit bellek, birleştirilebilir"""
+
+    def __init__(self, low=1e-6, high=10.0, bins_per_decade=20):
+        self.low = float(low)
+        self.high = float(high)
+        self.bins_per_decade = int(bins_per_decade)
+        bins = int(math.ceil(math.log10(self.high / self.low) * self.bins_per_decade))
+        self.edges = self.low * 10.0 ** (np.arange(bins + 1) / self.bins_per_decade)
+        # İlk ve son kutular aralık dışını da toplar
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        seconds = np.asarray(seconds, dtype=float).ravel()
+        if seconds.size == 0:
+            return self
+        index = np.clip(np.searchsorted(self.edges, seconds, side="right") - 1, 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        self.count += seconds.size
+        self.total += float(seconds.sum())
+        self.max = max(self.max, float(seconds.max()))
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("LatencyHistogram kutuları uyuşmuyor")
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Yaklaşık q yüzdeliği (kutu içinde geometrik aradeğerleme)"""
+        if not self.count:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        k = int(np.searchsorted(cumulative, q * self.count))
+        k = min(k, len(self.counts) - 1)
+        below = cumulative[k - 1] if k else 0
+        fraction = (q * self.count - below) / max(self.counts[k], 1)
+        lo, hi = self.edges[k], self.edges[k + 1]
+        return min(float(lo * (hi / lo) ** fraction), self.max)
+
+    def summary(self):
+        """count ve milisaniye cinsinden mean, p50, p95, p99, max"""
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {"count": self.count, "mean": 1e3 * self.total / self.count,
+                "p50": 1e3 * self.quantile(0.50), "p95": 1e3 * self.quantile(0.95),
+                "p99": 1e3 * self.quantile(0.99), "max": 1e3 * self.max}
+
+
+class PairDecoder:
+    """Parça parça gelen baytları (seg1, seg2) dizilerine çevirir; yarım kayıt ve tek segment sonrakine devreder"""
+
+    def __init__(self, fmt="text"):
+        self.binary = fmt == "binary"
+        self.buffer = b""
+        self.carry = np.empty((0, 2, 2))
+        self.skipped = 0
+
+    def feed(self, data):
+        data = self.buffer + data
+        if self.binary:
+            usable = len(data) - len(data) % SEGMENT_BYTES
+            segments = parse_binary(data[:usable])
+        else:
+            usable = data.rfind(b"\n") + 1
+            segments, skipped = parse_segments(data[:usable].decode("utf-8", "replace"))
+            self.skipped += skipped
+        self.buffer = data[usable:]
+        return self._pairs(segments)
+
+    def close(self):
+        """Akış sonunda satır sonu olmadan kalan son satırı da işler"""
+        if self.binary or not self.buffer.strip():
+            self.buffer = b""
+            return self._pairs(np.empty((0, 2, 2)))
+        return self.feed(b"\n")
+
+    def _pairs(self, segments):
+        if len(self.carry):
+            segments = np.concatenate([self.carry, segments])
+        pairs = len(segments) // 2
+        self.carry = segments[2 * pairs:]
+        return segments[0:2 * pairs:2], segments[1:2 * pairs:2]
+
+
+class LiveFeed:
+    """Bağlantıları mikro-partilerle işleyen alarm sunucusu; gecikme histogramı tüm bağlantılar için ortaktır"""
+
+    def __init__(self, fmt="text", distance_threshold=DISTANCE_THRESHOLD,
+                 angle_threshold=ANGLE_THRESHOLD, max_batch=MAX_BATCH, max_latency=MAX_LATENCY,
+                 queue_chunks=QUEUE_CHUNKS, distance_mode=DISTANCE_MODE):
+        self.fmt = fmt
+        self.distance_threshold = distance_threshold
+        self.angle_threshold = angle_threshold
+        self.distance_mode = distance_mode
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.queue_chunks = queue_chunks
+        self.latency = LatencyHistogram()
+        self.totals = {"connections": 0, "steps": 0, "alerts": 0, "batches": 0, "skipped_lines": 0}
+
+    async def handle(self, reader, writer):
+        """asyncio.start_server / start_unix_server bağlantı işleyicisi"""
+        self.totals["connections"] += 1
+        queue = asyncio.Queue(maxsize=self.queue_chunks)
+        batcher = asyncio.ensure_future(self._batcher(queue, writer))
+        decoder = PairDecoder(self.fmt)
+        loop = asyncio.get_running_loop()
+        # Okuma boyutu bir partiyi aşmasın diye ikili akışta çift sayısıyla sınırlanır
+        read_bytes = min(READ_BYTES, 2 * SEGMENT_BYTES * self.max_batch) if decoder.binary else READ_BYTES
+        try:
+            while True:
+                data = await reader.read(read_bytes)
+                arrival = loop.time()
+                seg1, seg2 = decoder.close() if not data else decoder.feed(data)
+                # Metin okumaları max_batch'ten çok çift taşıyabilir; kuyruğa en fazla
+                # max_batch'lik dilimler konur ki hiçbir parti sınırı aşmasın
+                for start in range(0, len(seg1), self.max_batch):
+                    # Kuyruk doluysa burada beklenir ve soketten okunmaz: geri basınç
+                    await queue.put((arrival, seg1[start:start + self.max_batch],
+                                     seg2[start:start + self.max_batch]))
+                if not data:
+                    break
+        finally:
+            await queue.put(None)
+            steps, alerts = await batcher
+            self.totals["skipped_lines"] += decoder.skipped
+        writer.write(f"DONE steps={steps} alerts={alerts}\n".encode())
+        await writer.drain()
+        writer.close()
+
+    async def _batcher(self, queue, writer):
+        """Kuyruktaki parçaları mikro-partilere toplar.
+
+        Parti, ilk parçası max_latency kadar beklediğinde ya da bir sonraki
+        parça max_batch'i aşıracağında kapanır (aşan parça sonraki partiyi
+        başlatır). Süre dolmuşsa kuyrukta zaten bekleyenler beklemeden
+        alınır; patlamalarda birikmiş iş büyük partilerle eritilir.
+        """
+        loop = asyncio.get_running_loop()
+        steps = 0
+        alerts = 0
+        pending = await queue.get()
+        while pending is not None:
+            batch = [pending]
+            pairs = len(pending[1])
+            deadline = pending[0] + self.max_latency
+            pending = None
+            closed = False
+            while True:
+                timeout = deadline - loop.time()
+                if timeout <= 0 and queue.empty():
+                    break
+                try:
+                    item = queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    closed = True
+                    break
+                if pairs + len(item[1]) > self.max_batch:
+                    pending = item
+                    break
+                batch.append(item)
+                pairs += len(item[1])
+            alerts += await self._publish(batch, steps, writer)
+            steps += pairs
+            if pending is None and not closed:
+                pending = await queue.get()
+        return steps, alerts
+
+    async def _publish(self, batch, first_step, writer):
+        loop = asyncio.get_running_loop()
+        seg1 = np.concatenate([item[1] for item in batch])
+        seg2 = np.concatenate([item[2] for item in batch])
+        results = evaluate_alerts(seg1, seg2, self.distance_threshold, self.angle_threshold,
+                                  details=False, distance_mode=self.distance_mode)
+        hits = np.flatnonzero(results["alert"])
+        if len(hits):
+            angle = results["angle_alert"][hits]
+            near = results["distance_alert"][hits]
+            writer.write("".join(f"ALERT {first_step + k} angle={a:d} distance={d:d}\n"
+                                 for k, a, d in zip(hits.tolist(), angle.tolist(), near.tolist())).encode())
+        # Yavaş okuyan istemci alarm yazımını da bekletir; o sırada girdi kuyruğu dolar
+        await writer.drain()
+        now = loop.time()
+        self.latency.record(np.repeat([now - item[0] for item in batch], [len(item[1]) for item in batch]))
+        self.totals["steps"] += len(seg1)
+        self.totals["alerts"] += len(hits)
+        self.totals["batches"] += 1
+        return len(hits)
+
+    def report(self):
+        totals = dict(self.totals)
+        totals["latency_ms"] = self.latency.summary()
+        totals["mean_batch"] = totals["steps"] / totals["batches"] if totals["batches"] else 0.0
+        return totals
+
+
+async def serve(feed, host="127.0.0.1", port=None, unix=None):
+    """LiveFeed'i TCP (host, port) ya da UNIX soketinde başlatır; asyncio sunucusunu döner"""
+    if unix is not None:
+        return await asyncio.start_unix_server(feed.handle, path=unix)
+    return await asyncio.start_server(feed.handle, host, port)
+
+
+async def replay(source, host="127.0.0.1", port=None, unix=None, chunk_bytes=READ_BYTES,
+                 rate=None):
+    """Yerel yeniden oynatıcı: bayt dizisini ya da dosya nesnesini gönderir, alarm satırlarını toplar.
+
+    rate (bayt/s) verilirse gönderim o hızla sınırlanır, yoksa patlama
+    halinde tam hızla yazılır. (alarm adımları, DONE satırı) döner.
+    """
+    if unix is not None:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def send():
+        start = time.perf_counter()
+        sent = 0
+        read = source.read if hasattr(source, "read") else None
+        offset = 0
+        while True:
+            if read is not None:
+                data = read(chunk_bytes)
+            else:
+                data = source[offset:offset + chunk_bytes]
+                offset += len(data)
+            if not data:
+                break
+            writer.write(data)
+            # Sunucu okumayı durdurursa burada beklenir
+            await writer.drain()
+            sent += len(data)
+            if rate:
+                await asyncio.sleep(max(sent / rate - (time.perf_counter() - start), 0))
+        writer.write_eof()
+
+    sender = asyncio.ensure_future(send())
+    steps = []
+    done = None
+    async for line in reader:
+        if line.startswith(b"ALERT "):
+            steps.append(int(line.split()[1]))
+        elif line.startswith(b"DONE "):
+            done = line.decode().strip()
+    await sender
+    writer.close()
+    return np.array(steps, dtype=np.int64), done
+
+
+def print_report(feed):
+    report = feed.report()
+    latency = report["latency_ms"]
+    print(f"Bağlantı: {report['connections']}, adım: {report['steps']}, alarm: {report['alerts']}, "
+          f"parti: {report['batches']} (ortalama {report['mean_batch']:.0f} çift)")
+    print(f"Uçtan uca gecikme (ms): ortalama {latency['mean']:.3f}, p50 {latency['p50']:.3f}, "
+          f"p95 {latency['p95']:.3f}, p99 {latency['p99']:.3f}, max {latency['max']:.3f}")
+
+
+async def _run_server(feed, args):
+    server = await serve(feed, args.host, args.port, args.unix)
+    print(f"Dinleniyor: {args.unix or f'{args.host}:{args.port}'}", file=sys.stderr)
+    async with server:
+        while True:
+            await asyncio.sleep(args.report)
+            if feed.totals["batches"]:
+                print_report(feed)
+
+
+async def _run_demo(feed, args):
+    """Geçici UNIX soketinde sunucu + yeniden oynatıcı; alınan alarmları toplu hesapla karşılaştırır"""
+    from scenario import generate_pairs, format_binary, format_text
+    seg1, seg2 = generate_pairs(args.count, np.random.default_rng(args.seed))
+    payload = format_binary(seg1, seg2) if args.format == "binary" else format_text(seg1, seg2).encode()
+    decoder = PairDecoder(args.format)
+    parts = [decoder.feed(payload), decoder.close()]
+    expected = np.flatnonzero(evaluate_alerts(np.concatenate([p[0] for p in parts]),
+                                              np.concatenate([p[1] for p in parts]),
+                                              args.distance_threshold, args.angle_threshold,
+                                              details=False, distance_mode=args.distance_mode)["alert"])
+    with tempfile.TemporaryDirectory() as tmp:
+        unix = os.path.join(tmp, "feed.sock")
+        server = await serve(feed, unix=unix)
+        async with server:
+            t = time.perf_counter()
+            steps, done = await replay(payload, unix=unix, rate=args.rate)
+            elapsed = time.perf_counter() - t
+    print(done)
+    print(f"{args.count} çift {elapsed:.2f} s'de ({args.count / elapsed:,.0f} çift/s)")
+    match = np.array_equal(steps, expected)
+    print(f"Alarmlar toplu hesapla {'aynı' if match else 'FARKLI'} ({len(steps)} / {len(expected)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soket üzerinden canlı forklift alarm ön ucu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--unix", default=None, help="TCP yerine UNIX soket yolu")
+    parser.add_argument("--format", choices=["text", "binary"], default="text")
+    parser.add_argument("--distance-threshold", type=float, default=DISTANCE_THRESHOLD)
+    parser.add_argument("--angle-threshold", type=float, default=ANGLE_THRESHOLD)
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default=DISTANCE_MODE)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="parti başına en fazla çift")
+    parser.add_argument("--max-latency", type=float, default=MAX_LATENCY * 1e3,
+                        help="partinin ilk çiftinin en fazla bekleme süresi (ms)")
+    parser.add_argument("--queue-chunks", type=int, default=QUEUE_CHUNKS,
+                        help="bağlantı başına kuyruk sınırı (okuma parçası); dolunca okuma durur")
+    parser.add_argument("--report", type=float, default=10.0, help="sunucu rapor aralığı (s)")
+    parser.add_argument("--replay", default=None, help='sunucuya gönderilecek dosya ("-" = stdin)')
+    parser.add_argument("--rate", type=float, default=None, help="yeniden oynatma hızı (bayt/s)")
+    parser.add_argument("--demo", action="store_true", help="yerel sunucuya rastgele senaryo oynat")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        if args.replay == "-":
+            source = sys.stdin.buffer
+            steps, done = asyncio.run(replay(source, args.host, args.port, args.unix, rate=args.rate))
+        else:
+            with open(args.replay, "rb") as source:
+                steps, done = asyncio.run(replay(source, args.host, args.port, args.unix,
+                                                 rate=args.rate))
+        print(f"{len(steps)} alarm alındı; {done}")
+        return
+
+    feed = LiveFeed(args.format, args.distance_threshold, args.angle_threshold, args.max_batch,
+                    args.max_latency / 1e3, args.queue_chunks, args.distance_mode)
+    if args.demo:
+        asyncio.run(_run_demo(feed, args))
+        print_report(feed)
+        return
+    try:
+        asyncio.run(_run_server(feed, args))
+    except KeyboardInterrupt:
+        print_report(feed)
+
+
+if __name__ == "__main__":
+    main()
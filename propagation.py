@@ -0,0 +1,97 @@
+"""Mesafe gürültüsünün açılara birinci mertebe (doğrusal) yayılımı.
+
+Gürültülü bir uç, ölçüm ışını boyunca ε kadar kayar; açı değişimi
+δθ ≈ Σ g_k ε_k olur (g_k: açının o uca göre gradyanının ışın yönündeki
+bileşeni). ε_k ~ N(bias, std(d)²) bağımsız olduğundan δθ normaldir ve
+açısal hata |δθ| katlanmış normal dağılımdır; beklenen değer ve varyansı
+kapalı formdadır. Küçük hatalar için Monte Carlo ile örtüşür; uçlar
+köşeye çok yaklaştığında (θ'nın doğrusal olmadığı yerde) sapar.
+"""
+import math
+
+import numpy as np
+
+from geometry import distance
+
+# Abramowitz-Stegun 7.1.26 katsayıları; mutlak hata < 1.5e-7
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def _erf(x):
+    """math.erf'in vektörel yaklaşığı (scipy gerektirmez)"""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1 / (1 + _ERF_P * z)
+    poly = 0.0
+    for a in reversed(_ERF_A):
+        poly = (poly + a) * t
+    return np.copysign(1 - poly * np.exp(-z * z), x)
+
+
+def angle_gradients(p1, p2, p3):
+    """calculate_angle(p1, p2, p3)'ün her noktaya göre gradyanı: üç (..., 2) dizi (rad/m)"""
+    p1, p2, p3 = (np.asarray(p, dtype=float) for p in (p1, p2, p3))
+    v1 = p1 - p2
+    v2 = p3 - p2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # θ = atan2(v2) - atan2(v1); ∇_v atan2(v) = (-v_y, v_x) / |v|²
+        g1 = np.stack([v1[..., 1], -v1[..., 0]], axis=-1) / (v1 ** 2).sum(axis=-1, keepdims=True)
+        g3 = np.stack([-v2[..., 1], v2[..., 0]], axis=-1) / (v2 ** 2).sum(axis=-1, keepdims=True)
+    # Köşe bir uçla çakışıyorsa açı tanımsız; katkı sıfır sayılır
+    g1 = np.nan_to_num(g1, nan=0.0, posinf=0.0, neginf=0.0)
+    g3 = np.nan_to_num(g3, nan=0.0, posinf=0.0, neginf=0.0)
+    return g1, -(g1 + g3), g3
+
+
+def ray_gain(gradient, origin, point):
+    """Nokta origin'den gelen ışın boyunca kaydığında açı türevi (gradyanın ışın yönündeki bileşeni)"""
+    ray = np.asarray(point, dtype=float) - np.asarray(origin, dtype=float)
+    norm = np.hypot(ray[..., 0], ray[..., 1])
+    safe = np.where(norm == 0, 1.0, norm)
+    return (gradient * ray).sum(axis=-1) / safe
+
+
+def folded_normal_moments(mu, sigma):
+    """X ~ N(mu, sigma²) için |X|'in (ortalama, varyans) çifti"""
+    mu = np.asarray(mu, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    mean = sigma * math.sqrt(2 / math.pi)
+    if np.any(mu != 0):
+        safe = np.where(sigma == 0, 1.0, sigma)
+        mean = np.where(sigma == 0, np.abs(mu),
+                        mean * np.exp(-mu ** 2 / (2 * safe ** 2)) + mu * _erf(mu / (safe * math.sqrt(2))))
+    return mean, np.maximum(mu ** 2 + sigma ** 2 - mean ** 2, 0.0)
+
+
+def linear_error_moments(gains, noise, true_dist):
+    """δθ = Σ gains[..., k]·ε_k için |δθ|'nin (ortalama, std) çifti, radyan.
+
+    gains ve true_dist son ekseni ölçümlere karşılık gelir; ε_k'ler
+    noise.bias ortalamalı ve noise.std(true_dist) sapmalı bağımsız normaldir.
+    """
+    gains = np.asarray(gains, dtype=float)
+    mu = (gains * noise.bias).sum(axis=-1)
+    sigma = np.sqrt((gains ** 2 * noise.std(true_dist) ** 2).sum(axis=-1))
+    mean, var = folded_normal_moments(mu, sigma)
+    return mean, np.sqrt(var)
+
+
+def acb_error_moments(A, B, C, noise):
+    """forkplot4/5'teki ACB hatası: C, A'dan ölçülen AC mesafesi boyunca bozulur.
+
+    calculate_angle(A, C', B) ile gerçek açı arasındaki hatanın beklenen
+    değeri ve standart sapması (radyan).
+    """
+    _, g_C, _ = angle_gradients(A, C, B)
+    gain = ray_gain(g_C, A, C)
+    return linear_error_moments(gain[..., None], noise, distance(C, A)[..., None])
+
+
+def mixture_moments(index, mean, std, bins):
+    """Kutu başına karışım: her kutudaki noktaların |δθ| dağılımlarının birleşik (sayı, ortalama, std)"""
+    count = np.bincount(index, minlength=bins)
+    safe = np.maximum(count, 1)
+    first = np.bincount(index, weights=mean, minlength=bins) / safe
+    second = np.bincount(index, weights=std ** 2 + mean ** 2, minlength=bins) / safe
+    return count, first, np.sqrt(np.maximum(second - first ** 2, 0.0))
@@ -0,0 +1,386 @@
+import math
+import os
+import time
+import warnings
+
+import numpy as np
+
+import instrument
+
+VIDEO_EXTENSIONS = (".mp4", ".gif", ".avi", ".mov")
+MAX_FPS = 60
+GLYPH_PHASES = 16  # glif maskeleri piksel altı konumu bu kadar adımla saklanır
+SEGMENT_STYLES = (("Forklift 1 (A-B)", "blue"), ("Forklift 2 (C-D)", "green"))
+
+
+def select_frames(alert, mode="alerts", every=1):
+    """Çizilecek adım indekslerini seçer: 'alerts', 'every' veya 'all'"""
+    alert = np.asarray(alert, dtype=bool)
+    if mode == "alerts":
+        return np.flatnonzero(alert)
+    if mode == "every":
+        return np.arange(0, len(alert), max(int(every), 1))
+    if mode == "all":
+        return np.arange(len(alert))
+    raise ValueError(f"Bilinmeyen kare seçimi: {mode}")
+
+
+def draw_background(ax, alert=False, limit=15):
+    ax.set_xlim(-limit, limit)
+    ax.set_ylim(-limit, limit)
+    ax.axhline(0, color="black")
+    ax.axvline(0, color="black")
+    ax.set_facecolor('lightcoral' if alert else 'white')
+    for val in [limit, -limit]:
+        ax.axhline(val, linestyle="dashed", color="red")
+        ax.axvline(val, linestyle="dashed", color="red")
+
+
+def draw_frame(ax, seg1, seg2, alert=False, info=None, title=None, limit=15):
+    """forkplot1.py'deki tek animasyon karesini verilen eksene çizer"""
+    ax.cla()
+    draw_background(ax, alert=alert, limit=limit)
+    (A, B), (C, D) = seg1, seg2
+    ax.plot([A[0], B[0]], [A[1], B[1]], marker='o', color='blue', label='Forklift 1 (A-B)')
+    ax.plot([C[0], D[0]], [C[1], D[1]], marker='o', color='green', label='Forklift 2 (C-D)')
+    for name, p in zip("ABCD", (A, B, C, D)):
+        ax.text(p[0], p[1], name, fontsize=12, ha='right', va='bottom', color='red')
+    if info:
+        ax.text(-limit + 1, limit - 1, info, fontsize=10, va='top',
+                bbox=dict(facecolor='white', alpha=0.7))
+    if title:
+        ax.set_title(title)
+    ax.legend(loc='upper right')
+
+
+class _GlyphRenderer:
+    """Agg çizicisinin, düz metni karakter maskesi önbelleğinden basan vekili.
+
+    Text.draw yerleşimi ve kutuyu yine kendisi hesaplar; yalnızca
+    get_text_width_height_descent ve draw_text karşılanır. Her karakterin
+    ilerlemesi, iki karakter arası aralama ve piksel altı konumdaki maskesi
+    asıl çiziciden bir kez alınır, satır maskeleri bunlardan dizilir.
+    Matematik ve döndürülmüş metin asıl çiziciye bırakılır; diğer her şey
+    asıl çiziciye iletilir.
+    """
+
+    def __init__(self, base, cache):
+        self.base = base
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.base, name)
+
+    def _char(self, c, prop, key):
+        """(ilerleme, üst, alt) piksel; boşluk da taban çizgisinde sıfır kutu sayılır"""
+        k = ("char", c) + key
+        metrics = self._cache.get(k)
+        if metrics is None:
+            w, h, d = self.base.get_text_width_height_descent(c, prop, False)
+            metrics = self._cache[k] = (w, h - d, d)
+        return metrics
+
+    def _kern(self, a, b, prop, key):
+        k = ("kern", a, b) + key
+        kern = self._cache.get(k)
+        if kern is None:
+            kern = self._cache[k] = (self.base.get_text_width_height_descent(a + b, prop, False)[0]
+                                     - self._char(a, prop, key)[0] - self._char(b, prop, key)[0])
+        return kern
+
+    def _glyph(self, c, prop, key, px, py):
+        """Karakterin (maske, satır, sütun) kaydı; satır/sütun taban noktasına göre, boşsa None"""
+        k = ("glyph", c, px, py) + key
+        if k in self._cache:
+            return self._cache[k]
+        from matplotlib.backends.backend_agg import RendererAgg
+        size = 4 * math.ceil(self.base.points_to_pixels(prop.get_size_in_points())) + 8
+        origin = size // 4
+        scratch = RendererAgg(size, size, self.base.dpi)
+        gc = scratch.new_gc()
+        scratch.draw_text(gc, origin + px / GLYPH_PHASES, size - origin + py / GLYPH_PHASES, c, prop, 0)
+        gc.restore()
+        alpha = np.asarray(scratch.buffer_rgba())[..., 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        cols = np.flatnonzero(alpha.any(axis=0))
+        glyph = None
+        if len(rows):
+            glyph = (alpha[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1].copy(),
+                     rows[0] - (size - origin), cols[0] - origin)
+        self._cache[k] = glyph
+        return glyph
+
+    def get_text_width_height_descent(self, s, prop, ismath):
+        if ismath:
+            return self.base.get_text_width_height_descent(s, prop, ismath)
+        key = (hash(prop), self.base.dpi)
+        width = 0.0
+        ascent = descent = -math.inf
+        prev = None
+        for c in s:
+            w, a, d = self._char(c, prop, key)
+            width += w if prev is None else w + self._kern(prev, c, prop, key)
+            ascent = max(ascent, a)
+            descent = max(descent, d)
+            prev = c
+        if prev is None:
+            return 0.0, 0.0, 0.0
+        return width, ascent + descent, descent
+
+    def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
+        if ismath or angle:
+            return self.base.draw_text(gc, x, y, s, prop, angle, ismath=ismath, mtext=mtext)
+        key = (hash(prop), self.base.dpi)
+        # y aşağı doğrudur ve taban çizgisidir
+        iy, py = divmod(round(y * GLYPH_PHASES), GLYPH_PHASES)
+        placed = []
+        pen = x
+        prev = None
+        for c in s:
+            if prev is not None:
+                pen += self._kern(prev, c, prop, key)
+            ix, px = divmod(round(pen * GLYPH_PHASES), GLYPH_PHASES)
+            glyph = self._glyph(c, prop, key, px, py)
+            if glyph is not None:
+                placed.append((glyph[0], iy + glyph[1], ix + glyph[2]))
+            pen += self._char(c, prop, key)[0]
+            prev = c
+        if not placed:
+            return
+        top = min(row for _, row, _ in placed)
+        left = min(col for _, _, col in placed)
+        bottom = max(row + mask.shape[0] for mask, row, _ in placed)
+        right = max(col + mask.shape[1] for mask, _, col in placed)
+        coverage = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for mask, row, col in placed:
+            region = coverage[row - top:row - top + mask.shape[0], col - left:col - left + mask.shape[1]]
+            np.maximum(region, mask, out=region)
+        rgba = gc.get_rgb()
+        alpha = gc.get_alpha() if len(rgba) == 3 or gc.get_forced_alpha() else rgba[3]
+        image = np.empty(coverage.shape + (4,), dtype=np.uint8)
+        image[..., :3] = np.round(np.asarray(rgba[:3]) * 255)
+        image[..., 3] = coverage if alpha == 1 else np.round(coverage * alpha)
+        # draw_image alttan yukarı satırlar ve sol alt köşe bekler
+        self.base.draw_image(gc, left, self.base.height - bottom, image[::-1])
+
+
+class LiveRenderer:
+    """Sanatçıları bir kez kuran, karelerde yalnızca verileri güncelleyen canlı çizici.
+
+    Eksenler, sıfır ve sınır çizgileri ile lejant arka plana bir kez çizilir;
+    normal ve alarm (lightcoral) zeminli iki arka plan görüntüsü saklanır.
+    update() segment/ek çizgi verilerini, nokta etiketlerini, bilgi kutusunu
+    ve başlığı değiştirip yalnızca bunları arka planın üzerine çizer
+    (blitting). Önceki karenin çizimi bittikten sonra 1/max_fps (çizim
+    daha uzun sürdüyse çizim süresi) geçmediyse kare atlanır; flush()
+    bekleyen son kareyi çizer. Pencere boyutu değişirse arka
+    planlar yeniden alınır.
+
+    Karenin asıl maliyeti metindir: bilgi kutusu, başlık ve etiketler her
+    karede değişebildiğinden yeniden dizilir, ancak Agg tuvallerinde her
+    karakter (piksel altı konumuyla) bir kez rasterleştirilip saklanır
+    (_GlyphRenderer).
+    """
+
+    def __init__(self, ax=None, limit=15, boundary=None, segments=SEGMENT_STYLES,
+                 point_names=None, point_style=None, extra=(), info_pos=None, info_fontsize=10,
+                 legend_loc=None, max_fps=MAX_FPS, show=True):
+        import matplotlib.pyplot as plt
+        if ax is None:
+            ax = plt.gca()
+        self.ax = ax
+        self.fig = ax.figure
+        self.canvas = self.fig.canvas
+        self.frame_interval = 1.0 / max_fps if max_fps else 0.0
+        self.drawn = 0
+        self.dropped = 0
+        self._next_frame = 0.0
+        self._pending = None
+        self._backgrounds = {}
+        self._glyphs = {}
+        self._text_renderer = None
+
+        boundary = limit if boundary is None else boundary
+        ax.set_xlim(-limit, limit)
+        ax.set_ylim(-limit, limit)
+        ax.axhline(0, color="black")
+        ax.axvline(0, color="black")
+        for val in [boundary, -boundary]:
+            ax.axhline(val, linestyle="dashed", color="red")
+            ax.axvline(val, linestyle="dashed", color="red")
+
+        self.segment_lines = [ax.plot([], [], marker='o', color=color, label=label, animated=True)[0]
+                              for label, color in segments]
+        self.extra_lines = [ax.plot([], [], style, label=label, animated=True)[0]
+                            for style, label in extra]
+        self.point_texts = [ax.text(0, 0, name, fontsize=12, color='red', animated=True,
+                                    **(point_style or {}))
+                            for name in (point_names or "")]
+        self.info_text = None
+        if info_pos is not None:
+            self.info_text = ax.text(*info_pos, "", fontsize=info_fontsize, animated=True,
+                                     bbox=dict(facecolor='white', alpha=0.7))
+        ax.title.set_animated(True)
+        ax.legend(loc=legend_loc)
+        self.canvas.mpl_connect("resize_event", lambda event: self._reset())
+        if show:
+            with warnings.catch_warnings():
+                # Etkileşimsiz (Agg) arka uçta gösterme uyarısı gereksiz
+                warnings.simplefilter("ignore", UserWarning)
+                plt.show(block=False)
+
+    def _reset(self):
+        self._backgrounds.clear()
+
+    def _background(self, alert):
+        if alert not in self._backgrounds:
+            self.ax.set_facecolor('lightcoral' if alert else 'white')
+            # Animasyonlu sanatçılar tam çizimde atlanır; yalnızca sabit sahne kalır
+            self.canvas.draw()
+            self._backgrounds[alert] = self.canvas.copy_from_bbox(self.fig.bbox)
+        return self._backgrounds[alert]
+
+    def _renderer(self):
+        from matplotlib.backends.backend_agg import RendererAgg
+        base = self.canvas.get_renderer()
+        if not isinstance(base, RendererAgg):
+            return base
+        # Tuval boyutu değişince çizici yenilenir; glif önbelleği korunur
+        if self._text_renderer is None or self._text_renderer.base is not base:
+            self._text_renderer = _GlyphRenderer(base, self._glyphs)
+        return self._text_renderer
+
+    def update(self, segments, extra=(), alert=False, info=None, title=None, force=False):
+        """Bir kareyi çizer; çok erken gelen kare atlanıp False döner.
+
+        segments her satırı ((x1, y1), (x2, y2)) ya da None (gizli) olan
+        segment listesi, extra ek çizgilerin aynı biçimdeki uç noktalarıdır.
+        """
+        now = time.perf_counter()
+        if not force and now < self._next_frame:
+            self.dropped += 1
+            self._pending = (segments, extra, alert, info, title)
+            return False
+        self._pending = None
+        self._draw(segments, extra, alert, info, title)
+        if self.frame_interval:
+            # Bekleme çizim bittikten sonra başlar; çizim aralıktan uzun sürerse
+            # en az kendi süresi kadar veri atlanır, çizici veriye yetişir
+            done = time.perf_counter()
+            self._next_frame = done + max(self.frame_interval, done - now)
+        return True
+
+    def flush(self):
+        """Atlanmış son kare varsa onu çizer"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._draw(*pending)
+
+    def _draw(self, segments, extra, alert, info, title):
+        for k, (line, segment) in enumerate(zip(self.segment_lines, segments)):
+            labels = self.point_texts[2 * k:2 * k + 2]
+            line.set_visible(segment is not None)
+            for text in labels:
+                text.set_visible(segment is not None)
+            if segment is None:
+                continue
+            (x1, y1), (x2, y2) = segment
+            line.set_data([x1, x2], [y1, y2])
+            for text, point in zip(labels, segment):
+                text.set_position(point)
+        for line, points in zip(self.extra_lines, extra):
+            (x1, y1), (x2, y2) = points
+            line.set_data([x1, x2], [y1, y2])
+        self.ax.set_title(title or "")
+        artists = self.segment_lines + self.extra_lines
+        if self.info_text is not None:
+            # Metin her karede yeniden çizilir; altındaki çizgiler yarı saydam kutudan görünür
+            self.info_text.set_text(info or "")
+            self.info_text.set_visible(bool(info))
+            artists.append(self.info_text)
+        artists += self.point_texts + [self.ax.title]
+
+        self.canvas.restore_region(self._background(bool(alert)))
+        renderer = self._renderer()
+        for artist in artists:
+            artist.draw(renderer)
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+        self.drawn += 1
+
+
+def draw_error_bands(ax, binned, label="Ölçüm"):
+    """BinnedStats'ı nokta bulutu yerine kutu başına bantlar olarak çizer"""
+    table = binned.table()
+    x = table["center"]
+    ax.fill_between(x, 0, table["p99"], color="tab:blue", alpha=0.12, label="p99")
+    ax.fill_between(x, 0, table["p95"], color="tab:blue", alpha=0.22, label="p95")
+    ax.fill_between(x, np.maximum(table["mean"] - table["std"], 0), table["mean"] + table["std"],
+                    color="tab:orange", alpha=0.35, label="ortalama ± std")
+    ax.plot(x, table["mean"], color="tab:orange", label=f"{label} ortalama")
+    ax.plot(x, table["p50"], color="tab:blue", linestyle="--", label="medyan")
+    ax.plot(x, table["max"], color="tab:red", linestyle=":", marker=".", label="maksimum")
+
+
+def draw_moment_curve(ax, x, mean, std, label="Analitik beklenen"):
+    """Kapalı form beklenen hata eğrisini (ve +1 std'yi) bantların üzerine çizer"""
+    ax.plot(x, mean, color="black", linestyle="-.", label=label)
+    ax.plot(x, mean + std, color="black", linestyle=":", linewidth=0.8, label=f"{label} + std")
+
+
+def draw_sparse_errors(ax, result, label="Uyarlamalı tarama"):
+    """adaptive_sweep'in seyrek sonucunu forkplot5'teki gibi mesafe-hata saçılımı olarak çizer"""
+    ax.scatter(result["distance"], result["error_deg"], s=4, alpha=0.35, color="tab:blue",
+               label=f"{label} ({result['evaluations']} nokta)")
+
+
+def frame_info(results, k, alerts_so_far):
+    info = (
+        f"Step: {k + 1}, Alerts: {alerts_so_far}\n\n"
+        f"m = {results['m'][k]:.2f}, n = {results['n'][k]:.2f}\n"
+    )
+    for name, d in zip(("AC", "AD", "BC", "BD"), results["dist"][k]):
+        info += f"dist({name}) = {d:.2f}\n"
+    return info
+
+
+@instrument.timed("render")
+def render_frames(seg1, seg2, results, frames, out, fps=10, limit=15):
+    """Seçilen kareleri etkileşimsiz olarak video dosyasına ya da PNG dizisine yazar.
+
+    out '.mp4', '.gif' gibi bir uzantıyla bitiyorsa video, aksi halde
+    'frame_00042.png' dosyalarının yazılacağı dizin olarak kullanılır.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    cumulative = np.cumsum(results["alert"])
+    fig, ax = plt.subplots(figsize=(8, 8))
+
+    def draw(k):
+        draw_frame(ax, seg1[k], seg2[k], alert=bool(results["alert"][k]),
+                   info=frame_info(results, k, int(cumulative[k])),
+                   title=f"Adım {k + 1}", limit=limit)
+
+    written = 0
+    if out.lower().endswith(VIDEO_EXTENSIONS):
+        if out.lower().endswith(".gif"):
+            writer = animation.PillowWriter(fps=fps)
+        else:
+            writer = animation.FFMpegWriter(fps=fps)
+        with writer.saving(fig, out, dpi=100):
+            for k in frames:
+                draw(k)
+                writer.grab_frame()
+                written += 1
+    else:
+        os.makedirs(out, exist_ok=True)
+        for k in frames:
+            draw(k)
+            fig.savefig(os.path.join(out, f"frame_{k + 1:05d}.png"), dpi=100)
+            written += 1
+
+    plt.close(fig)
+    return written
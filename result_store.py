@@ -0,0 +1,273 @@
+"""Adım başına sonuçlar için sütunlu, parça parça eklenebilir disk deposu.
+
+Depo bir dizindir: her sütun `<ad>.bin` dosyasında ham küçük-endian dizi
+olarak, şema ve satır sayısı `meta.json` içinde tutulur. Parçalar sütun
+dosyalarının sonuna eklenir ve meta her parçadan sonra atomik olarak
+güncellenir; uzun bir çalışma yarıda kesilse de yazılmış parçalar
+okunabilir. Okuma np.memmap ile yapılır: yalnızca istenen ve süzgeçte
+kullanılan sütunlar, parça parça diskten okunur.
+
+    python headless.py big_log.txt --noise 0.5 --chunk-pairs 100000 --store results/
+    python result_store.py results/ --columns step m n --where "alert == 1" "dist_AC < 2"
+
+pyarrow kuruluysa export_parquet() ile Parquet'e de aktarılabilir.
+"""
+import argparse
+import json
+import operator
+import os
+
+import numpy as np
+
+import instrument
+from streaming import ERROR_NAMES
+
+META_FILE = "meta.json"
+COLUMN_SUFFIX = ".bin"
+QUERY_CHUNK_ROWS = 1 << 20
+
+# evaluate_alerts(details=True) ve angular_errors çıktılarından adım sütunları
+STEP_COLUMNS = {
+    "step": "<i8",
+    "alert": "|u1",
+    "angle_alert": "|u1",
+    "distance_alert": "|u1",
+    "ta": "<f8",
+    "tb": "<f8",
+    "tc": "<f8",
+    "td": "<f8",
+    "m": "<f8",
+    "n": "<f8",
+    "dist_AC": "<f8",
+    "dist_AD": "<f8",
+    "dist_BC": "<f8",
+    "dist_BD": "<f8",
+    "segment_dist": "<f8",
+}
+STEP_COLUMNS.update({f"err_{name}": "<f8" for name in ERROR_NAMES})
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def step_columns(results, first_step=0):
+    """evaluate_alerts/angular_errors sonuç sözlüğünü STEP_COLUMNS sütunlarına çevirir"""
+    count = len(results["alert"])
+    columns = {"step": np.arange(first_step, first_step + count)}
+    for name in STEP_COLUMNS:
+        if name in results:
+            columns[name] = results[name]
+    if "dist" in results:
+        for k, name in enumerate(("AC", "AD", "BC", "BD")):
+            columns[f"dist_{name}"] = results["dist"][:, k]
+    return columns
+
+
+class ResultWriter:
+    """Sütunları parça parça depo dizinine ekler.
+
+    Şema ilk append() ile sabitlenir (schema verilmediyse STEP_COLUMNS'tan
+    ya da ilk parçanın tiplerinden); sonraki parçalar aynı sütunları
+    taşımalıdır. Mevcut bir depoya mode="a" ile devam edilebilir (depo
+    yoksa yenisi açılır).
+    """
+
+    def __init__(self, path, schema=None, mode="w"):
+        self.path = path
+        self.schema = dict(schema) if schema else None
+        self.rows = 0
+        self._files = {}
+        if mode not in ("w", "a"):
+            raise ValueError(f"Bilinmeyen kip: {mode}")
+        os.makedirs(path, exist_ok=True)
+        if mode == "a" and os.path.exists(os.path.join(path, META_FILE)):
+            store = ResultStore(path)
+            self.schema = store.schema
+            self.rows = store.rows
+            # Yarım kalmış bir parça varsa sütunları son tutarlı satıra kırp
+            for name, dtype in self.schema.items():
+                with open(self._column_path(name), "r+b") as file:
+                    file.truncate(self.rows * np.dtype(dtype).itemsize)
+            self._open("ab")
+        else:
+            # Yalnızca önceki deponun kendi dosyaları silinir
+            if os.path.exists(os.path.join(path, META_FILE)):
+                for name in ResultStore(path).schema:
+                    if os.path.exists(self._column_path(name)):
+                        os.remove(self._column_path(name))
+                os.remove(os.path.join(path, META_FILE))
+            if self.schema is not None:
+                self._open("wb")
+
+    def _column_path(self, name):
+        return os.path.join(self.path, name + COLUMN_SUFFIX)
+
+    def _open(self, mode):
+        self._files = {name: open(self._column_path(name), mode) for name in self.schema}
+
+    def _write_meta(self):
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as file:
+            json.dump({"rows": self.rows, "columns": self.schema}, file, indent=1)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def append(self, columns):
+        """Aynı uzunluktaki sütun dizilerinden oluşan bir parçayı ekler"""
+        if self.schema is None:
+            self.schema = {name: STEP_COLUMNS.get(name, np.asarray(values).dtype.newbyteorder("<").str)
+                           for name, values in columns.items()}
+            self._open("wb")
+        missing = set(self.schema) ^ set(columns)
+        if missing:
+            raise ValueError(f"Şemayla uyuşmayan sütunlar: {sorted(missing)}")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("Parçadaki sütun uzunlukları farklı")
+        for name, dtype in self.schema.items():
+            np.ascontiguousarray(columns[name], dtype=dtype).tofile(self._files[name])
+            self._files[name].flush()
+        self.rows += lengths.pop()
+        self._write_meta()
+        return self
+
+    @instrument.timed("store")
+    def append_results(self, results, first_step=None):
+        """evaluate_alerts(details=True) (+ angular_errors) sonuçlarını ekler; adımlar kaldığı yerden sürer"""
+        return self.append(step_columns(results, self.rows if first_step is None else first_step))
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        self._files = {}
+        if self.schema is not None:
+            self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultStore:
+    """Yazılmış bir depoyu bellek eşlemeli olarak okur"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as file:
+            meta = json.load(file)
+        self.rows = int(meta["rows"])
+        self.schema = meta["columns"]
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def column(self, name):
+        """Sütunun tamamı, np.memmap olarak (diskten tembel okunur)"""
+        if name not in self.schema:
+            raise KeyError(f"Bilinmeyen sütun: {name}")
+        if self.rows == 0:
+            return np.empty(0, dtype=self.schema[name])
+        return np.memmap(os.path.join(self.path, name + COLUMN_SUFFIX), dtype=self.schema[name],
+                         mode="r", shape=(self.rows,))
+
+    def iter_chunks(self, columns=None, where=(), chunk_rows=QUERY_CHUNK_ROWS):
+        """Süzgeçten geçen satırları parça parça (sütun -> dizi) sözlükleri olarak üretir.
+
+        where, (sütun, işleç, değer) üçlülerinin listesidir ve hepsi
+        sağlanmalıdır (VE). Yalnızca columns ile where'deki sütunlar okunur.
+        """
+        columns = self.columns if columns is None else list(columns)
+        where = [(name, OPERATORS[op], value) for name, op, value in where]
+        needed = {name: self.column(name) for name in set(columns) | {name for name, _, _ in where}}
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            mask = None
+            for name, op, value in where:
+                hit = op(needed[name][start:stop], value)
+                mask = hit if mask is None else mask & hit
+            if mask is None:
+                yield {name: np.array(needed[name][start:stop]) for name in columns}
+            elif mask.any():
+                yield {name: needed[name][start:stop][mask] for name in columns}
+
+    def query(self, columns=None, where=(), chunk_rows=QUERY_CHUNK_ROWS):
+        """iter_chunks sonuçlarını tek bir sütun sözlüğünde birleştirir"""
+        columns = self.columns if columns is None else list(columns)
+        parts = list(self.iter_chunks(columns, where, chunk_rows))
+        return {name: (np.concatenate([part[name] for part in parts]) if parts
+                       else np.empty(0, dtype=self.schema[name]))
+                for name in columns}
+
+    def count(self, where=(), chunk_rows=QUERY_CHUNK_ROWS):
+        """Süzgeçten geçen satır sayısı; yalnızca süzgeç sütunları okunur"""
+        name = where[0][0] if where else self.columns[0]
+        return sum(len(part[name]) for part in self.iter_chunks([name], where, chunk_rows))
+
+    def export_parquet(self, out, columns=None, where=(), chunk_rows=QUERY_CHUNK_ROWS):
+        """pyarrow kuruluysa seçilen satır/sütunları parça parça Parquet dosyasına yazar"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for part in self.iter_chunks(columns, where, chunk_rows):
+                table = pa.table(part)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def parse_where(text):
+    """'dist_AC < 2' biçimindeki bir süzgeci (sütun, işleç, değer) üçlüsüne çevirir"""
+    for op in sorted(OPERATORS, key=len, reverse=True):
+        name, sep, value = text.partition(op)
+        if sep:
+            return name.strip(), op, float(value)
+    raise ValueError(f"Süzgeç anlaşılamadı: {text}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sonuç deposunda süzgeçli sorgu")
+    parser.add_argument("path", help="depo dizini")
+    parser.add_argument("--columns", nargs="+", default=None, help="yansıtılacak sütunlar")
+    parser.add_argument("--where", nargs="+", default=[], help='ör. "alert == 1" "m > 0.5"')
+    parser.add_argument("--limit", type=int, default=20, help="yazdırılacak en fazla satır")
+    parser.add_argument("--parquet", default=None, help="sonucu Parquet dosyasına aktar (pyarrow gerekir)")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.path)
+    where = [parse_where(text) for text in args.where]
+    if args.parquet:
+        store.export_parquet(args.parquet, args.columns, where)
+        print(f"Parquet '{args.parquet}' dosyasina yazildi.")
+        return
+
+    columns = args.columns or store.columns
+    print(f"{len(store)} satır, sütunlar: {', '.join(store.columns)}")
+    print("  ".join(f"{name:>12}" for name in columns))
+    shown = 0
+    matched = 0
+    for part in store.iter_chunks(columns, where):
+        rows = len(part[columns[0]])
+        matched += rows
+        for k in range(min(rows, args.limit - shown)):
+            print("  ".join(f"{part[name][k]:>12.4g}" for name in columns))
+        shown = min(args.limit, shown + rows)
+    print(f"{matched} satır eşleşti")
+
+
+if __name__ == "__main__":
+    main()
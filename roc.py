@@ -0,0 +1,196 @@
+"""Alarm ölçütünün gerçek geometrik yakınlığa karşı ROC / kesinlik-duyarlılık değerlendirmesi.
+
+Gerçek etiket, AB ve CD segmentleri arasındaki kesin en kısa mesafedir
+(geometry.segment_distance): collision_distance'ın altındaki çiftler
+çarpışma (pozitif) sayılır. Alarm ölçütü (m/n açı testi ya da uç nokta
+mesafe testi) hem temiz geometri hem de gürültülü ölçümler üzerinde
+hesaplanır. Gürültülü ölçümde C ve D, A'dan ve B'den gürültülü mesafelerle
+konumlanan iki tahminin (forkplot4.py'deki C_a, C_b, D_a, D_b) ortalamasıdır;
+her sigma aynı normal çekimi ölçekler (noise.SigmaGrid).
+
+Açı x mesafe eşiği ızgarasındaki tüm kombinasyonlar pozitif ve negatif
+çiftler için ayrı tuning.ThresholdCounts'larda tek geçişte sayılır; ROC
+(FPR, TPR) ve PR (duyarlılık, kesinlik) eğrileri bu sayılardan çıkar.
+Duyarlılığı min_recall'ın altına düşmeyen en düşük yanlış alarm oranlı
+eşikler ayrıca raporlanır.
+
+    python roc.py --count 1e6 --noise 0.25,0.5 --angle-thresholds 0:1:201
+    python roc.py segments_for_geogebra.txt --collision-distance 0.5 --plot roc.png --out roc.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from alert_engine import DISTANCE_THRESHOLD, DISTANCE_MODE, DISTANCE_MODES, alert_scores
+from geometry import distance, noisy_point, segment_distance
+from noise import SigmaGrid
+from tuning import (CHUNK_PAIRS, FORKLIFT_LENGTH, MAX_DISTANCE, ThresholdCounts, jsonable,
+                    iter_source, noise_rng, parse_values)
+
+COLLISION_DISTANCE = 1.0  # m; segmentler arası gerçek mesafe bunun altındaysa çarpışma
+MIN_RECALL = 0.99
+ANGLE_THRESHOLDS = "0:1:201"
+
+
+def measured_segments(seg1, seg2, noise, rng):
+    """C ve D'nin A ve B'den gürültülü mesafe ölçümleriyle tahmini; (K, N, 2, 2)"""
+    A, B = seg1[:, 0], seg1[:, 1]
+    C, D = seg2[:, 0], seg2[:, 1]
+    starts = np.stack([A, B, A, B], axis=1)
+    ends = np.stack([C, C, D, D], axis=1)
+    ranges = noise.sample(distance(starts, ends), rng, len(noise.sigmas))
+    noisy = noisy_point(starts, ends, ranges)
+    # (K, N, 4, 2) -> C = (C_a + C_b) / 2, D = (D_a + D_b) / 2
+    return noisy.reshape(noisy.shape[:2] + (2, 2, 2)).mean(axis=3)
+
+
+def run_roc(config):
+    """Temiz ve her sigma için gürültülü ölçümde pozitif/negatif eşik sayıları"""
+    angle_thresholds = parse_values(config["angle_thresholds"])
+    distance_thresholds = parse_values(config["distance_thresholds"])
+    sigmas = parse_values(config["noise"]) if config.get("noise") is not None else np.empty(0)
+    labels = ["temiz"] + [f"sigma {sigma:g} m" for sigma in sigmas]
+    counts = {label: (ThresholdCounts(angle_thresholds, distance_thresholds),
+                      ThresholdCounts(angle_thresholds, distance_thresholds)) for label in labels}
+    grid = SigmaGrid(sigmas) if len(sigmas) else None
+    rng = noise_rng(config)
+
+    for seg1, seg2 in iter_source(config):
+        seg1 = np.asarray(seg1, dtype=float)
+        seg2 = np.asarray(seg2, dtype=float)
+        collision = segment_distance(seg1[:, 0], seg1[:, 1], seg2[:, 0], seg2[:, 1]) \
+            < config["collision_distance"]
+        measured = [seg2] if grid is None else [seg2, *measured_segments(seg1, seg2, grid, rng)]
+        for label, seg2_measured in zip(labels, measured):
+            angle_score, min_dist2 = alert_scores(seg1, seg2_measured,
+                                                  config.get("distance_mode", DISTANCE_MODE))
+            positive, negative = counts[label]
+            positive.update(angle_score[collision], min_dist2[collision])
+            negative.update(angle_score[~collision], min_dist2[~collision])
+
+    return {"angle_thresholds": angle_thresholds, "distance_thresholds": distance_thresholds,
+            "collision_distance": config["collision_distance"],
+            "curves": {label: roc_curves(positive, negative)
+                       for label, (positive, negative) in counts.items()}}
+
+
+def roc_curves(positive, negative):
+    """Eşik ızgarasında TPR, FPR ve kesinlik (Ka, Kd) ile mesafe eşiği başına AUC"""
+    tp = positive.counts()["alerts"].astype(float)
+    fp = negative.counts()["alerts"].astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpr = tp / positive.pairs
+        fpr = fp / negative.pairs
+        precision = tp / (tp + fp)
+    # AUC: açı eşiği boyunca eğri, (0, 0) ve (1, 1) uçlarıyla kapatılır
+    auc = []
+    for d in range(tpr.shape[1]):
+        order = np.lexsort((tpr[:, d], fpr[:, d]))
+        x = np.concatenate([[0.0], fpr[order, d], [1.0]])
+        y = np.concatenate([[0.0], tpr[order, d], [1.0]])
+        auc.append(float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2)))
+    return {"positives": positive.pairs, "negatives": negative.pairs,
+            "tpr": tpr, "fpr": fpr, "precision": precision, "auc": np.array(auc)}
+
+
+def operating_point(curves, min_recall=MIN_RECALL):
+    """TPR >= min_recall olan kombinasyonlardan en düşük FPR'li (a, d) indeksi; yoksa None"""
+    ok = curves["tpr"] >= min_recall
+    if not ok.any():
+        return None
+    fpr = np.where(ok, curves["fpr"], np.inf)
+    return np.unravel_index(np.argmin(fpr), fpr.shape)
+
+
+def plot_roc(result, out, max_curves=4):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_roc, ax_pr) = plt.subplots(1, 2, figsize=(14, 6))
+    for label, curves in result["curves"].items():
+        for d, threshold in enumerate(result["distance_thresholds"][:max_curves]):
+            order = np.argsort(curves["fpr"][:, d])
+            name = f"{label}, d<{threshold:g}"
+            ax_roc.plot(curves["fpr"][order, d], curves["tpr"][order, d],
+                        label=f"{name} (AUC {curves['auc'][d]:.3f})")
+            ax_pr.plot(curves["tpr"][order, d], curves["precision"][order, d], label=name)
+    ax_roc.plot([0, 1], [0, 1], "k:", linewidth=0.8)
+    ax_roc.set_xlabel("Yanlış alarm oranı (FPR)")
+    ax_roc.set_ylabel("Yakalanan çarpışma oranı (TPR)")
+    ax_roc.set_title(f"ROC (çarpışma: segment mesafesi < {result['collision_distance']:g} m)")
+    ax_pr.set_xlabel("Duyarlılık (recall)")
+    ax_pr.set_ylabel("Kesinlik (precision)")
+    ax_pr.set_title("Kesinlik - duyarlılık")
+    for ax in (ax_roc, ax_pr):
+        ax.grid(True)
+        ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(out, dpi=100)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alarm ölçütünün ROC / PR değerlendirmesi")
+    parser.add_argument("path", nargs="?", default=None,
+                        help='segment dosyası ("-" = stdin); yoksa --count ile senaryo üretilir')
+    parser.add_argument("--config", default=None, help="JSON yapılandırma dosyası (tuning.py ile aynı)")
+    parser.add_argument("--format", choices=["text", "binary"], default=None)
+    parser.add_argument("--collision-distance", type=float, default=COLLISION_DISTANCE,
+                        help="gerçek çarpışma sayılan segmentler arası mesafe (m)")
+    parser.add_argument("--angle-thresholds", default=ANGLE_THRESHOLDS)
+    parser.add_argument("--distance-thresholds", default=f"0,{DISTANCE_THRESHOLD},1.5,2.5")
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default=DISTANCE_MODE,
+                        help="alarm ölçütünün mesafe testi (gerçek etiket her zaman segment mesafesidir)")
+    parser.add_argument("--noise", default="0.5", help='gürültülü ölçüm sigmaları (m); "" = yalnızca temiz')
+    parser.add_argument("--count", type=float, default=1_000_000, help="senaryo çift sayısı")
+    parser.add_argument("--length", type=float, default=FORKLIFT_LENGTH, help="forklift uzunluğu (m)")
+    parser.add_argument("--max-distance", type=float, default=MAX_DISTANCE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-pairs", type=int, default=CHUNK_PAIRS)
+    parser.add_argument("--min-recall", type=float, default=MIN_RECALL)
+    parser.add_argument("--out", default=None, help="JSON rapor dosyası")
+    parser.add_argument("--plot", default=None, help="ROC ve PR eğrileri (.png)")
+    args, _ = parser.parse_known_args(argv)
+    if args.config:
+        with open(args.config) as file:
+            parser.set_defaults(**json.load(file))
+    config = vars(parser.parse_args(argv))
+    if config["noise"] == "":
+        config["noise"] = None
+
+    t = time.perf_counter()
+    result = run_roc(config)
+    elapsed = time.perf_counter() - t
+    angle_thresholds, distance_thresholds = result["angle_thresholds"], result["distance_thresholds"]
+    first = next(iter(result["curves"].values()))
+    print(f"Toplam çift: {first['positives'] + first['negatives']} "
+          f"({first['positives']} çarpışma, segment mesafesi < {config['collision_distance']:g} m; "
+          f"{elapsed:.2f} s)")
+
+    print(f"\n{'ölçüm':<16} {'mesafe eşiği':>12} {'AUC':>6}   en iyi (TPR >= {config['min_recall']:g})")
+    for label, curves in result["curves"].items():
+        for d, threshold in enumerate(distance_thresholds):
+            print(f"{label:<16} {threshold:>12g} {curves['auc'][d]:>6.3f}")
+        point = operating_point(curves, config["min_recall"])
+        if point is None:
+            print(f"{'':<36} hiçbir eşik bu duyarlılığa ulaşmıyor")
+            continue
+        a, d = point
+        print(f"{'':<36} açı {angle_thresholds[a]:g}, mesafe {distance_thresholds[d]:g}: "
+              f"TPR {curves['tpr'][a, d]:.4f}, FPR {curves['fpr'][a, d]:.4f}, "
+              f"kesinlik {curves['precision'][a, d]:.4f}")
+
+    if config["out"]:
+        with open(config["out"], "w") as file:
+            json.dump(jsonable(result), file, indent=2)
+        print(f"Rapor '{config['out']}' dosyasina yazildi.")
+    if config["plot"]:
+        plot_roc(result, config["plot"])
+        print(f"Grafik: {config['plot']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""GeoGebra `Segment[(x1, y1), (x2, y2)]` dosyaları için ortak yükleyici.
+
+Satırlar tek bir düzenli ifade geçişiyle doğrulanır, sayılar ise toplu
+olarak tek seferde (M,2,2) float dizisine çevrilir.
+`.bin` uzantılı dosyalar ya da fmt="binary" ile okunan akışlar, segment
+başına dört küçük-endian float32 (x1, y1, x2, y2) içeren sıkıştırılmış
+ikili biçimdir (scenario.py yazar). Yol olarak "-" verilirse stdin okunur.
+
+Sonuç dosyanın yanına `.cache.npy` olarak yazılır; dosyanın mtime ve
+boyutu değişmediği sürece sonraki çalıştırmalar diziyi bellek eşlemeli
+olarak doğrudan okur.
+"""
+import json
+import os
+import re
+import sys
+from contextlib import nullcontext
+
+import numpy as np
+
+import instrument
+
+_NUM = r"\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*"
+SEGMENT_RE = re.compile(
+    r"^[ \t]*Segment\[\(" + _NUM + "," + _NUM + r"\), \(" + _NUM + "," + _NUM + r"\)\][ \t\r]*$",
+    re.MULTILINE,
+)
+
+_STRIP = str.maketrans("()[],", "     ")
+
+BINARY_SUFFIX = ".bin"
+BINARY_DTYPE = np.dtype("<f4")
+SEGMENT_BYTES = 4 * BINARY_DTYPE.itemsize
+
+CACHE_SUFFIX = ".cache.npy"
+META_SUFFIX = ".cache.json"
+
+
+def _parse_line(line):
+    """Eski betiklerdeki satır ayrıştırıcısı; hatalı satırda None döner"""
+    line = line.strip()
+    if not line.startswith("Segment[") or not line.endswith("]"):
+        instrument.count("parse.skipped.syntax")
+        return None
+    coords_part = line[len("Segment["):-1]
+    points = coords_part.split('), (')
+    try:
+        p1 = points[0].replace('(', '').replace(')', '')
+        p2 = points[1].replace('(', '').replace(')', '')
+        x1, y1 = map(float, p1.split(','))
+        x2, y2 = map(float, p2.split(','))
+    except (ValueError, IndexError):
+        instrument.count("parse.skipped.number")
+        return None
+    return (x1, y1, x2, y2)
+
+
+@instrument.timed("parse")
+def parse_segments(text):
+    """Metni (M,2,2) diziye çevirir; (segments, skipped) döner.
+
+    Boş olmayan ama ayrıştırılamayan satırlar atlanır ve sayılır. Tüm
+    satırlar standart biçimdeyse sayılar toplu okunur; değilse satır satır
+    eski ayrıştırıcıya düşülür, böylece davranış aynı kalır.
+    """
+    valid = len(SEGMENT_RE.findall(text))
+    lines = sum(1 for line in text.splitlines() if line.strip())
+    if valid == lines:
+        numbers = text.translate(_STRIP).replace("Segment", " ").split()
+        coords = np.array(numbers, dtype=float).reshape(-1, 4)
+        skipped = 0
+    else:
+        instrument.count("parse.fallback")
+        rows = []
+        skipped = 0
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            row = _parse_line(line)
+            if row is None:
+                skipped += 1
+            else:
+                rows.append(row)
+        coords = np.array(rows, dtype=float).reshape(-1, 4)
+    instrument.count("parse.segments", len(coords))
+    instrument.count("parse.skipped_lines", skipped)
+    return np.ascontiguousarray(coords.reshape(-1, 2, 2)), skipped
+
+
+@instrument.timed("parse")
+def parse_binary(buf):
+    """İkili segment kayıtlarını (M,2,2) float diziye çevirir"""
+    usable = len(buf) - len(buf) % SEGMENT_BYTES
+    instrument.count("parse.segments", usable // SEGMENT_BYTES)
+    coords = np.frombuffer(buf, dtype=BINARY_DTYPE, count=usable // BINARY_DTYPE.itemsize)
+    return coords.astype(float).reshape(-1, 2, 2)
+
+
+def segment_format(path, fmt=None):
+    """Açık fmt yoksa uzantıdan 'text' ya da 'binary' çıkarır"""
+    if fmt is not None:
+        return fmt
+    return "binary" if str(path).endswith(BINARY_SUFFIX) else "text"
+
+
+def open_segments(path, fmt=None):
+    """Segment kaynağını biçime uygun kipte açar ("-" için kapatılmayan stdin)"""
+    binary = segment_format(path, fmt) == "binary"
+    if path == "-":
+        return nullcontext(sys.stdin.buffer if binary else sys.stdin)
+    return open(path, "rb" if binary else "r")
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def load_segments(path, use_cache=True, fmt=None):
+    """Segment dosyasını yükler; (segments, skipped) döner.
+
+    use_cache açıkken geçerli bir `<path>.cache.npy` varsa bellek eşlemeli
+    (salt okunur) dizi döner; yoksa dosya ayrıştırılıp önbellek yazılır.
+    İkili dosyalar ve stdin ("-") önbelleksiz okunur.
+    """
+    fmt = segment_format(path, fmt)
+    if path == "-" or fmt == "binary":
+        with open_segments(path, fmt) as file, instrument.timer("read"):
+            data = file.read()
+        if fmt == "binary":
+            return parse_binary(data), 0
+        return parse_segments(data)
+
+    key = _file_key(path)
+    cache_path = path + CACHE_SUFFIX
+    meta_path = path + META_SUFFIX
+
+    if use_cache:
+        try:
+            with open(meta_path, "r") as file:
+                meta = json.load(file)
+            if meta.get("mtime_ns") == key["mtime_ns"] and meta.get("size") == key["size"]:
+                instrument.count("parse.cache_hits")
+                instrument.count("parse.skipped_lines", meta["skipped"])
+                return np.load(cache_path, mmap_mode="r"), meta["skipped"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    with open(path, "r") as file:
+        with instrument.timer("read"):
+            text = file.read()
+        segments, skipped = parse_segments(text)
+
+    if use_cache:
+        try:
+            tmp = cache_path + ".tmp.npy"
+            np.save(tmp, segments)
+            os.replace(tmp, cache_path)
+            with open(meta_path + ".tmp", "w") as file:
+                json.dump(dict(key, skipped=skipped), file)
+            os.replace(meta_path + ".tmp", meta_path)
+        except OSError:
+            pass  # salt okunur dizinde önbelleksiz devam et
+    return segments, skipped
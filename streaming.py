@@ -0,0 +1,276 @@
+"""Bellekten büyük segment dosyaları için parça parça işleme.
+
+Dosya sabit sayıda çift içeren parçalar halinde okunur, her parça vektörel
+alarm ve açısal hata hesabından geçirilir ve sonuçlar sabit boyutlu
+birikimli istatistiklere katlanır. Bellek kullanımı dosya boyutundan
+bağımsız olarak parça boyutuyla sınırlıdır.
+"""
+import itertools
+import math
+
+import numpy as np
+
+import instrument
+from alert_engine import (DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, evaluate_alerts,
+                          angular_errors)
+from segment_io import SEGMENT_BYTES, parse_binary, parse_segments, open_segments, segment_format
+
+ERROR_NAMES = ("CAD", "DBC", "BDA", "ACB")
+
+
+class RunningStats:
+    """Sayı, ortalama, varyans (M2) ve maksimumu sabit bellekte tutar.
+
+    Parçalar Chan'ın paralel formülüyle birleştirilir; merge() ile farklı
+    süreçlerden gelen sonuçlar da aynı şekilde toplanabilir.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        other = RunningStats()
+        other.count = values.size
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.max = float(values.max())
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.max = max(self.max, other.max)
+        self.count = total
+        return self
+
+    @property
+    def std(self):
+        # np.std ile aynı (ddof=0)
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "std": 0.0, "max": 0.0}
+        return {"count": self.count, "mean": self.mean, "std": self.std, "max": self.max}
+
+
+class BinnedStats:
+    """Mesafe kutularına göre hata istatistikleri, sabit bellekte.
+
+    Her kutu için sayı, ortalama, M2, maksimum ve [0, value_max] aralığında
+    value_bins eşit hücreli bir hata histogramı tutulur. Yüzdelikler bu
+    histogramdan hücre içinde doğrusal aradeğerlemeyle çıkarılır (çözünürlük
+    value_max / value_bins); value_max'ı aşan değerler son hücreye sayılır.
+    Kutuların dışında kalan mesafeler `outside` sayacına gider.
+    """
+
+    def __init__(self, edges, value_max=180.0, value_bins=2048):
+        self.edges = np.asarray(edges, dtype=float)
+        self.value_max = float(value_max)
+        self.value_bins = int(value_bins)
+        bins = len(self.edges) - 1
+        self.count = np.zeros(bins, dtype=np.int64)
+        self.mean = np.zeros(bins)
+        self.m2 = np.zeros(bins)
+        self.max = np.full(bins, -np.inf)
+        self.hist = np.zeros((bins, self.value_bins), dtype=np.int64)
+        self.outside = 0
+
+    @property
+    def centers(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    def _bin_index(self, x):
+        # np.histogram gibi: son kenar son kutuya dahil
+        index = np.searchsorted(self.edges, x, side="right") - 1
+        index[x == self.edges[-1]] = len(self.edges) - 2
+        return index
+
+    def update(self, x, values):
+        """x mesafelerine karşılık gelen hata değerlerini ekler (aynı boyutta)"""
+        x, values = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(values, dtype=float))
+        x, values = x.ravel(), values.ravel()
+        index = self._bin_index(x)
+        inside = (index >= 0) & (index < len(self.count))
+        self.outside += int(values.size - np.count_nonzero(inside))
+        index, values = index[inside], values[inside]
+        if values.size == 0:
+            return self
+
+        other = BinnedStats(self.edges, self.value_max, self.value_bins)
+        bins = len(self.count)
+        other.count = np.bincount(index, minlength=bins)
+        filled = other.count > 0
+        other.mean[filled] = np.bincount(index, weights=values, minlength=bins)[filled] / other.count[filled]
+        other.m2 = np.bincount(index, weights=(values - other.mean[index]) ** 2, minlength=bins)
+        np.maximum.at(other.max, index, values)
+        cell = np.clip((values * (self.value_bins / self.value_max)).astype(np.int64),
+                       0, self.value_bins - 1)
+        other.hist = np.bincount(index * self.value_bins + cell,
+                                 minlength=bins * self.value_bins).reshape(bins, self.value_bins)
+        return self.merge(other)
+
+    def merge(self, other):
+        """Aynı kutulu başka bir BinnedStats'ı (ör. başka bir süreçten) ekler"""
+        if (not np.array_equal(self.edges, other.edges) or self.value_max != other.value_max
+                or self.value_bins != other.value_bins):
+            raise ValueError("BinnedStats kutuları uyuşmuyor")
+        total = self.count + other.count
+        safe = np.maximum(total, 1)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / safe
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / safe
+        self.max = np.maximum(self.max, other.max)
+        self.hist += other.hist
+        self.count = total
+        self.outside += other.outside
+        return self
+
+    def state(self):
+        """Yeniden kurmak için gereken diziler (np.savez ile yazılabilir)"""
+        return {"edges": self.edges, "value_max": self.value_max, "value_bins": self.value_bins,
+                "count": self.count, "mean": self.mean, "m2": self.m2, "max": self.max,
+                "hist": self.hist, "outside": self.outside}
+
+    @classmethod
+    def from_state(cls, state):
+        """state() çıktısından (ör. diskten okunmuş) BinnedStats kurar"""
+        binned = cls(state["edges"], float(state["value_max"]), int(state["value_bins"]))
+        for name in ("count", "mean", "m2", "max", "hist"):
+            setattr(binned, name, np.array(state[name]))
+        binned.outside = int(state["outside"])
+        return binned
+
+    @property
+    def std(self):
+        # np.std ile aynı (ddof=0)
+        return np.sqrt(self.m2 / np.maximum(self.count, 1))
+
+    def quantile(self, q):
+        """Kutu başına yaklaşık q yüzdeliği (boş kutularda NaN)"""
+        cumulative = np.cumsum(self.hist, axis=1)
+        target = q * self.count
+        cell = np.minimum((cumulative < target[:, None]).sum(axis=1), self.value_bins - 1)
+        rows = np.arange(len(self.count))
+        below = np.where(cell > 0, cumulative[rows, np.maximum(cell - 1, 0)], 0)
+        inside = self.hist[rows, cell]
+        fraction = np.where(inside > 0, (target - below) / np.maximum(inside, 1), 0.0)
+        width = self.value_max / self.value_bins
+        value = np.minimum((cell + fraction) * width, self.max)
+        return np.where(self.count > 0, value, np.nan)
+
+    def total(self):
+        """Tüm kutuların birleşik (kesin) RunningStats'ı"""
+        stats = RunningStats()
+        for k in np.flatnonzero(self.count):
+            other = RunningStats()
+            other.count = int(self.count[k])
+            other.mean = float(self.mean[k])
+            other.m2 = float(self.m2[k])
+            other.max = float(self.max[k])
+            stats.merge(other)
+        return stats
+
+    def table(self):
+        """Kutu başına center, count, mean, std, max, p50, p95, p99 dizileri"""
+        empty = self.count == 0
+        return {
+            "center": self.centers,
+            "count": self.count.copy(),
+            "mean": np.where(empty, np.nan, self.mean),
+            "std": np.where(empty, np.nan, self.std),
+            "max": np.where(empty, np.nan, self.max),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def iter_segment_chunks(path, chunk_pairs=100_000, fmt=None):
+    """Dosyayı (seg1, seg2, skipped) parçaları halinde üretir.
+
+    path "-" ise stdin okunur; fmt 'text' veya 'binary' olabilir (varsayılan
+    uzantıdan çıkarılır).
+
+    Atlanan satırlar çift eşleşmesini bozmadığı için (betiklerdeki gibi
+    geçerli segmentler sırayla eşlenir), parçada tek kalan segment bir
+    sonraki parçaya devredilir. Dosya sonunda eşsiz kalan segment, seg2'si
+    boş bir son parça olarak döner.
+    """
+    binary = segment_format(path, fmt) == "binary"
+    carry = np.empty((0, 2, 2))
+    with open_segments(path, fmt) as file:
+        while True:
+            if binary:
+                with instrument.timer("read"):
+                    data = file.read(2 * chunk_pairs * SEGMENT_BYTES)
+                if not data:
+                    break
+                segments, skipped = parse_binary(data), 0
+            else:
+                with instrument.timer("read"):
+                    lines = list(itertools.islice(file, 2 * chunk_pairs))
+                if not lines:
+                    break
+                segments, skipped = parse_segments("".join(lines))
+            instrument.count("chunks")
+            if len(carry):
+                segments = np.concatenate([carry, segments])
+            pairs = len(segments) // 2
+            carry = segments[2 * pairs:]
+            yield segments[0:2 * pairs:2], segments[1:2 * pairs:2], skipped
+    if len(carry):
+        yield carry, np.empty((0, 2, 2)), 0
+
+
+def stream_analysis(path, chunk_pairs=100_000, distance_threshold=DISTANCE_THRESHOLD,
+                    angle_threshold=ANGLE_THRESHOLD, noise=None, seed=None, fmt=None,
+                    store=None, distance_mode=DISTANCE_MODE):
+    """Dosyayı parça parça işleyip birikimli sonuçları döner.
+
+    Sayılar bellek içi yolla (headless.run) birebir aynıdır; aynı seed ile
+    gürültü de aynı sırayla çekildiğinden istatistikler kayan nokta
+    toleransı içinde eşleşir. store bir result_store.ResultWriter ise her
+    parçanın adım sütunları (ta..td, m, n, mesafeler, hatalar) ona eklenir;
+    mode="a" ile açılmış bir depoda adım numaraları mevcut satırlardan sürer.
+    """
+    rng = np.random.default_rng(seed) if noise is not None else None
+    totals = {"steps": 0, "skipped_lines": 0, "alerts": 0,
+              "angle_alerts": 0, "distance_alerts": 0}
+    errors = {name: RunningStats() for name in ERROR_NAMES}
+    base_step = store.rows if store is not None else 0
+
+    for seg1, seg2, skipped in iter_segment_chunks(path, chunk_pairs, fmt):
+        totals["skipped_lines"] += skipped
+        totals["steps"] += len(seg1)
+        if len(seg2) == 0:
+            continue
+        first_step = base_step + totals["steps"] - len(seg1)
+        results = evaluate_alerts(seg1, seg2, distance_threshold, angle_threshold,
+                                  details=store is not None, distance_mode=distance_mode)
+        totals["alerts"] += int(results["alert"].sum())
+        totals["angle_alerts"] += int(results["angle_alert"].sum())
+        totals["distance_alerts"] += int(results["distance_alert"].sum())
+        if rng is not None:
+            chunk_errors = angular_errors(seg1, seg2, rng, scale=noise)
+            with instrument.timer("aggregate"):
+                for name in ERROR_NAMES:
+                    errors[name].update(chunk_errors[f"err_{name}"])
+            results.update(chunk_errors)
+        if store is not None:
+            store.append_results(results, first_step)
+
+    if rng is not None:
+        for name in ERROR_NAMES:
+            totals[f"err_{name}"] = errors[name].summary()
+    return totals
@@ -0,0 +1,548 @@
+"""forkplot5.py'deki sistematik taramanın paralel, vektörel sürümü.
+
+Mesafe x merkez dönüşü x CD yönü ızgarası düzleştirilip sabit boyutlu
+karolara bölünür. Her karo kendi seed'iyle (SeedSequence(seed, karo no))
+tek seferde hesaplanır, bu yüzden sonuç işçi sayısından bağımsızdır.
+Karolar bittikçe sonuçlar diskteki bellek eşlemeli .npy dosyasına yazılır.
+
+    python sweep.py --step-distance 0.1 --step-rotation 2 --workers 8 --out sweep.npy
+    python sweep.py --method analytic       # beklenen hata eğrisi, örneklemesiz
+    python sweep.py --method compare        # Monte Carlo ile analitik eğriyi karşılaştır
+    python sweep.py --method adaptive --budget 20000 --tolerance 0.25 --plot adaptive.png
+
+Özetler (ham --out dosyası istenmedikçe) sweep_cache ile diskte önbelleğe
+alınır; aynı parametre, seed ve kodla yeniden çalıştırma simülasyonu atlar.
+forkplot5.py bu taramayı (cached_sweep) kullanır; forkplot4.py'nin
+simülasyonu da burada (random_sweep) yer alır. Sonuçlar seed ile yeniden
+üretilebilir, ancak betiklerin eski döngüleriyle örnek örnek aynı değildir.
+"""
+import argparse
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from alert_engine import ANGLE_THRESHOLD, mn_alert
+from geometry import dot_det, calculate_angle, distance, noisy_point, angular_error
+from propagation import acb_error_moments, mixture_moments
+from noise import NOISE_SIGMA, RangeNoise, make_rng
+from streaming import BinnedStats, RunningStats
+from sweep_cache import DEFAULT_CACHE_DIR, SweepCache, cache_key, cached, code_version
+
+FORKLIFT_LENGTH = 3
+MIN_DISTANCE = 3.5
+MAX_DISTANCE = 28.0
+STEP_DISTANCE = 0.5
+STEP_ROTATION = 10  # derece
+TILE_SIZE = 65536
+ADAPTIVE_BUDGET = 20000
+ADAPTIVE_TOLERANCE = 0.25  # derece; köşe ortalamalarının izin verilen yayılımı
+ADAPTIVE_REPS = 32
+
+COLUMNS = ("distance", "center_rotation_deg", "cd_angle_deg", "error_deg")
+# Önbellek anahtarına kaynağı katılan, sonucu etkileyen modüller
+SWEEP_MODULES = ("alert_engine", "geometry", "noise", "propagation", "streaming", "sweep")
+
+
+def make_grid(max_distance=MAX_DISTANCE, step_distance=STEP_DISTANCE,
+              step_rotation=STEP_ROTATION, min_distance=MIN_DISTANCE):
+    """forkplot5.py ile aynı eksenler: (mesafeler, merkez dönüşleri, CD açıları)"""
+    distances = np.arange(min_distance, max_distance + 0.01, step_distance)
+    rotations = np.arange(0, 360, step_rotation, dtype=float)
+    return distances, rotations, rotations.copy()
+
+
+def tile_geometry(grid, start, stop, length=FORKLIFT_LENGTH):
+    """Düzleştirilmiş ızgaranın [start, stop) aralığı için (mesafe, dönüş, CD açısı, A, B, C)"""
+    distances, rotations, cd_angles = grid
+    shape = (len(distances), len(rotations), len(cd_angles))
+    i_dist, i_rot, i_cd = np.unravel_index(np.arange(start, stop), shape)
+    dist = distances[i_dist]
+    rot = np.radians(rotations[i_rot])
+    cd = np.radians(cd_angles[i_cd])
+
+    # Sabit forklift AB: A = (0, 0), B = (L, 0)
+    n = stop - start
+    A = np.zeros((n, 2))
+    B = np.zeros((n, 2))
+    B[:, 0] = length
+    center = np.stack([length / 2 + dist * np.cos(rot), dist * np.sin(rot)], axis=-1)
+    half = np.stack([np.cos(cd), np.sin(cd)], axis=-1) * (length / 2)
+    C = center + half
+    return dist, rotations[i_rot], cd_angles[i_cd], A, B, C
+
+
+def evaluate_tile(grid, start, stop, tile_index, seed, noise=None,
+                  length=FORKLIFT_LENGTH):
+    """Düzleştirilmiş ızgaranın [start, stop) aralığını hesaplar; (k,4) dizi döner"""
+    if noise is None:
+        noise = RangeNoise()
+    dist, rot_deg, cd_deg, A, B, C = tile_geometry(grid, start, stop, length)
+
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(tile_index,)))
+    true_AC = np.hypot(C[:, 0], C[:, 1])
+    noisy_C = noisy_point(A, C, noise.sample(true_AC, rng))
+
+    angle_true = calculate_angle(A, C, B)
+    angle_noisy = calculate_angle(A, noisy_C, B)
+    error_deg = np.degrees(angular_error(angle_true, angle_noisy))
+    return start, np.stack([dist, rot_deg, cd_deg, error_deg], axis=-1)
+
+
+def _evaluate_tile_args(args):
+    return evaluate_tile(*args)
+
+
+def run_sweep(out, max_distance=MAX_DISTANCE, step_distance=STEP_DISTANCE,
+              step_rotation=STEP_ROTATION, noise=None, seed=0, workers=1,
+              tile_size=TILE_SIZE):
+    """Taramayı çalıştırır, sonuçları `out` (.npy, (N,4)) dosyasına akıtır.
+
+    Dönen özet toplam nokta sayısını, hata istatistiklerini (derece) ve
+    "by_distance" altında her tarama mesafesi için BinnedStats içerir.
+    out None ise ham sonuçlar yazılmaz, yalnızca özet döner.
+    """
+    grid = make_grid(max_distance, step_distance, step_rotation)
+    total = len(grid[0]) * len(grid[1]) * len(grid[2])
+    tiles = [(grid, start, min(start + tile_size, total), k, seed, noise)
+             for k, start in enumerate(range(0, total, tile_size))]
+
+    result = None
+    if out is not None:
+        result = np.lib.format.open_memmap(out, mode="w+", dtype=float, shape=(total, len(COLUMNS)))
+    stats = RunningStats()
+    # Her tarama mesafesi kendi kutusunun ortasında
+    distances = grid[0]
+    binned = BinnedStats(np.append(distances - step_distance / 2, distances[-1] + step_distance / 2))
+
+    def consume(items):
+        for start, block in items:
+            if result is not None:
+                result[start:start + len(block)] = block
+            stats.update(block[:, 3])
+            binned.update(block[:, 0], block[:, 3])
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            consume(executor.map(_evaluate_tile_args, tiles))
+    else:
+        consume(map(_evaluate_tile_args, tiles))
+    if result is not None:
+        result.flush()
+
+    summary = stats.summary()
+    summary["tiles"] = len(tiles)
+    summary["by_distance"] = binned
+    return summary
+
+
+def analytic_sweep(max_distance=MAX_DISTANCE, step_distance=STEP_DISTANCE,
+                   step_rotation=STEP_ROTATION, noise=None, tile_size=TILE_SIZE,
+                   length=FORKLIFT_LENGTH):
+    """Monte Carlo yerine birinci mertebe yayılımla aynı tarama.
+
+    Her ızgara noktası için hatanın beklenen değeri ve std'si kapalı formda
+    hesaplanır; mesafe başına karışım ortalaması/std'si (derece) ile genel
+    özet döner. Örnekleme olmadığından seed gerekmez.
+    """
+    if noise is None:
+        noise = RangeNoise()
+    grid = make_grid(max_distance, step_distance, step_rotation)
+    distances = grid[0]
+    per_distance = len(grid[1]) * len(grid[2])
+    total = len(distances) * per_distance
+    mean = np.empty(total)
+    std = np.empty(total)
+    for start in range(0, total, tile_size):
+        stop = min(start + tile_size, total)
+        _, _, _, A, B, C = tile_geometry(grid, start, stop, length)
+        mean[start:stop], std[start:stop] = acb_error_moments(A, B, C, noise)
+    mean = np.degrees(mean)
+    std = np.degrees(std)
+
+    # Düzleştirilmiş ızgarada mesafe en dış eksendir
+    index = np.arange(total) // per_distance
+    count, curve_mean, curve_std = mixture_moments(index, mean, std, len(distances))
+    _, (overall_mean,), (overall_std,) = mixture_moments(np.zeros(total, dtype=np.int64), mean, std, 1)
+    return {
+        "count": total,
+        "mean": float(overall_mean),
+        "std": float(overall_std),
+        "distance": distances,
+        "curve_count": count,
+        "curve_mean": curve_mean,
+        "curve_std": curve_std,
+    }
+
+
+def point_errors(distance_, rotation_deg, cd_deg, noise=None, rng=None, reps=ADAPTIVE_REPS,
+                 length=FORKLIFT_LENGTH):
+    """Izgara noktalarında ACB hatasının (ortalama, std) çifti, derece.
+
+    rng verilirse her nokta için reps gürültü örneğiyle Monte Carlo, aksi
+    halde birinci mertebe kapalı form (acb_error_moments) kullanılır.
+    """
+    if noise is None:
+        noise = RangeNoise()
+    rot = np.radians(rotation_deg)
+    cd = np.radians(cd_deg)
+    A = np.zeros(2)
+    B = np.array([length, 0.0])
+    C = np.stack([length / 2 + distance_ * np.cos(rot) + (length / 2) * np.cos(cd),
+                  distance_ * np.sin(rot) + (length / 2) * np.sin(cd)], axis=-1)
+    if rng is None:
+        mean, std = acb_error_moments(A, B, C, noise)
+        return np.degrees(mean), np.degrees(std)
+    noisy_C = noisy_point(A, C, noise.sample(distance(C, A), rng, reps))
+    errors = np.degrees(angular_error(calculate_angle(A, C, B), calculate_angle(A, noisy_C, B)))
+    return errors.mean(axis=0), errors.std(axis=0)
+
+
+def adaptive_sweep(max_distance=MAX_DISTANCE, noise=None, seed=0, budget=ADAPTIVE_BUDGET,
+                   tolerance=ADAPTIVE_TOLERANCE, coarse_distance=4.0, coarse_rotation=45,
+                   max_depth=6, method="montecarlo", reps=ADAPTIVE_REPS, length=FORKLIFT_LENGTH):
+    """Mesafe x merkez dönüşü x CD yönü uzayında uyarlamalı (seyrek) tarama.
+
+    Kaba ızgaranın her hücresinin 8 köşesi değerlendirilir. Köşelerdeki
+    ortalama hatanın yayılımı (maks - min, derece) tolerance'ı aşan hücreler,
+    en büyük yayılımdan başlayarak 8 alt hücreye bölünür; köşeler ortak
+    kafeste tutulduğundan her nokta bir kez değerlendirilir. Değerlendirme
+    sayısı budget'a ulaşınca ya da tüm hücreler toleransın altına inince
+    durulur. Monte Carlo'da yayılımdan köşe ortalamalarının iki standart
+    hatası düşülür, böylece yalnızca gürültü yüzünden bölünme olmaz.
+    Dönüş eksenleri 360°'de sarılır.
+
+    Dönen seyrek sonuçta her nokta için mesafe, açılar, ortalama/std hata
+    ve hacim ağırlığı (yaprak hücre hacimlerinin köşelere eşit payı) vardır;
+    ağırlıklı ortalamalar tekdüze ızgaranın ortalamalarına karşılık gelir.
+    method="analytic" gürültü örneklemeden kapalı formu değerlendirir.
+    """
+    if noise is None:
+        noise = RangeNoise()
+    if method not in ("montecarlo", "analytic"):
+        raise ValueError(f"Bilinmeyen yöntem: {method}")
+    scale = 1 << max_depth
+    span = max_distance - MIN_DISTANCE
+    n_dist = max(int(np.ceil(span / coarse_distance - 1e-9)), 1)
+    n_rot = max(int(round(360 / coarse_rotation)), 1)
+    # Kafes birimi başına fiziksel adım; dönüş eksenlerinde indeks n_rot * scale'de sarılır
+    unit = np.array([span / (n_dist * scale), 360 / (n_rot * scale), 360 / (n_rot * scale)])
+    wrap = n_rot * scale
+
+    index = {}
+    keys = []
+    means = []
+    stds = []
+    rounds = 0
+
+    def key(point):
+        return point[0], point[1] % wrap, point[2] % wrap
+
+    def evaluate(points):
+        nonlocal rounds
+        new = []
+        for point in points:
+            k = key(point)
+            if k not in index:
+                index[k] = len(keys) + len(new)
+                new.append(k)
+        if not new:
+            return
+        lattice = np.array(new, dtype=float) * unit
+        rng = None
+        if method == "montecarlo":
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(rounds,)))
+        mean, std = point_errors(MIN_DISTANCE + lattice[:, 0], lattice[:, 1], lattice[:, 2],
+                                 noise, rng, reps, length)
+        keys.extend(new)
+        means.extend(mean)
+        stds.extend(std)
+        rounds += 1
+
+    def lattice_points(cell, step):
+        level, i, j, k = cell
+        size = scale >> level
+        return [(i + a, j + b, k + c) for a in range(0, size + 1, step)
+                for b in range(0, size + 1, step) for c in range(0, size + 1, step)]
+
+    # Monte Carlo'da köşe ortalamalarının örnekleme gürültüsü (2 standart hata) yayılımdan düşülür
+    margin = 0.0 if method == "analytic" else 2 / np.sqrt(reps)
+
+    def spread(cell):
+        rows = [index[key(point)] for point in lattice_points(cell, scale >> cell[0])]
+        values = [means[row] for row in rows]
+        return max(values) - min(values) - margin * max(stds[row] for row in rows)
+
+    coarse = [(0, i * scale, j * scale, k * scale)
+              for i in range(n_dist) for j in range(n_rot) for k in range(n_rot)]
+    corners = {key(point) for cell in coarse for point in lattice_points(cell, scale)}
+    if len(corners) > budget:
+        raise ValueError(f"Kaba ızgara ({len(corners)} nokta) bütçeyi ({budget}) aşıyor")
+    evaluate(sorted(corners))
+
+    # Bölünebilir hücreler yayılıma göre öncelik kuyruğunda; yapraklar ağırlık için tutulur
+    heap = []
+    leaves = []
+    for cell in coarse:
+        heapq.heappush(heap, (-spread(cell), cell))
+    while heap and -heap[0][0] > tolerance:
+        # Bir turda toleransı aşan hücreler öncelik sırasıyla, bütçe elverdikçe bölünür
+        split = []
+        pending = set()
+        while heap and -heap[0][0] > tolerance:
+            cell = heap[0][1]
+            if cell[0] >= max_depth:
+                leaves.append(heapq.heappop(heap)[1])
+                continue
+            need = {key(point) for point in lattice_points(cell, (scale >> cell[0]) // 2)}
+            need = {k for k in need if k not in index and k not in pending}
+            if len(keys) + len(pending) + len(need) > budget:
+                break
+            heapq.heappop(heap)
+            pending |= need
+            split.append(cell)
+        if not split:
+            break
+        evaluate(sorted(pending))
+        for level, i, j, k in split:
+            half = (scale >> level) // 2
+            for a in (0, half):
+                for b in (0, half):
+                    for c in (0, half):
+                        child = (level + 1, i + a, j + b, k + c)
+                        heapq.heappush(heap, (-spread(child), child))
+    leaves.extend(cell for _, cell in heap)
+
+    weight = np.zeros(len(keys))
+    for cell in leaves:
+        size = scale >> cell[0]
+        share = np.prod(unit * size) / 8
+        for point in lattice_points(cell, size):
+            weight[index[key(point)]] += share
+
+    lattice = np.array(keys, dtype=float) * unit
+    return {
+        "distance": MIN_DISTANCE + lattice[:, 0],
+        "center_rotation_deg": lattice[:, 1],
+        "cd_angle_deg": lattice[:, 2],
+        "error_deg": np.array(means),
+        "error_std": np.array(stds),
+        "weight": weight,
+        "evaluations": len(keys),
+        "cells": len(leaves),
+        "rounds": rounds,
+    }
+
+
+def weighted_curve(distance_, values, weight, edges):
+    """Seyrek sonuçtan mesafe kutusu başına ağırlıklı ortalama; boş kutularda NaN"""
+    index = np.clip(np.searchsorted(edges, distance_, side="right") - 1, 0, len(edges) - 2)
+    total = np.bincount(index, weights=weight, minlength=len(edges) - 1)
+    summed = np.bincount(index, weights=weight * values, minlength=len(edges) - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, summed / total, np.nan)
+
+
+def cached_sweep(max_distance=MAX_DISTANCE, step_distance=STEP_DISTANCE,
+                 step_rotation=STEP_ROTATION, noise=None, seed=0, workers=1,
+                 tile_size=TILE_SIZE, cache=None):
+    """run_sweep özetini önbellekten ya da (ham çıktı yazmadan) hesaplayarak döner; (özet, isabet).
+
+    Karo boyutu her karonun seed'ini belirlediği için anahtara girer; işçi
+    sayısı girmez.
+    """
+    if noise is None:
+        noise = RangeNoise()
+    params = {"length": FORKLIFT_LENGTH, "min_distance": MIN_DISTANCE,
+              "max_distance": max_distance, "step_distance": step_distance,
+              "step_rotation": step_rotation, "sigma": noise.sigma, "bias": noise.bias,
+              "proportional": noise.proportional, "seed": seed, "tile_size": tile_size}
+    key = cache_key("run_sweep", params, code_version(*SWEEP_MODULES))
+    return cached(cache, key, lambda: run_sweep(None, max_distance, step_distance, step_rotation,
+                                                noise, seed, workers, tile_size))
+
+
+def ring_points(dist, step_rotation=STEP_ROTATION, length=FORKLIFT_LENGTH):
+    """forkplot5.py'deki tek mesafe halkası: tüm (merkez dönüşü, CD yönü) için C ve D, (k, 2)"""
+    rotations = np.radians(np.arange(0, 360, step_rotation))
+    center_rot, cd_rot = (g.ravel() for g in np.meshgrid(rotations, rotations, indexing="ij"))
+    center = np.stack([length / 2 + dist * np.cos(center_rot), dist * np.sin(center_rot)], axis=-1)
+    half = (length / 2) * np.stack([np.cos(cd_rot), np.sin(cd_rot)], axis=-1)
+    return center + half, center - half
+
+
+def random_placements(count, length=FORKLIFT_LENGTH, max_distance=25, sigma=NOISE_SIGMA, seed=0):
+    """forkplot4.py'nin rastgele yerleşimleri, seed ile yeniden üretilebilir.
+
+    Önce tüm AC, AD, BC, BD gürültüsü, ardından tek blokta AB yönü, CD
+    merkez mesafesi, merkez yönü ve CD yönü çekilir. A, B, C, D (count, 2),
+    merkez mesafesi ve gürültülü C_a, D_a, C_b, D_b noktaları döner.
+    """
+    rng = make_rng(seed)
+    range_noise = RangeNoise(sigma).sample(np.zeros((count, 4)), rng)
+    draws = rng.uniform(0, 1, (count, 4))
+    angle_AB = 2 * np.pi * draws[:, 0]
+    center_distance = max_distance * draws[:, 1]
+    angle_to_CD = 2 * np.pi * draws[:, 2]
+    angle_CD = 2 * np.pi * draws[:, 3]
+
+    A = np.zeros((count, 2))
+    B = length * np.stack([np.cos(angle_AB), np.sin(angle_AB)], axis=-1)
+    center = center_distance[:, None] * np.stack([np.cos(angle_to_CD), np.sin(angle_to_CD)], axis=-1)
+    half = (length / 2) * np.stack([np.cos(angle_CD), np.sin(angle_CD)], axis=-1)
+    C, D = center + half, center - half
+
+    starts = np.stack([A, A, B, B], axis=1)
+    ends = np.stack([C, D, C, D], axis=1)
+    noisy = noisy_point(starts, ends, distance(starts, ends) + range_noise)
+    return {"A": A, "B": B, "C": C, "D": D, "center_distance": center_distance,
+            "C_a": noisy[:, 0], "D_a": noisy[:, 1], "C_b": noisy[:, 2], "D_b": noisy[:, 3]}
+
+
+def random_sweep(count, length=FORKLIFT_LENGTH, max_distance=25, sigma=NOISE_SIGMA, seed=0,
+                 angle_threshold=ANGLE_THRESHOLD, distance_bin=1.0):
+    """forkplot4.py'nin simülasyonu: alarm sayısı, mesafe başına ACB hatası ve analitik eğri"""
+    p = random_placements(count, length, max_distance, sigma, seed)
+    A, B, C, D = p["A"], p["B"], p["C"], p["D"]
+    angle_ACB_true = calculate_angle(A, C, B)
+    noisy_ACB = calculate_angle(A, p["C_a"], B)
+    binned = BinnedStats(np.arange(0, max_distance + distance_bin, distance_bin))
+    binned.update(p["center_distance"], np.degrees(angular_error(0, noisy_ACB - angle_ACB_true)))
+
+    alerts = mn_alert(*dot_det(C, A, D), *dot_det(D, B, C),
+                      *dot_det(A, C, B), *dot_det(B, D, A), angle_threshold)
+
+    # Aynı konfigürasyonlarda beklenen hata, tek gürültü örneği yerine kapalı formda
+    expected, expected_std = acb_error_moments(np.zeros(2), B, C, RangeNoise(sigma))
+    bins = len(binned.count)
+    _, curve_mean, curve_std = mixture_moments(
+        np.minimum((p["center_distance"] // distance_bin).astype(np.int64), bins - 1),
+        np.degrees(expected), np.degrees(expected_std), bins)
+    return {"alerts": int(alerts.sum()), "by_distance": binned,
+            "curve_mean": curve_mean, "curve_std": curve_std}
+
+
+def cached_random_sweep(count, length=FORKLIFT_LENGTH, max_distance=25, sigma=NOISE_SIGMA,
+                        seed=0, angle_threshold=ANGLE_THRESHOLD, distance_bin=1.0, cache=None):
+    """random_sweep'in önbellekli hali; (sonuçlar, isabet)"""
+    params = {"count": count, "length": length, "max_distance": max_distance, "sigma": sigma,
+              "seed": seed, "angle_threshold": angle_threshold, "distance_bin": distance_bin}
+    key = cache_key("random_sweep", params, code_version(*SWEEP_MODULES))
+    return cached(cache, key, lambda: random_sweep(count, length, max_distance, sigma, seed,
+                                                   angle_threshold, distance_bin))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="forkplot5.py taramasının paralel sürümü")
+    parser.add_argument("--max-distance", type=float, default=MAX_DISTANCE)
+    parser.add_argument("--step-distance", type=float, default=STEP_DISTANCE)
+    parser.add_argument("--step-rotation", type=float, default=STEP_ROTATION)
+    parser.add_argument("--sigma", type=float, default=NOISE_SIGMA)
+    parser.add_argument("--bias", type=float, default=0.0)
+    parser.add_argument("--proportional", type=float, default=0.0,
+                        help="mesafeyle orantılı gürültü katsayısı (sigma/m)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE)
+    parser.add_argument("--out", default=None,
+                        help="ham (N,4) sonuçları bu .npy dosyasına yaz (önbelleği atlar)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="özet önbelleğini kullanma")
+    parser.add_argument("--method", choices=["montecarlo", "analytic", "compare", "adaptive"],
+                        default="montecarlo",
+                        help="analytic: birinci mertebe kapalı form; compare: Monte Carlo ile yan yana; "
+                             "adaptive: kaba ızgaradan bütçeli uyarlamalı inceltme")
+    parser.add_argument("--budget", type=int, default=ADAPTIVE_BUDGET,
+                        help="adaptive: en fazla nokta değerlendirmesi")
+    parser.add_argument("--tolerance", type=float, default=ADAPTIVE_TOLERANCE,
+                        help="adaptive: hücre köşelerinde izin verilen hata yayılımı (derece)")
+    parser.add_argument("--reps", type=int, default=ADAPTIVE_REPS,
+                        help="adaptive: nokta başına Monte Carlo örneği (0 = analitik)")
+    parser.add_argument("--plot", default=None, help="adaptive: seyrek sonucun grafiği (.png)")
+    args = parser.parse_args(argv)
+
+    noise = RangeNoise(args.sigma, args.bias, args.proportional)
+    if args.method == "adaptive":
+        t = time.perf_counter()
+        result = adaptive_sweep(args.max_distance, noise, args.seed, args.budget, args.tolerance,
+                                method="analytic" if args.reps == 0 else "montecarlo",
+                                reps=max(args.reps, 1))
+        elapsed = time.perf_counter() - t
+        uniform = len(make_grid(args.max_distance, args.step_distance, args.step_rotation)[0]) * \
+            len(np.arange(0, 360, args.step_rotation)) ** 2
+        print(f"Değerlendirme: {result['evaluations']} nokta, {result['cells']} yaprak hücre, "
+              f"{result['rounds']} tur ({elapsed * 1000:.1f} ms; tekdüze ızgara {uniform} nokta)")
+        edges = np.append(np.arange(MIN_DISTANCE, args.max_distance, 1.0), args.max_distance + 1e-9)
+        mean = weighted_curve(result["distance"], result["error_deg"], result["weight"], edges)
+        points = np.bincount(np.clip(np.searchsorted(edges, result["distance"], side="right") - 1,
+                                     0, len(edges) - 2), minlength=len(edges) - 1)
+        print(f"Ağırlıklı Ortalama Hata: {np.average(result['error_deg'], weights=result['weight']):.2f}°")
+        print(f"\n{'mesafe':>11} {'nokta':>7} {'ortalama':>9}")
+        for lo, hi, n, m in zip(edges[:-1], edges[1:], points, mean):
+            print(f"{lo:>5.1f}-{hi:<5.1f} {n:>7} {m:>9.2f}")
+        if args.plot:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            from render import draw_sparse_errors
+            fig, ax = plt.subplots(figsize=(10, 6))
+            draw_sparse_errors(ax, result)
+            ax.set_xlabel("Forkliftler Arası Mesafe (m)")
+            ax.set_ylabel("Açısal Hata (°)")
+            ax.set_title("Uyarlamalı Tarama ile Açısal Hata Analizi")
+            ax.grid(True)
+            ax.legend(loc="upper right")
+            fig.savefig(args.plot, dpi=100)
+            plt.close(fig)
+            print(f"Grafik: {args.plot}")
+        return
+
+    if args.method == "analytic":
+        t = time.perf_counter()
+        curve = analytic_sweep(args.max_distance, args.step_distance, args.step_rotation,
+                               noise, args.tile_size)
+        elapsed = time.perf_counter() - t
+        print(f"Toplam Nokta: {curve['count']} (analitik, {elapsed * 1000:.1f} ms)")
+        print(f"Beklenen Hata: {curve['mean']:.2f}°")
+        print(f"Standart Sapma: {curve['std']:.2f}°")
+        print(f"\n{'mesafe':>7} {'beklenen':>9} {'std':>7}")
+        for d, m, sd in zip(curve["distance"], curve["curve_mean"], curve["curve_std"]):
+            print(f"{d:>7.2f} {m:>9.2f} {sd:>7.2f}")
+        return
+
+    t = time.perf_counter()
+    if args.out or args.no_cache:
+        summary, hit = run_sweep(args.out, args.max_distance, args.step_distance, args.step_rotation,
+                                 noise, args.seed, args.workers, args.tile_size), False
+    else:
+        summary, hit = cached_sweep(args.max_distance, args.step_distance, args.step_rotation,
+                                    noise, args.seed, args.workers, args.tile_size,
+                                    SweepCache(args.cache_dir))
+    elapsed = time.perf_counter() - t
+
+    print(f"Toplam Simülasyon: {summary['count']} ({summary['tiles']} karo, "
+          f"{'önbellekten' if hit else 'hesaplandı'}, {elapsed * 1000:.1f} ms)")
+    print(f"Ortalama Hata: {summary['mean']:.2f}°")
+    print(f"Standart Sapma: {summary['std']:.2f}°")
+    print(f"Maksimum Hata: {summary['max']:.2f}°")
+    table = summary["by_distance"].table()
+    if args.method == "compare":
+        # Monte Carlo mesafe başına ortalamayı analitik beklenen değerle doğrular
+        curve = analytic_sweep(args.max_distance, args.step_distance, args.step_rotation,
+                               noise, args.tile_size)
+        print(f"\n{'mesafe':>7} {'MC ort.':>8} {'analitik':>9} {'MC std':>7} {'analitik':>9}")
+        for k in np.flatnonzero(table["count"]):
+            print(f"{table['center'][k]:>7.2f} {table['mean'][k]:>8.2f} {curve['curve_mean'][k]:>9.2f} "
+                  f"{table['std'][k]:>7.2f} {curve['curve_std'][k]:>9.2f}")
+    else:
+        print(f"\n{'mesafe':>7} {'ortalama':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'maks':>7}")
+        for k in np.flatnonzero(table["count"]):
+            print(f"{table['center'][k]:>7.2f} {table['mean'][k]:>9.2f} {table['p50'][k]:>7.2f} "
+                  f"{table['p95'][k]:>7.2f} {table['p99'][k]:>7.2f} {table['max'][k]:>7.2f}")
+    if args.out:
+        print(f"Sonuçlar: {args.out}")
+
+if __name__ == "__main__":
+    main()
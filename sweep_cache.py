@@ -0,0 +1,187 @@
+"""Tarama özetleri için içerik adresli disk önbelleği.
+
+Anahtar; parametrelerin tamamı, seed ve hesaplamayı yapan modüllerin
+kaynak kodunun özetinden (sha256) türetilir. Aynı ayarlarla yeniden
+çalıştırmada mesafe başına birikimli sonuçlar diskten okunur ve simülasyon
+hiç yapılmaz; kod değişince anahtar da değişir. Girdiler `<anahtar>.npz`
+dosyalarıdır; toplam boyut sınırı aşılınca en uzun süredir kullanılmayan
+(mtime'ı en eski) girdiler silinir.
+
+    python sweep_cache.py                 # girdileri listele
+    python sweep_cache.py --clear
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import time
+
+import numpy as np
+
+from streaming import BinnedStats
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "FORKLIFT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "forkliftdata"))
+MAX_CACHE_BYTES = 256 << 20
+ENTRY_SUFFIX = ".npz"
+BINNED_SEPARATOR = "__"
+
+
+def code_version(*modules):
+    """Verilen modüllerin (ad ya da .py yolu) kaynak dosyalarının ortak sha256 özeti"""
+    digest = hashlib.sha256()
+    for module in modules:
+        path = module if module.endswith(".py") else importlib.util.find_spec(module).origin
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def cache_key(kind, params, code):
+    """Tarama türü, parametre sözlüğü ve kod özetinden önbellek anahtarı"""
+    text = json.dumps({"kind": kind, "params": params, "code": code}, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SweepCache:
+    """Anahtar -> dizi sözlüğü; boyut sınırlı, LRU tahliyeli"""
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+
+    def _entry(self, key):
+        return os.path.join(self.path, key + ENTRY_SUFFIX)
+
+    def entries(self):
+        """(yol, boyut, mtime) listesi, en eski kullanılandan yeniye"""
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(ENTRY_SUFFIX):
+                path = os.path.join(self.path, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, st.st_size, st.st_mtime_ns))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def get(self, key):
+        """Girdiyi dizi sözlüğü olarak döner; yoksa (ya da bozuksa) None"""
+        path = self._entry(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # LRU: son kullanım zamanı
+        except OSError:
+            pass
+        return arrays
+
+    def put(self, key, arrays):
+        """Girdiyi atomik olarak yazar ve gerekirse eski girdileri tahliye eder"""
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp = self._entry(key) + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as file:
+                np.savez_compressed(file, **arrays)
+            os.replace(tmp, self._entry(key))
+        except OSError:
+            return False  # salt okunur dizinde önbelleksiz devam et
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """Toplam boyut max_bytes'ın altına inene dek en eski girdileri siler"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self._entry(keep):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.remove(path)
+
+
+def pack_results(results):
+    """Sonuç sözlüğünü npz'ye yazılabilir dizilere çevirir; BinnedStats değerleri alanlarına açılır"""
+    arrays = {}
+    for name, value in results.items():
+        if isinstance(value, BinnedStats):
+            for field, array in value.state().items():
+                arrays[name + BINNED_SEPARATOR + field] = np.asarray(array)
+        else:
+            arrays[name] = np.asarray(value)
+    return arrays
+
+
+def unpack_results(arrays):
+    """pack_results'ın tersi; 0 boyutlu diziler Python sayısına döner"""
+    results = {}
+    binned = {}
+    for name, array in arrays.items():
+        if BINNED_SEPARATOR in name:
+            name, field = name.split(BINNED_SEPARATOR, 1)
+            binned.setdefault(name, {})[field] = array
+        else:
+            results[name] = array.item() if array.ndim == 0 else array
+    for name, state in binned.items():
+        results[name] = BinnedStats.from_state(state)
+    return results
+
+
+def cached(cache, key, compute, pack=pack_results, unpack=unpack_results):
+    """Önbellekte varsa unpack(diziler), yoksa compute() sonucunu pack ile yazıp döner.
+
+    cache None ise yalnızca compute() çalışır. İkinci değer isabet olup
+    olmadığını söyler.
+    """
+    if cache is not None:
+        arrays = cache.get(key)
+        if arrays is not None:
+            return unpack(arrays), True
+    value = compute()
+    if cache is not None:
+        cache.put(key, pack(value))
+    return value, False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tarama önbelleği girdileri")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--clear", action="store_true", help="tüm girdileri sil")
+    args = parser.parse_args(argv)
+
+    cache = SweepCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+        print(f"Önbellek temizlendi: {args.cache_dir}")
+        return
+    entries = cache.entries()
+    for path, size, mtime in reversed(entries):
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime / 1e9))
+        print(f"{os.path.basename(path)[:16]}  {size / 1024:>8.1f} KB  {used}")
+    total = sum(size for _, size, _ in entries)
+    print(f"{len(entries)} girdi, {total / (1 << 20):.1f} / {cache.max_bytes / (1 << 20):.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
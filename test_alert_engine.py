@@ -0,0 +1,75 @@
+"""mn_alert'in paketle gelen segment dosyalarında eski tan(açı) m/n formülüyle eşdeğerliği"""
+import math
+import os
+
+import numpy as np
+import pytest
+
+from alert_engine import ANGLE_THRESHOLD, DISTANCE_THRESHOLD, evaluate_alerts, mn_alert, segments_to_arrays
+from geometry import dot_det
+from segment_io import load_segments
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Dosya başına eski forkplot1.py döngüsünün verdiği toplam alarm sayısı
+SEGMENT_FILES = {
+    "segments_for_geogebra.txt": 2376,
+    "segments_for_geogebra_longrange.txt": 849,
+    "segments_for_geogebra_short.txt": 128,
+}
+
+
+# forkplot1.py'deki skaler sürümler
+
+def scalar_calculate_angle(p1, p2, p3):
+    v1 = (p1[0] - p2[0], p1[1] - p2[1])
+    v2 = (p3[0] - p2[0], p3[1] - p2[1])
+    dot = v1[0] * v2[0] + v1[1] * v2[1]
+    det = v1[0] * v2[1] - v1[1] * v2[0]
+    angle = math.atan2(det, dot)
+    return angle if angle >= 0 else angle + 2 * math.pi
+
+
+def scalar_distance(p, q):
+    return math.sqrt((p[0] - q[0])**2 + (p[1] - q[1])**2)
+
+
+def tan_alerts(seg1, seg2):
+    """Çift başına eski formül: (açı alarmı, açı veya uç nokta mesafesi alarmı) maskeleri"""
+    angle_alert = []
+    alert = []
+    for (A, B), (C, D) in zip(seg1.tolist(), seg2.tolist()):
+        ta = math.tan(scalar_calculate_angle(C, A, D))
+        tb = math.tan(scalar_calculate_angle(D, B, C))
+        tc = math.tan(scalar_calculate_angle(A, C, B))
+        td = math.tan(scalar_calculate_angle(B, D, A))
+        m = ta * tc * td
+        n = tb * tc * td
+        angle = abs(m) > ANGLE_THRESHOLD or abs(n) > ANGLE_THRESHOLD
+        near = any(scalar_distance(p1, p2) < DISTANCE_THRESHOLD for p1 in (A, B) for p2 in (C, D))
+        angle_alert.append(angle)
+        alert.append(angle or near)
+    return np.array(angle_alert, dtype=bool), np.array(alert, dtype=bool)
+
+
+@pytest.fixture(scope="module", params=sorted(SEGMENT_FILES))
+def pairs(request):
+    segments, _ = load_segments(os.path.join(HERE, request.param), use_cache=False)
+    seg1, seg2 = segments_to_arrays(segments)
+    return request.param, seg1, seg2, tan_alerts(seg1, seg2)
+
+
+def test_mn_alert_matches_tan_formula(pairs):
+    _, seg1, seg2, (expected, _) = pairs
+    A, B, C, D = seg1[:, 0], seg1[:, 1], seg2[:, 0], seg2[:, 1]
+    mask = mn_alert(*dot_det(C, A, D), *dot_det(D, B, C), *dot_det(A, C, B), *dot_det(B, D, A),
+                    ANGLE_THRESHOLD)
+    np.testing.assert_array_equal(mask, expected)
+
+
+def test_endpoint_alerts_match_tan_formula(pairs):
+    name, seg1, seg2, (expected_angle, expected) = pairs
+    results = evaluate_alerts(seg1, seg2, DISTANCE_THRESHOLD, ANGLE_THRESHOLD, distance_mode="endpoint")
+    np.testing.assert_array_equal(results["angle_alert"], expected_angle)
+    np.testing.assert_array_equal(results["alert"], expected)
+    assert int(expected.sum()) == SEGMENT_FILES[name]
@@ -0,0 +1,194 @@
+"""geometry.py çekirdeklerinin eski betiklerdeki skaler sürümlerle eşdeğerliği"""
+import math
+
+import numpy as np
+import pytest
+
+from geometry import (SEGMENT_WORK_SLOTS, WORK_SLOTS, angular_error, calculate_angle, distance,
+                      noisy_point, segment_distance)
+
+COUNT = 2000
+TOL = 1e-9
+
+
+# Eski betiklerdeki skaler sürümler (forkplot1..5)
+
+def scalar_calculate_angle(p1, p2, p3):
+    v1 = (p1[0] - p2[0], p1[1] - p2[1])
+    v2 = (p3[0] - p2[0], p3[1] - p2[1])
+    dot = v1[0] * v2[0] + v1[1] * v2[1]
+    det = v1[0] * v2[1] - v1[1] * v2[0]
+    angle = math.atan2(det, dot)
+    return angle if angle >= 0 else angle + 2 * math.pi
+
+
+def scalar_distance_sqrt(p, q):
+    # forkplot1.py
+    return math.sqrt((p[0] - q[0])**2 + (p[1] - q[1])**2)
+
+
+def scalar_distance(p, q):
+    # forkplot2.py .. forkplot4.py
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+
+def scalar_noisy_point(p1, p2, target_distance):
+    # forkplot2.py, forkplot3.py: birim yön vektörü
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    norm = math.hypot(dx, dy)
+    if norm == 0:
+        return p1
+    dx /= norm
+    dy /= norm
+    return (p1[0] + dx * target_distance, p1[1] + dy * target_distance)
+
+
+def scalar_calculate_noisy_point(start_point, end_point, noisy_distance):
+    # forkplot4.py, forkplot5.py: oran
+    dx = end_point[0] - start_point[0]
+    dy = end_point[1] - start_point[1]
+    real_distance = math.hypot(dx, dy)
+    if real_distance == 0:
+        return start_point
+    ratio = noisy_distance / real_distance
+    return (start_point[0] + dx * ratio, start_point[1] + dy * ratio)
+
+
+def scalar_angular_error(true_angle, noisy_angle):
+    error = abs(true_angle - noisy_angle)
+    return min(error, 2 * math.pi - error)
+
+
+def scalar_segment_distance(a, b, c, d):
+    def cross(o, p, q):
+        return (p[0] - o[0]) * (q[1] - o[1]) - (p[1] - o[1]) * (q[0] - o[0])
+
+    def point_segment(p, s, e):
+        ux, uy = e[0] - s[0], e[1] - s[1]
+        length2 = ux * ux + uy * uy
+        t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((p[0] - s[0]) * ux + (p[1] - s[1]) * uy) / length2))
+        return math.hypot(p[0] - s[0] - t * ux, p[1] - s[1] - t * uy)
+
+    if cross(a, b, c) * cross(a, b, d) < 0 and cross(c, d, a) * cross(c, d, b) < 0:
+        return 0.0
+    return min(point_segment(a, c, d), point_segment(b, c, d),
+               point_segment(c, a, b), point_segment(d, a, b))
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Rastgele noktalar; çakışan noktalar ve sıfır mesafeler (dejenere durumlar) dahil"""
+    rng = np.random.default_rng(0)
+    p1, p2, p3 = np.round(rng.uniform(-15, 15, size=(3, COUNT, 2)), 2)
+    p3[::50] = p2[::50]
+    p1[::70] = p2[::70]
+    # Yarısı p3'e yakın (kesişen ya da yakın segmentler)
+    p4 = np.round(p3 + rng.uniform(-3, 3, size=(COUNT, 2)) * (rng.random((COUNT, 1)) < 0.5)
+                  + rng.uniform(-15, 15, size=(COUNT, 2)) * (rng.random((COUNT, 1)) < 0.5), 2)
+    p4[::40] = p3[::40]
+    p4[::90] = p1[::90]
+    target = rng.uniform(0, 30, size=COUNT)
+    a1, a2 = rng.uniform(0, 2 * np.pi, size=(2, COUNT))
+    tuples = [tuple(map(tuple, rows)) for rows in zip(p1.tolist(), p2.tolist(), p3.tolist(), p4.tolist())]
+    return {"p1": p1, "p2": p2, "p3": p3, "p4": p4, "target": target, "a1": a1, "a2": a2,
+            "tuples": tuples}
+
+
+def _reference(func, *columns):
+    return np.array([func(*args) for args in zip(*columns)], dtype=float)
+
+
+def test_calculate_angle(data):
+    a, b, c = data["p1"], data["p2"], data["p3"]
+    ref = _reference(scalar_calculate_angle, *zip(*[t[:3] for t in data["tuples"]]))
+    np.testing.assert_allclose(calculate_angle(a, b, c), ref, rtol=0, atol=TOL)
+
+    out = np.empty(COUNT)
+    result = calculate_angle(a, b, c, out=out, work=np.empty((WORK_SLOTS, COUNT)))
+    assert result is out
+    np.testing.assert_allclose(out, ref, rtol=0, atol=TOL)
+
+
+@pytest.mark.parametrize("scalar", [scalar_distance, scalar_distance_sqrt])
+def test_distance(data, scalar):
+    ref = _reference(scalar, *zip(*[t[:2] for t in data["tuples"]]))
+    np.testing.assert_allclose(distance(data["p1"], data["p2"]), ref, rtol=0, atol=TOL)
+
+    out = np.empty(COUNT)
+    result = distance(data["p1"], data["p2"], out=out, work=np.empty((WORK_SLOTS, COUNT)))
+    assert result is out
+    np.testing.assert_allclose(out, ref, rtol=0, atol=TOL)
+
+
+@pytest.mark.parametrize("scalar", [scalar_noisy_point, scalar_calculate_noisy_point])
+def test_noisy_point(data, scalar):
+    starts = [t[1] for t in data["tuples"]]
+    ends = [t[2] for t in data["tuples"]]
+    ref = _reference(scalar, starts, ends, data["target"].tolist())
+    np.testing.assert_allclose(noisy_point(data["p2"], data["p3"], data["target"]), ref, rtol=0, atol=TOL)
+
+    out = np.empty((COUNT, 2))
+    result = noisy_point(data["p2"], data["p3"], data["target"], out=out,
+                         work=np.empty((WORK_SLOTS, COUNT)))
+    assert result is out
+    np.testing.assert_allclose(out, ref, rtol=0, atol=TOL)
+
+
+def test_angular_error(data):
+    ref = _reference(scalar_angular_error, data["a1"].tolist(), data["a2"].tolist())
+    np.testing.assert_allclose(angular_error(data["a1"], data["a2"]), ref, rtol=0, atol=TOL)
+
+    out = np.empty(COUNT)
+    result = angular_error(data["a1"], data["a2"], out=out, work=np.empty((WORK_SLOTS, COUNT)))
+    assert result is out
+    np.testing.assert_allclose(out, ref, rtol=0, atol=TOL)
+
+
+def test_segment_distance(data):
+    ref = _reference(scalar_segment_distance, *zip(*data["tuples"]))
+    np.testing.assert_allclose(segment_distance(data["p1"], data["p2"], data["p3"], data["p4"]), ref,
+                               rtol=0, atol=TOL)
+
+    out = np.empty(COUNT)
+    result = segment_distance(data["p1"], data["p2"], data["p3"], data["p4"], out=out,
+                              work=np.empty((SEGMENT_WORK_SLOTS, COUNT)))
+    assert result is out
+    np.testing.assert_allclose(out, ref, rtol=0, atol=TOL)
+
+
+def test_tuple_inputs(data):
+    """Demet girdide sonuçlar eski betiklerdeki gibi skalerdir"""
+    for (a, b, c, d), t, e1, e2 in zip(data["tuples"][:200], data["target"].tolist(),
+                                       data["a1"].tolist(), data["a2"].tolist()):
+        angle = calculate_angle(a, b, c)
+        assert np.ndim(angle) == 0
+        assert angle == pytest.approx(scalar_calculate_angle(a, b, c), abs=TOL)
+        assert distance(a, b) == pytest.approx(scalar_distance(a, b), abs=TOL)
+        assert angular_error(e1, e2) == pytest.approx(scalar_angular_error(e1, e2), abs=TOL)
+        assert segment_distance(a, b, c, d) == pytest.approx(scalar_segment_distance(a, b, c, d), abs=TOL)
+        np.testing.assert_allclose(noisy_point(b, c, t), scalar_noisy_point(b, c, t), rtol=0, atol=TOL)
+
+
+def test_tuple_inputs_with_buffers():
+    """Demet girdide out= 0 boyutlu tampona yazılır ve o tampon döner"""
+    work = np.empty((WORK_SLOTS,))
+    out = np.empty(())
+    assert calculate_angle((1.0, 0.0), (0.0, 0.0), (0.0, 1.0), out=out, work=work) is out
+    assert float(out) == pytest.approx(math.pi / 2)
+    assert distance((0.0, 0.0), (3.0, 4.0), out=out, work=work) is out
+    assert float(out) == pytest.approx(5.0)
+    point = np.empty(2)
+    assert noisy_point((0.0, 0.0), (3.0, 4.0), 10.0, out=point, work=work) is point
+    np.testing.assert_allclose(point, (6.0, 8.0))
+    # Çakışan noktalarda başlangıç noktası döner
+    np.testing.assert_allclose(noisy_point((1.0, 2.0), (1.0, 2.0), 3.0), (1.0, 2.0))
+
+
+def test_buffers_are_reused(data):
+    """Aynı out/work tamponlarıyla ikinci çağrı aynı sonucu verir (eski değerler sızmaz)"""
+    work = np.empty((WORK_SLOTS, COUNT))
+    out = np.empty(COUNT)
+    first = calculate_angle(data["p1"], data["p2"], data["p3"], out=out, work=work).copy()
+    distance(data["p1"], data["p3"], out=out, work=work)
+    np.testing.assert_array_equal(calculate_angle(data["p1"], data["p2"], data["p3"], out=out, work=work),
+                                  first)
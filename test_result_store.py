@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from alert_engine import evaluate_alerts
+from result_store import STEP_COLUMNS, ResultStore, ResultWriter, step_columns
+from scenario import iter_pairs
+
+
+def _results(count, seed=0):
+    seg1, seg2 = next(iter_pairs(count, seed, count))
+    return evaluate_alerts(seg1, seg2)
+
+
+def test_explicit_schema_write_and_read(tmp_path):
+    schema = {name: dtype for name, dtype in STEP_COLUMNS.items() if not name.startswith("err_")}
+    results = _results(50)
+    with ResultWriter(tmp_path / "store", schema=schema) as writer:
+        writer.append_results(results)
+        writer.append_results(results)
+
+    store = ResultStore(tmp_path / "store")
+    assert store.rows == 100
+    assert store.schema == schema
+    np.testing.assert_array_equal(store.column("step"), np.arange(100))
+    np.testing.assert_array_equal(store.column("m")[50:], results["m"])
+
+
+def test_explicit_schema_without_rows(tmp_path):
+    ResultWriter(tmp_path / "store", schema={"step": "<i8"}).close()
+    store = ResultStore(tmp_path / "store")
+    assert store.rows == 0
+    assert len(store.column("step")) == 0
+
+
+def test_explicit_schema_rejects_other_columns(tmp_path):
+    writer = ResultWriter(tmp_path / "store", schema={"step": "<i8", "m": "<f8"})
+    with pytest.raises(ValueError):
+        writer.append({"step": np.arange(3)})
+    writer.close()
+
+
+def test_append_mode_continues_steps(tmp_path):
+    results = _results(20)
+    with ResultWriter(tmp_path / "store", mode="a") as writer:
+        writer.append(step_columns(results))
+    with ResultWriter(tmp_path / "store", mode="a") as writer:
+        writer.append_results(results)
+    np.testing.assert_array_equal(ResultStore(tmp_path / "store").column("step"), np.arange(40))
@@ -0,0 +1,121 @@
+"""Kareler arasında forklift durumunu koruyan artımlı alarm izleyicisi.
+
+Her forklift için son poz, hız ve son yeniden kurulumdan beri kat edilen yol
+tutulur. Aday çift listesi fleet.candidate_pairs ile screen_range + 2·margin
+menziliyle kurulur (Verlet listesi). Bir segmentin herhangi bir noktası en
+fazla uç noktalarının yer değiştirmesi kadar hareket ettiğinden, listede
+olmayan bir çiftin aralığı, her iki forklift de margin'den az yol aldığı
+sürece screen_range'in altına inemez; bu karelerde yalnızca listedeki
+çiftler yeniden hesaplanır. İki ucu da kıpırdamamış çiftlerin (ör. park
+halindeki forkliftler) önceki sonucu olduğu gibi kullanılır. Alarmlar kare başına maske olarak değil,
+başlama/bitiş olayları olarak döner.
+"""
+import numpy as np
+
+from alert_engine import DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, evaluate_alerts
+from fleet import SCREEN_RANGE, bounding_boxes, box_gap, candidate_pairs
+
+MARGIN = 2.0  # aday listesinin yeniden kurulmadan önce izin verilen hareket (m)
+
+
+class Tracker:
+    """Canlı akış için durumlu alarm izleyicisi.
+
+    update() her karede {forklift_id: ((x1, y1), (x2, y2))} eşlemesini ya da
+    (ids, (F,2,2) segmentler) ikilisini alır ve [{"type": "onset" | "clear", "pair": (id1, id2), "time": t}] döner.
+    Çiftlerde küçük kimlik forklift 1 (A-B) rolündedir.
+    """
+
+    def __init__(self, screen_range=SCREEN_RANGE, distance_threshold=DISTANCE_THRESHOLD,
+                 angle_threshold=ANGLE_THRESHOLD, margin=MARGIN, distance_mode=DISTANCE_MODE):
+        self.screen_range = screen_range
+        self.distance_threshold = distance_threshold
+        self.angle_threshold = angle_threshold
+        self.distance_mode = distance_mode
+        self.margin = margin
+        self.ids = np.empty(0)
+        self.pose = np.zeros((0, 2, 2))
+        self.velocity = np.zeros((0, 2))
+        self.last_time = np.zeros(0)
+        self.travel = np.zeros(0)
+        self.pairs = np.empty((0, 2), dtype=np.int64)
+        self.pair_alert = np.zeros(0, dtype=bool)
+        self.pair_valid = np.zeros(0, dtype=bool)
+        self.active = set()
+        self.frames = 0
+        self.rebuilds = 0
+        self.evaluated = 0
+
+    def _rebuild(self, ids, segments):
+        self.ids = ids
+        self.travel = np.zeros(len(ids))
+        self.pairs = candidate_pairs(segments, self.screen_range + 2 * self.margin)
+        self.pair_alert = np.zeros(len(self.pairs), dtype=bool)
+        self.pair_valid = np.zeros(len(self.pairs), dtype=bool)
+        self.rebuilds += 1
+
+    def update(self, frame, timestamp=None):
+        """Bir kareyi işler ve alarm başlama/bitiş olaylarını döner"""
+        timestamp = float(self.frames if timestamp is None else timestamp)
+        self.frames += 1
+        if isinstance(frame, dict):
+            ids = np.asarray(sorted(frame))
+            segments = np.asarray([frame[fid] for fid in ids.tolist()], dtype=float).reshape(-1, 2, 2)
+        else:
+            ids = np.asarray(frame[0])
+            segments = np.asarray(frame[1], dtype=float)
+            if len(ids) > 1 and not (ids[:-1] <= ids[1:]).all():
+                order = np.argsort(ids, kind="stable")
+                ids, segments = ids[order], segments[order]
+
+        # Poz, hız ve kat edilen yol
+        moved = np.ones(len(ids), dtype=bool)
+        if np.array_equal(ids, self.ids):
+            delta = segments - self.pose
+            step = np.hypot(delta[..., 0], delta[..., 1]).max(axis=1)
+            moved = step > 0
+            self.travel += step
+            dt = timestamp - self.last_time
+            self.velocity = delta.mean(axis=1) / np.where(dt > 0, dt, np.inf)[:, None]
+            if self.travel.max(initial=0.0) > self.margin:
+                self._rebuild(ids, segments)
+        else:
+            # Küme değişti: bilinen forkliftlerin hızını koru, listeyi yeniden kur
+            velocity = np.zeros((len(ids), 2))
+            _, new_k, old_k = np.intersect1d(ids, self.ids, assume_unique=True, return_indices=True)
+            velocity[new_k] = self.velocity[old_k]
+            self.velocity = velocity
+            self._rebuild(ids, segments)
+        self.pose = segments
+        self.last_time = np.full(len(ids), timestamp)
+
+        # Yalnızca aday listesindeki ve en az bir ucu hareket etmiş çiftler
+        i, j = self.pairs[:, 0], self.pairs[:, 1]
+        dirty = ~self.pair_valid | moved[i] | moved[j]
+        i, j = i[dirty], j[dirty]
+        lo, hi = bounding_boxes(segments)
+        near = box_gap(lo[i], hi[i], lo[j], hi[j]) <= self.screen_range
+        alert = np.zeros(len(i), dtype=bool)
+        self.evaluated += int(near.sum())
+        if near.any():
+            results = evaluate_alerts(segments[i[near]], segments[j[near]],
+                                      self.distance_threshold, self.angle_threshold,
+                                      details=False, distance_mode=self.distance_mode)
+            alert[near] = results["alert"]
+        self.pair_alert[dirty] = alert
+        self.pair_valid[:] = True
+
+        i, j = self.pairs[self.pair_alert].T
+        current = set(zip(ids[i].tolist(), ids[j].tolist()))
+
+        events = [{"type": "onset", "pair": pair, "time": timestamp}
+                  for pair in sorted(current - self.active)]
+        events += [{"type": "clear", "pair": pair, "time": timestamp}
+                   for pair in sorted(self.active - current)]
+        self.active = current
+        return events
+
+    def state(self, fid):
+        """Bir forkliftin son pozu ve merkez hızı"""
+        k = int(np.flatnonzero(self.ids == fid)[0])
+        return self.pose[k].copy(), self.velocity[k].copy()
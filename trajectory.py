@@ -0,0 +1,479 @@
+"""Depo ızgarasında hareket eden filo için zaman serisi simülatörü ve alarm izleme.
+
+geogebra.c ve forkplot4.py birbirinden bağımsız anlık yerleşimler üretir;
+alarm gecikmesi ve titremesi (flicker) bunlarla ölçülemez. Burada her
+forklift koridor ızgarasının düğümleri arasında rastgele ara noktalarla
+dolaşır: hız, ivme ve dönüş hızı sınırlıdır, dönüş öncesi yavaşlar ve
+bazı düğümlerde bir süre bekler (WaypointFleet). Kareler sabit hızda
+(rate Hz) zaman damgalı (T, F, 2, 2) bloklar halinde üretilir (simulate).
+
+ShiftMonitor her bloğu tek seferde değerlendirir: sınır kutusu aralığı
+screen_range'den küçük çiftler (fleet.screen_fleet ile aynı aday tanımı)
+tek bir evaluate_alerts çağrısından geçer. Her aday için segmentler arası
+kesin mesafe ve sabit hız varsayımıyla çarpışmaya kalan süre (TTC,
+time_to_collision) hesaplanır. Alarm başlama/bitişlerinden bölüm süreleri,
+kısa bölümler ve hızlı yeniden başlamalar (titreme); segment mesafesinin
+collision_distance'ın altına indiği temaslardan ise alarmın temasa göre ne
+kadar önce (ya da geç) geldiği çıkarılır.
+
+    python trajectory.py                                  # 100 forklift, 10 Hz, 8 saatlik vardiya
+    python trajectory.py --forklifts 20 --hours 0.5 --out shift.json
+    python trajectory.py --hours 0.1 --store frames/      # kareler result_store deposuna
+"""
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+import instrument
+from alert_engine import (DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, DISTANCE_MODES,
+                          evaluate_alerts, segment_distances)
+from fleet import SCREEN_RANGE, FORKLIFT_LENGTH, bounding_boxes, box_gap
+from result_store import ResultWriter
+from roc import COLLISION_DISTANCE
+from tuning import jsonable
+
+FORKLIFTS = 100
+RATE = 10.0  # Hz
+HOURS = 8.0  # bir vardiya
+BLOCK_SECONDS = 60.0  # tek seferde üretilip değerlendirilen süre
+GRID_SHAPE = (21, 11)  # koridor düğümleri; 10 m aralıkla 200 x 100 m depo
+AISLE_SPACING = 10.0  # m
+MAX_SPEED = 2.5  # m/s
+TURN_SPEED = 1.0  # m/s; köşeye bu hızın üstünde girilmez
+MAX_ACCEL = 1.0  # m/s²
+TURN_RATE = 90.0  # °/s
+ARRIVE_RADIUS = 0.5  # m
+DWELL_PROBABILITY = 0.2  # düğümde bekleme olasılığı
+DWELL_TIME = (5.0, 30.0)  # s
+FLICKER_TIME = 1.0  # s; bundan kısa bölümler ve aralıklar titreme sayılır
+SCREEN_FRAMES = 10  # aday taramasında kaba süzgecin dilim boyu (kare)
+
+_MOVES = np.array([[1, 0], [-1, 0], [0, 1], [0, -1]])
+# Aynı karedeki olayların işlenme sırası: önce bitişler, alarm temastan önce
+_ALERT_CLEAR, _CONTACT_CLEAR, _ALERT_ONSET, _CONTACT_ONSET = range(4)
+
+
+class WaypointFleet:
+    """Koridor ızgarasında rastgele ara noktalar arasında dolaşan forkliftler.
+
+    Her forklift bir sonraki düğüme yönelir; geri dönüş dışındaki komşular
+    arasından rastgele seçim yapılır. Yön en fazla turn_rate ile döner,
+    hız yön hatasının kosinüsüyle ve sıradaki köşenin (düz devam, dönüş ya da
+    bekleme) izin verdiği fren mesafesiyle sınırlanır; ivme max_accel'dir.
+    Tüm forkliftler her adımda birlikte ilerler.
+    """
+
+    def __init__(self, count, rng, grid_shape=GRID_SHAPE, spacing=AISLE_SPACING,
+                 length=FORKLIFT_LENGTH, max_speed=MAX_SPEED, turn_speed=TURN_SPEED,
+                 max_accel=MAX_ACCEL, turn_rate=TURN_RATE, dwell_probability=DWELL_PROBABILITY,
+                 dwell_time=DWELL_TIME):
+        self.rng = rng
+        self.grid_shape = np.asarray(grid_shape)
+        self.spacing = float(spacing)
+        self.length = float(length)
+        self.max_speed = float(max_speed)
+        self.turn_speed = float(turn_speed)
+        self.max_accel = float(max_accel)
+        self.turn_rate = math.radians(turn_rate)
+        self.dwell_probability = float(dwell_probability)
+        self.dwell_time = dwell_time
+
+        nodes = int(np.prod(grid_shape))
+        start = rng.choice(nodes, count, replace=count > nodes)
+        self.previous = np.stack(np.unravel_index(start, tuple(grid_shape)), axis=-1)
+        self.target = self._next_node(self.previous, self.previous)
+        self.after = self._next_node(self.target, self.previous)
+        self.stop_at_target = np.zeros(count, dtype=bool)
+        self.position = self.previous * self.spacing
+        delta = self.target - self.previous
+        self.heading = np.arctan2(delta[:, 1], delta[:, 0]).astype(float)
+        self.direction = np.stack([np.cos(self.heading), np.sin(self.heading)], axis=-1)
+        self.speed = np.zeros(count)
+        self.dwell = np.zeros(count)
+        self.corner_speed = np.zeros(count)
+        self._corner_speed(np.arange(count))
+
+    def _next_node(self, node, previous):
+        """node'un ızgara içindeki, previous olmayan rastgele bir komşusu"""
+        moves = node[:, None, :] + _MOVES
+        valid = ((moves >= 0) & (moves < self.grid_shape)).all(axis=-1)
+        valid &= (moves != previous[:, None, :]).any(axis=-1)
+        choice = np.argmax(np.where(valid, self.rng.random(valid.shape), -1.0), axis=1)
+        return moves[np.arange(len(node)), choice]
+
+    def _corner_speed(self, k):
+        """k forkliftlerinin hedef düğümden geçiş hızı: düz devam, dönüş ya da bekleme"""
+        straight = ((self.after[k] - self.target[k]) == (self.target[k] - self.previous[k])).all(axis=-1)
+        speed = np.where(straight, self.max_speed, self.turn_speed)
+        self.corner_speed[k] = np.where(self.stop_at_target[k], 0.0, speed)
+
+    def step(self, dt):
+        """Tüm forkliftleri dt saniye ilerletir"""
+        delta = self.target * self.spacing - self.position
+        remaining = np.hypot(delta[:, 0], delta[:, 1])
+        error = np.mod(np.arctan2(delta[:, 1], delta[:, 0]) - self.heading + np.pi, 2 * np.pi) - np.pi
+        turn = np.clip(error, -self.turn_rate * dt, self.turn_rate * dt)
+        self.heading += turn
+        self.direction = np.stack([np.cos(self.heading), np.sin(self.heading)], axis=-1)
+
+        # Köşeye izin verilen hızla girebilmek için fren mesafesi sınırı
+        desired = np.minimum(self.max_speed, np.sqrt(self.corner_speed ** 2 + 2 * self.max_accel * remaining))
+        desired *= np.maximum(np.cos(error - turn), 0.0)
+        desired[self.dwell > 0] = 0.0
+        self.speed += np.clip(desired - self.speed, -self.max_accel * dt, self.max_accel * dt)
+        self.position += (self.speed * dt)[:, None] * self.direction
+        self.dwell = np.maximum(self.dwell - dt, 0.0)
+
+        delta = self.target * self.spacing - self.position
+        arrived = np.flatnonzero(np.hypot(delta[:, 0], delta[:, 1]) <= ARRIVE_RADIUS)
+        if len(arrived):
+            stop = arrived[self.stop_at_target[arrived]]
+            self.dwell[stop] = self.rng.uniform(*self.dwell_time, size=len(stop))
+            self.previous[arrived] = self.target[arrived]
+            self.target[arrived] = self.after[arrived]
+            self.after[arrived] = self._next_node(self.target[arrived], self.previous[arrived])
+            self.stop_at_target[arrived] = self.rng.random(len(arrived)) < self.dwell_probability
+            self._corner_speed(arrived)
+
+    def segments(self):
+        """(F, 2, 2) segmentler: ön uç, arka uç (fleet.random_fleet ile aynı sıra)"""
+        half = self.direction * (self.length / 2)
+        return np.stack([self.position + half, self.position - half], axis=1)
+
+    def velocity(self):
+        """(F, 2) merkez hızları"""
+        return self.speed[:, None] * self.direction
+
+
+def simulate(fleet, duration, rate=RATE, block_seconds=BLOCK_SECONDS):
+    """(zamanlar (T,), segmentler (T, F, 2, 2), hızlar (T, F, 2)) blokları üretir.
+
+    İlk kare t = 0'daki başlangıç durumudur; kareler 1/rate aralıklıdır.
+    Blok boyu yalnızca bellek ve toplu değerlendirme içindir, hareketi
+    etkilemez.
+    """
+    frames = int(round(duration * rate))
+    block = max(1, int(round(block_seconds * rate)))
+    dt = 1.0 / rate
+    count = len(fleet.speed)
+    for start in range(0, frames, block):
+        size = min(block, frames - start)
+        segments = np.empty((size, count, 2, 2))
+        velocity = np.empty((size, count, 2))
+        with instrument.timer("simulate"):
+            for k in range(size):
+                if start + k:
+                    fleet.step(dt)
+                segments[k] = fleet.segments()
+                velocity[k] = fleet.velocity()
+        instrument.count("frames", size)
+        yield np.arange(start, start + size) * dt, segments, velocity
+
+
+def _ray_segment_ttc(direction, a, b, radius):
+    """Orijinden direction hızıyla çıkan noktanın [a, b]'ye radius kadar yaklaştığı ilk t >= 0"""
+    best = np.full(a.shape[:-1], np.inf)
+    uu = (direction * direction).sum(axis=-1)
+    moving = uu > 0
+    safe_uu = np.where(moving, uu, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Uç çemberleri: |u·t - p|² = radius²
+        for p in (a, b):
+            up = (direction * p).sum(axis=-1)
+            disc = up * up - uu * ((p * p).sum(axis=-1) - radius * radius)
+            t = (up - np.sqrt(disc)) / safe_uu
+            best = np.where(moving & (disc >= 0) & (t >= 0), np.minimum(best, t), best)
+        # Kenarın iki yanındaki şeritler: normal yönde ±radius, izdüşüm kenar içinde
+        edge = b - a
+        length = np.hypot(edge[..., 0], edge[..., 1])
+        unit = edge / np.where(length > 0, length, 1.0)[..., None]
+        normal = np.stack([-unit[..., 1], unit[..., 0]], axis=-1)
+        un = (direction * normal).sum(axis=-1)
+        an = (a * normal).sum(axis=-1)
+        for side in (-radius, radius):
+            t = (side + an) / un
+            along = t * (direction * unit).sum(axis=-1) - (a * unit).sum(axis=-1)
+            hit = (un != 0) & (length > 0) & (t >= 0) & (along >= 0) & (along <= length)
+            best = np.where(hit, np.minimum(best, t), best)
+    return best
+
+
+def time_to_collision(seg1, seg2, relative_velocity, radius=COLLISION_DISTANCE):
+    """Sabit hızla ötelenen segmentlerin aralığının radius'a ineceği süre (s); hiç inmiyorsa inf.
+
+    relative_velocity ikinci segmentin birinciye göre hızıdır (v2 - v1).
+    AB ile CD + w·t arasındaki mesafe, -w·t noktasının CD ⊖ AB
+    paralelkenarına uzaklığıdır; nokta bu kümenin radius kadar genişletilmiş
+    hâline (dört kenar kapsülünün birleşimi) ilk girdiği an TTC'dir. Zaten
+    radius'tan yakın çiftlerde 0 döner. Yönler sabit sayılır.
+    """
+    seg1 = np.asarray(seg1, dtype=float)
+    seg2 = np.asarray(seg2, dtype=float)
+    A, B = seg1[:, 0], seg1[:, 1]
+    C, D = seg2[:, 0], seg2[:, 1]
+    corners = np.stack([C - A, D - A, D - B, C - B], axis=1)
+    direction = -np.asarray(relative_velocity, dtype=float)[:, None, :]
+    ttc = _ray_segment_ttc(direction, corners, np.roll(corners, -1, axis=1), radius).min(axis=1)
+    return np.where(segment_distances(seg1, seg2) <= radius, 0.0, ttc)
+
+
+class ShiftMonitor:
+    """simulate() bloklarını değerlendirip vardiya boyunca alarm ve temas olaylarını izler.
+
+    Çiftler (i, j), i < j sabit sırayla tüm filoyu kapsar; her blokta
+    yalnızca aday çiftler hesaplanır, kareler arası durum (etkin alarmlar,
+    bekleyen temaslar) bloklar arasında korunur.
+    """
+
+    def __init__(self, count, screen_range=SCREEN_RANGE, distance_threshold=DISTANCE_THRESHOLD,
+                 angle_threshold=ANGLE_THRESHOLD, distance_mode=DISTANCE_MODE,
+                 collision_distance=COLLISION_DISTANCE, flicker_time=FLICKER_TIME, rate=RATE):
+        self.rate = rate
+        self.screen_range = screen_range
+        self.distance_threshold = distance_threshold
+        self.angle_threshold = angle_threshold
+        self.distance_mode = distance_mode
+        self.collision_distance = collision_distance
+        self.flicker_time = flicker_time
+        self.pairs = np.stack(np.triu_indices(count, 1), axis=-1)
+        self.alert_active = np.zeros(len(self.pairs), dtype=bool)
+        self.contact_active = np.zeros(len(self.pairs), dtype=bool)
+        self.alert_start = {}
+        self.last_clear = {}
+        self.pending_contact = {}
+        self.frames = 0
+        self.candidates = 0
+        self.alert_frames = 0
+        self.episodes = []  # kapanmış alarm bölümlerinin süreleri
+        self.rechatter = 0
+        self.onset_ttc = []
+        self.contacts = 0
+        self.lead_times = []  # temas - alarm başlangıcı; negatifse alarm temastan sonra geldi
+        self.missed = 0
+
+    def _candidates(self, segments):
+        """Kutu aralığı <= screen_range olan (kare, çift) indeksleri"""
+        i, j = self.pairs.T
+        centers = segments.mean(axis=2)
+        half = np.hypot(*(segments[:, :, 0] - segments[:, :, 1]).T).max(initial=0.0) / 2
+        # Kutu aralığı screen_range'i aşmıyorsa merkezler her eksende reach'ten yakındır
+        reach = self.screen_range + 2 * half
+        # Kaba süzgeç: SCREEN_FRAMES karelik dilimlerde merkezlerin kapsadığı kutular
+        starts = np.arange(0, len(segments), SCREEN_FRAMES)
+        lo = np.ascontiguousarray(np.minimum.reduceat(centers, starts, axis=0).transpose(1, 0, 2))
+        hi = np.ascontiguousarray(np.maximum.reduceat(centers, starts, axis=0).transpose(1, 0, 2))
+        gap = np.maximum(lo[i] - hi[j], lo[j] - hi[i])
+        pair, block = np.nonzero((gap[..., 0] <= reach) & (gap[..., 1] <= reach))
+        frame = (starts[block, None] + np.arange(SCREEN_FRAMES)).ravel()
+        pair = np.repeat(pair, SCREEN_FRAMES)
+        inside = frame < len(segments)
+        frame, pair = frame[inside], pair[inside]
+
+        delta = np.abs(centers[frame, i[pair]] - centers[frame, j[pair]])
+        near = (delta[:, 0] <= reach) & (delta[:, 1] <= reach)
+        frame, pair = frame[near], pair[near]
+        lo, hi = bounding_boxes(segments.reshape(-1, 2, 2))
+        lo, hi = lo.reshape(segments.shape[:2] + (2,)), hi.reshape(segments.shape[:2] + (2,))
+        first, second = (frame, i[pair]), (frame, j[pair])
+        keep = box_gap(lo[first], hi[first], lo[second], hi[second]) <= self.screen_range
+        return frame[keep], pair[keep]
+
+    def update(self, times, segments, velocity):
+        """Bir bloğun karelerini işler"""
+        size, count = len(times), len(self.pairs)
+        with instrument.timer("screen"):
+            frame, pair = self._candidates(segments)
+        seg1 = segments[frame, self.pairs[pair, 0]]
+        seg2 = segments[frame, self.pairs[pair, 1]]
+        alert = evaluate_alerts(seg1, seg2, self.distance_threshold, self.angle_threshold,
+                                details=False, distance_mode=self.distance_mode)["alert"]
+        with instrument.timer("ttc"):
+            contact = segment_distances(seg1, seg2) < self.collision_distance
+            relative = velocity[frame, self.pairs[pair, 1]] - velocity[frame, self.pairs[pair, 0]]
+            ttc = time_to_collision(seg1, seg2, relative, self.collision_distance)
+
+        alerts = np.zeros((size, count), dtype=bool)
+        alerts[frame, pair] = alert
+        contacts = np.zeros((size, count), dtype=bool)
+        contacts[frame, pair] = contact
+        ttc_at = dict(zip(zip(frame[alert].tolist(), pair[alert].tolist()), ttc[alert].tolist()))
+        self.frames += size
+        self.candidates += len(pair)
+        self.alert_frames += int(np.count_nonzero(alert))
+
+        # Olaylar seyrektir: yalnızca başlama/bitiş anları sırayla işlenir
+        events = []
+        for kind, state, active in ((_ALERT_ONSET, alerts, self.alert_active),
+                                    (_CONTACT_ONSET, contacts, self.contact_active)):
+            before = np.concatenate([active[None], state[:-1]])
+            on_frame, on_pair = np.nonzero(state & ~before)
+            off_frame, off_pair = np.nonzero(~state & before)
+            events.append((on_frame, on_pair, np.full(len(on_frame), kind)))
+            events.append((off_frame, off_pair, np.full(len(off_frame), kind - 2)))
+            active[:] = state[-1]
+        event_frame, event_pair, event_kind = (np.concatenate(parts) for parts in zip(*events))
+        order = np.lexsort((event_kind, event_frame))
+        for k, p, kind in zip(event_frame[order].tolist(), event_pair[order].tolist(),
+                              event_kind[order].tolist()):
+            now = float(times[k])
+            if kind == _ALERT_ONSET:
+                if now - self.last_clear.get(p, -math.inf) < self.flicker_time:
+                    self.rechatter += 1
+                self.alert_start[p] = now
+                self.onset_ttc.append(ttc_at[k, p])
+                if p in self.pending_contact:
+                    self.lead_times.append(self.pending_contact.pop(p) - now)
+            elif kind == _ALERT_CLEAR:
+                self.episodes.append(now - self.alert_start.pop(p))
+                self.last_clear[p] = now
+            elif kind == _CONTACT_ONSET:
+                self.contacts += 1
+                if p in self.alert_start:
+                    self.lead_times.append(now - self.alert_start[p])
+                else:
+                    self.pending_contact[p] = now
+            elif p in self.pending_contact:
+                # Temas alarm gelmeden bitti
+                del self.pending_contact[p]
+                self.missed += 1
+        return self
+
+    def summary(self):
+        """Vardiya özeti: sayılar, bölüm süreleri, titreme, TTC ve alarm öncelik süreleri"""
+        episodes = np.asarray(self.episodes)
+        lead = np.asarray(self.lead_times)
+        onset_ttc = np.asarray(self.onset_ttc)
+        finite = onset_ttc[np.isfinite(onset_ttc)]
+        hours = max(self.frames / self.rate, 1e-9) / 3600
+
+        def quantiles(values):
+            if not len(values):
+                return {"p5": None, "p50": None, "p95": None}
+            return dict(zip(("p5", "p50", "p95"), np.percentile(values, [5, 50, 95]).tolist()))
+
+        return {
+            "frames": self.frames,
+            "hours": self.frames / self.rate / 3600,
+            "candidate_pair_frames": self.candidates,
+            "alert_pair_frames": self.alert_frames,
+            "alert_onsets": len(self.onset_ttc),
+            "alert_onsets_per_hour": len(self.onset_ttc) / hours,
+            "episode_seconds": dict(quantiles(episodes), mean=float(episodes.mean()) if len(episodes) else None),
+            "short_episodes": int(np.count_nonzero(episodes < self.flicker_time)),
+            "rechatter": self.rechatter,
+            "onset_ttc_seconds": dict(quantiles(finite), infinite=int(len(onset_ttc) - len(finite))),
+            "contacts": self.contacts,
+            "warned": int(np.count_nonzero(lead >= 0)),
+            "late": int(np.count_nonzero(lead < 0)),
+            "missed": self.missed,
+            "pending": len(self.pending_contact),
+            "lead_seconds": quantiles(lead),
+        }
+
+
+def run_shift(forklifts=FORKLIFTS, hours=HOURS, rate=RATE, seed=0, block_seconds=BLOCK_SECONDS,
+              store=None, fleet_options=None, monitor_options=None):
+    """Vardiyayı simüle edip değerlendirir; (özet, simülasyon ve değerlendirme süreleri) döner"""
+    fleet = WaypointFleet(forklifts, np.random.default_rng(seed), **(fleet_options or {}))
+    monitor = ShiftMonitor(forklifts, rate=rate, **(monitor_options or {}))
+    ids = np.arange(forklifts, dtype=np.int32)
+    timings = {"simulate": 0.0, "evaluate": 0.0}
+    blocks = simulate(fleet, hours * 3600, rate, block_seconds)
+    while True:
+        t = time.perf_counter()
+        block = next(blocks, None)
+        timings["simulate"] += time.perf_counter() - t
+        if block is None:
+            break
+        times, segments, velocity = block
+        t = time.perf_counter()
+        monitor.update(times, segments, velocity)
+        timings["evaluate"] += time.perf_counter() - t
+        if store is not None:
+            flat = segments.astype(np.float32).reshape(-1, 4)
+            store.append({"time": np.repeat(times, forklifts), "forklift": np.tile(ids, len(times)),
+                          "x1": flat[:, 0], "y1": flat[:, 1], "x2": flat[:, 2], "y2": flat[:, 3]})
+    return monitor.summary(), timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filo yörünge simülasyonu ve vardiya boyu alarm izleme")
+    parser.add_argument("--forklifts", type=int, default=FORKLIFTS)
+    parser.add_argument("--hours", type=float, default=HOURS)
+    parser.add_argument("--rate", type=float, default=RATE, help="kare hızı (Hz)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid", type=int, nargs=2, default=list(GRID_SHAPE), metavar=("NX", "NY"),
+                        help="koridor düğümü sayısı")
+    parser.add_argument("--spacing", type=float, default=AISLE_SPACING, help="koridor aralığı (m)")
+    parser.add_argument("--length", type=float, default=FORKLIFT_LENGTH, help="forklift uzunluğu (m)")
+    parser.add_argument("--max-speed", type=float, default=MAX_SPEED)
+    parser.add_argument("--max-accel", type=float, default=MAX_ACCEL)
+    parser.add_argument("--turn-rate", type=float, default=TURN_RATE, help="°/s")
+    parser.add_argument("--screen-range", type=float, default=SCREEN_RANGE)
+    parser.add_argument("--distance-threshold", type=float, default=DISTANCE_THRESHOLD)
+    parser.add_argument("--angle-threshold", type=float, default=ANGLE_THRESHOLD)
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default=DISTANCE_MODE)
+    parser.add_argument("--collision-distance", type=float, default=COLLISION_DISTANCE,
+                        help="temas sayılan segmentler arası mesafe (m); TTC bu mesafeye kadardır")
+    parser.add_argument("--flicker-time", type=float, default=FLICKER_TIME)
+    parser.add_argument("--block-seconds", type=float, default=BLOCK_SECONDS)
+    parser.add_argument("--store", default=None, help="kareleri bu dizine sütunlu depo olarak yaz")
+    parser.add_argument("--out", default=None, help="JSON özet dosyası")
+    parser.add_argument("--report", default=None,
+                        help='aşama süreleri ve sayaçları bu JSON dosyasına yaz ("-" = stdout)')
+    args = parser.parse_args(argv)
+
+    fleet_options = {"grid_shape": tuple(args.grid), "spacing": args.spacing, "length": args.length,
+                     "max_speed": args.max_speed, "max_accel": args.max_accel, "turn_rate": args.turn_rate}
+    monitor_options = {"screen_range": args.screen_range, "distance_threshold": args.distance_threshold,
+                       "angle_threshold": args.angle_threshold, "distance_mode": args.distance_mode,
+                       "collision_distance": args.collision_distance, "flicker_time": args.flicker_time}
+    instruments = instrument.enable() if args.report else None
+    store = ResultWriter(args.store) if args.store else None
+    try:
+        summary, timings = run_shift(args.forklifts, args.hours, args.rate, args.seed, args.block_seconds,
+                                     store, fleet_options, monitor_options)
+    finally:
+        if store is not None:
+            store.close()
+        if instruments is not None:
+            instrument.disable()
+
+    print(f"{args.forklifts} forklift, {summary['hours']:g} saat, {args.rate:g} Hz: {summary['frames']} kare "
+          f"(simülasyon {timings['simulate']:.1f} s, değerlendirme {timings['evaluate']:.1f} s)")
+    print(f"Aday çift-kare: {summary['candidate_pair_frames']}, alarmlı çift-kare: {summary['alert_pair_frames']}")
+    episode = summary["episode_seconds"]
+    print(f"Alarm başlangıcı: {summary['alert_onsets']} ({summary['alert_onsets_per_hour']:.1f}/saat)")
+    if episode["mean"] is not None:
+        print(f"  bölüm süresi (s): ortalama {episode['mean']:.2f}, p50 {episode['p50']:.2f}, "
+              f"p95 {episode['p95']:.2f}")
+    print(f"  titreme: {summary['short_episodes']} bölüm < {args.flicker_time:g} s, "
+          f"{summary['rechatter']} yeniden başlama < {args.flicker_time:g} s")
+    ttc = summary["onset_ttc_seconds"]
+    if ttc["p50"] is not None:
+        print(f"  başlangıçta TTC (s): p5 {ttc['p5']:.2f}, p50 {ttc['p50']:.2f}, p95 {ttc['p95']:.2f} "
+              f"({ttc['infinite']} yaklaşmıyor)")
+    print(f"Temas (< {args.collision_distance:g} m): {summary['contacts']}; alarm önce/aynı anda "
+          f"{summary['warned']}, sonra {summary['late']}, hiç {summary['missed']}")
+    lead = summary["lead_seconds"]
+    if lead["p50"] is not None:
+        print(f"  alarmın temastan önceliği (s): p5 {lead['p5']:.2f}, p50 {lead['p50']:.2f}, "
+              f"p95 {lead['p95']:.2f}")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(jsonable(summary), file, indent=2)
+        print(f"Özet '{args.out}' dosyasina yazildi.")
+    if args.store:
+        print(f"Kareler '{args.store}' deposuna yazildi.")
+    if instruments is not None:
+        instruments.write(args.report, summary=jsonable(summary))
+        if args.report != "-":
+            print(f"Ölçüm raporu '{args.report}' dosyasina yazildi.")
+
+
+if __name__ == "__main__":
+    main()
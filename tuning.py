@@ -0,0 +1,294 @@
+"""Eşik ve gürültü ayarı için yapılandırma güdümlü tarama.
+
+Betiklerdeki DISTANCE_THRESHOLD, ANGLE_THRESHOLD, FORKLIFT_LENGTH,
+MAX_DISTANCE ve gürültü sigması tek tek düzenlenip her betik ayrı
+çalıştırılmak yerine, değer listeleri ya da ızgaraları tek bir çalıştırmada
+değerlendirilir. Veri (segment dosyası ya da seed'li senaryo) parça parça
+bir kez okunur:
+
+- Alarm geometrisi her çift için bir kez hesaplanır (alert_engine.alert_scores);
+  her çift, skorunun düştüğü (açı eşiği, mesafe eşiği) hücresine sayılır ve
+  tüm kombinasyonların alarm sayıları kümülatif toplamlarla çıkar. Maliyet
+  eşik sayısıyla değil yalnızca log(eşik sayısı) ile büyür.
+- Gürültü ekseni tek normal çekimin her sigma ile ölçeklenmesiyle
+  (noise.SigmaGrid) angular_errors'un tekrar ekseninde yayınlanır; her sigma
+  için mesafe başına hata eğrisi (BinnedStats) birikir.
+
+Değerler virgüllü liste ("0.5,0.8,1.2"), "başlangıç:bitiş:adet" ızgarası
+("0:0.5:100") ya da JSON yapılandırmasında liste veya
+{"start": .., "stop": .., "num": ..} olarak verilir. Yapılandırma anahtarları
+komut satırı seçenekleriyle aynıdır (tire yerine alt çizgi); komut satırı
+yapılandırmayı ezer.
+
+    python tuning.py segments_for_geogebra.txt --angle-thresholds 0:0.5:100
+    python tuning.py --count 1e6 --length 3 --max-distance 25 --noise 0.25,0.5,1 --out tuning.json
+    python tuning.py --config tuning.json --plot tuning.png
+"""
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from alert_engine import (DISTANCE_THRESHOLD, ANGLE_THRESHOLD, DISTANCE_MODE, DISTANCE_MODES,
+                          alert_scores, angular_errors)
+from noise import NOISE_SIGMA, SigmaGrid
+from scenario import iter_pairs
+from streaming import ERROR_NAMES, BinnedStats, iter_segment_chunks
+
+CHUNK_PAIRS = 100_000
+FORKLIFT_LENGTH = 3
+MAX_DISTANCE = 25
+DISTANCE_BIN = 1.0
+
+
+def parse_values(spec):
+    """Liste, "a,b,c", "start:stop:num" ya da {"start","stop","num"} -> float dizisi"""
+    if isinstance(spec, dict):
+        return np.linspace(spec["start"], spec["stop"], int(spec["num"]))
+    if isinstance(spec, (int, float)):
+        return np.array([float(spec)])
+    if isinstance(spec, str):
+        if ":" in spec:
+            start, stop, num = spec.split(":")
+            return np.linspace(float(start), float(stop), int(num))
+        return np.array([float(value) for value in spec.split(",") if value.strip()])
+    return np.asarray(spec, dtype=float).ravel()
+
+
+class ThresholdCounts:
+    """Açı x mesafe eşiği ızgarasında alarm sayıları, sabit bellekte.
+
+    Her çift için açı skorunun kaç açı eşiğini aştığı (ia) ve en yakın uç
+    nokta mesafesinin kaç mesafe eşiğinin altında kalmadığı (id) bulunur ve
+    (ia, id) hücresine sayılır. Çift, a >= ia ve d < id olan her (a, d)
+    kombinasyonunda sessizdir; sayılar iki kümülatif toplamla çıkar.
+    """
+
+    def __init__(self, angle_thresholds, distance_thresholds):
+        self.angle_thresholds = np.asarray(angle_thresholds, dtype=float)
+        self.distance_thresholds = np.asarray(distance_thresholds, dtype=float)
+        self._angle_order = np.argsort(self.angle_thresholds, kind="stable")
+        self._distance_order = np.argsort(self.distance_thresholds, kind="stable")
+        self._angle_sorted = self.angle_thresholds[self._angle_order]
+        # evaluate_alerts ile aynı karşılaştırma: dist2 < eşik ** 2
+        self._distance2_sorted = self.distance_thresholds[self._distance_order] ** 2
+        self.hist = np.zeros((len(self._angle_sorted) + 1, len(self._distance2_sorted) + 1),
+                             dtype=np.int64)
+
+    @property
+    def pairs(self):
+        return int(self.hist.sum())
+
+    def update(self, angle_score, min_dist2):
+        ia = np.searchsorted(self._angle_sorted, angle_score, side="left")
+        id_ = np.searchsorted(self._distance2_sorted, min_dist2, side="right")
+        cols = self.hist.shape[1]
+        self.hist += np.bincount(ia * cols + id_, minlength=self.hist.size).reshape(self.hist.shape)
+        return self
+
+    def merge(self, other):
+        self.hist += other.hist
+        return self
+
+    def _unsort(self, grid):
+        # Sıralı eşik eksenlerini kullanıcının verdiği sıraya döndürür
+        out = np.empty_like(grid)
+        out[np.ix_(self._angle_order, self._distance_order)] = grid
+        return out
+
+    def counts(self):
+        """angle (Ka,), distance (Kd,) ve birleşik alarm (Ka, Kd) sayıları"""
+        # quiet[a, d] = sum_{i <= a} sum_{j > d} hist[i, j]
+        below = np.cumsum(self.hist, axis=0)
+        above = np.cumsum(below[:, ::-1], axis=1)[:, ::-1]
+        quiet = above[:-1, 1:]
+        total = self.pairs
+        angle = total - below[:-1].sum(axis=1)
+        distance = np.cumsum(self.hist.sum(axis=0))[:-1]
+        angle_out = np.empty_like(angle)
+        angle_out[self._angle_order] = angle
+        distance_out = np.empty_like(distance)
+        distance_out[self._distance_order] = distance
+        return {"angle": angle_out, "distance": distance_out,
+                "alerts": self._unsort(total - quiet)}
+
+
+def iter_source(config):
+    """Yapılandırmadaki segment dosyasından ya da senaryodan (seg1, seg2) parçaları"""
+    if config.get("path"):
+        for seg1, seg2, _ in iter_segment_chunks(config["path"], config["chunk_pairs"],
+                                                 config.get("format")):
+            if len(seg2):
+                yield seg1, seg2
+    else:
+        yield from iter_pairs(int(config["count"]), config["seed"], config["chunk_pairs"],
+                              half_length=config["length"] / 2,
+                              max_distance=config["max_distance"])
+
+
+def noise_rng(config):
+    """Gürültü üreteci; senaryo aynı seed'i kullandığından ondan bağımsız bir akış alır"""
+    if config.get("path"):
+        return np.random.default_rng(config["seed"])  # headless.py ile aynı akış
+    return np.random.default_rng(np.random.SeedSequence(config["seed"]).spawn(1)[0])
+
+
+def run_tuning(config):
+    """Tüm eşik kombinasyonlarının alarm sayıları ve her sigma için hata eğrileri"""
+    angle_thresholds = parse_values(config["angle_thresholds"])
+    distance_thresholds = parse_values(config["distance_thresholds"])
+    sigmas = parse_values(config["noise"]) if config.get("noise") is not None else np.empty(0)
+    edges = np.arange(0, config["max_distance"] + config["distance_bin"], config["distance_bin"])
+
+    counts = ThresholdCounts(angle_thresholds, distance_thresholds)
+    errors = [{name: BinnedStats(edges) for name in ERROR_NAMES} for _ in sigmas]
+    grid = SigmaGrid(sigmas) if len(sigmas) else None
+    rng = noise_rng(config)
+
+    for seg1, seg2 in iter_source(config):
+        counts.update(*alert_scores(seg1, seg2, config.get("distance_mode", DISTANCE_MODE)))
+        if grid is not None:
+            chunk_errors = angular_errors(seg1, seg2, rng, noise=grid, reps=len(sigmas))
+            center = np.hypot(*((seg2.mean(axis=1) - seg1.mean(axis=1)).T))
+            for k, binned in enumerate(errors):
+                for name in ERROR_NAMES:
+                    binned[name].update(center, np.degrees(chunk_errors[f"err_{name}"][k]))
+
+    return {"pairs": counts.pairs, "angle_thresholds": angle_thresholds,
+            "distance_thresholds": distance_thresholds, "counts": counts.counts(),
+            "sigmas": sigmas, "errors": errors}
+
+
+def jsonable(value):
+    if isinstance(value, dict):
+        return {key: jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return jsonable(value.tolist())
+    if isinstance(value, (float, np.floating)):
+        return None if not math.isfinite(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def tuning_report(result):
+    """run_tuning sonucunu JSON yazılabilir sözlüğe çevirir (NaN -> null)"""
+    pairs = max(result["pairs"], 1)
+    counts = result["counts"]
+    report = {
+        "pairs": result["pairs"],
+        "angle_thresholds": result["angle_thresholds"],
+        "distance_thresholds": result["distance_thresholds"],
+        "angle_alert_rate": counts["angle"] / pairs,
+        "distance_alert_rate": counts["distance"] / pairs,
+        "alert_rate": counts["alerts"] / pairs,  # [açı eşiği][mesafe eşiği]
+        "alerts": counts["alerts"],
+        "noise": [],
+    }
+    for sigma, binned in zip(result["sigmas"], result["errors"]):
+        report["noise"].append({
+            "sigma": sigma,
+            "errors": {name: dict(stats.total().summary(), curve=stats.table())
+                       for name, stats in binned.items()},
+        })
+    return jsonable(report)
+
+
+def plot_tuning(result, out, error_name="ACB"):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    pairs = max(result["pairs"], 1)
+    rows = 2 if len(result["sigmas"]) else 1
+    fig, axes = plt.subplots(rows, 1, figsize=(10, 5 * rows), squeeze=False)
+    ax = axes[0, 0]
+    order = np.argsort(result["angle_thresholds"])
+    for d, threshold in enumerate(result["distance_thresholds"]):
+        ax.plot(result["angle_thresholds"][order], 100 * result["counts"]["alerts"][order, d] / pairs,
+                label=f"mesafe eşiği {threshold:g} m")
+    ax.plot(result["angle_thresholds"][order], 100 * result["counts"]["angle"][order] / pairs,
+            "k--", label="yalnızca m/n")
+    ax.set_xlabel("Açı eşiği (|m|, |n|)")
+    ax.set_ylabel("Alarm oranı (%)")
+    ax.grid(True)
+    ax.legend()
+    if rows == 2:
+        ax = axes[1, 0]
+        for sigma, binned in zip(result["sigmas"], result["errors"]):
+            table = binned[error_name].table()
+            ax.plot(table["center"], table["mean"], marker="o", label=f"sigma {sigma:g} m")
+        ax.set_xlabel("Forkliftler Arası Mesafe (m)")
+        ax.set_ylabel(f"{error_name} Açısal Hata (°)")
+        ax.grid(True)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(out, dpi=100)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eşik ve gürültü taraması")
+    parser.add_argument("path", nargs="?", default=None,
+                        help='segment dosyası ("-" = stdin); yoksa --count ile senaryo üretilir')
+    parser.add_argument("--config", default=None, help="JSON yapılandırma dosyası")
+    parser.add_argument("--format", choices=["text", "binary"], default=None)
+    parser.add_argument("--angle-thresholds", default=str(ANGLE_THRESHOLD))
+    parser.add_argument("--distance-thresholds", default=str(DISTANCE_THRESHOLD))
+    parser.add_argument("--distance-mode", choices=DISTANCE_MODES, default=DISTANCE_MODE)
+    parser.add_argument("--noise", default=str(NOISE_SIGMA),
+                        help='mesafe gürültüsü sigmaları (m); "" = hata eğrisi yok')
+    parser.add_argument("--count", type=float, default=100_000, help="senaryo çift sayısı")
+    parser.add_argument("--length", type=float, default=FORKLIFT_LENGTH, help="forklift uzunluğu (m)")
+    parser.add_argument("--max-distance", type=float, default=MAX_DISTANCE)
+    parser.add_argument("--distance-bin", type=float, default=DISTANCE_BIN)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-pairs", type=int, default=CHUNK_PAIRS)
+    parser.add_argument("--out", default=None, help="JSON rapor dosyası")
+    parser.add_argument("--plot", default=None, help="alarm oranı ve hata eğrileri (.png)")
+    args, _ = parser.parse_known_args(argv)
+    if args.config:
+        with open(args.config) as file:
+            parser.set_defaults(**json.load(file))
+    config = vars(parser.parse_args(argv))
+    if config["noise"] == "":
+        config["noise"] = None
+
+    t = time.perf_counter()
+    result = run_tuning(config)
+    elapsed = time.perf_counter() - t
+    counts = result["counts"]
+    pairs = max(result["pairs"], 1)
+    angle_thresholds, distance_thresholds = result["angle_thresholds"], result["distance_thresholds"]
+    print(f"Toplam çift: {result['pairs']} ({len(angle_thresholds)} x {len(distance_thresholds)} "
+          f"eşik, {len(result['sigmas'])} sigma, {elapsed:.2f} s)")
+
+    # Uzun eşik listelerinde tablo yerine yaklaşık 20 satır basılır
+    step = max(1, len(angle_thresholds) // 20)
+    print(f"\n{'açı eşiği':>10} {'m/n %':>7} " +
+          " ".join(f"{'d<' + format(d, 'g'):>8}" for d in distance_thresholds[:8]))
+    for a in range(0, len(angle_thresholds), step):
+        print(f"{angle_thresholds[a]:>10.4g} {100 * counts['angle'][a] / pairs:>7.2f} " +
+              " ".join(f"{100 * counts['alerts'][a, d] / pairs:>8.2f}"
+                       for d in range(min(len(distance_thresholds), 8))))
+
+    for sigma, binned in zip(result["sigmas"], result["errors"]):
+        totals = {name: binned[name].total() for name in ERROR_NAMES}
+        print(f"\nsigma {sigma:g} m: " + ", ".join(
+            f"{name} {totals[name].mean:.2f}° ± {totals[name].std:.2f}°" for name in ERROR_NAMES))
+
+    if config["out"]:
+        with open(config["out"], "w") as file:
+            json.dump(tuning_report(result), file, indent=2)
+        print(f"Rapor '{config['out']}' dosyasina yazildi.")
+    if config["plot"]:
+        plot_tuning(result, config["plot"])
+        print(f"Grafik: {config['plot']}")
+
+
+if __name__ == "__main__":
+    main()